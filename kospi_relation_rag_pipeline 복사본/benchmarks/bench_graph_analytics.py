@@ -0,0 +1,125 @@
+# benchmarks/bench_graph_analytics.py
+# graph_analytics (희소 행렬 벡터화) vs networkx 기준 구현 비교 벤치마크
+#
+# 사용법:
+#   python benchmarks/bench_graph_analytics.py --nodes 500 2500 --density 0.002 --k 3
+#
+# 측정 항목: degree/strength, k-hop 도달 가능 노드, 간접 지분 누적, 약한 연결 요소, 정규화 인접 행렬
+# networkx 는 requirements.txt 에 있지만 설치되지 않았으면 graph_analytics 결과만 출력.
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, os.pardir, 'core')))
+sys.path.insert(0, BENCH_DIR)
+
+import graph_analytics as ga
+from fixtures import make_adjacency
+
+try:
+    import networkx as nx
+except ImportError:
+    nx = None
+
+
+def best_time(func, repeat):
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def ownership_matrix(nodes, seed=8):
+    """ 평균 1개 지분 보유, 열 합(한 기업의 외부 지분 합) 0.5 이하인 지분율 행렬 """
+    adjacency = make_adjacency(nodes, 1.0 / nodes, seed=seed)
+    column_sums = np.asarray(adjacency.sum(axis=0)).ravel()
+    return (adjacency @ sp.diags(0.5 / np.maximum(column_sums, 1.0))).tocsr()
+
+
+# --- networkx 기준 구현 (노트북에서 쓰던 방식) ---
+def nx_degree_strength(graph):
+    return dict(graph.out_degree()), dict(graph.out_degree(weight='weight'))
+
+
+def nx_k_hop(graph, k):
+    return {node: set(nx.single_source_shortest_path_length(graph, node, cutoff=k)) - {node} for node in graph}
+
+
+def nx_indirect_ownership(graph, tol):
+    # 경로 전파: 각 단계마다 이전 단계 지분에 직접 지분을 곱해 누적 (dict 기반)
+    total = {u: {v: d['weight'] for v, d in graph[u].items()} for u in graph}
+    term = {u: dict(vs) for u, vs in total.items()}
+    for _ in range(ga.OWNERSHIP_MAX_TERMS - 1):
+        next_term = {}
+        for u, vs in term.items():
+            acc = {}
+            for v, w in vs.items():
+                for x, d in graph[v].items():
+                    acc[x] = acc.get(x, 0.0) + w * d['weight']
+            acc = {x: w for x, w in acc.items() if w >= tol}
+            if acc: next_term[u] = acc
+        if not next_term or max(max(vs.values()) for vs in next_term.values()) <= tol: break
+        for u, vs in next_term.items():
+            row = total.setdefault(u, {})
+            for x, w in vs.items(): row[x] = row.get(x, 0.0) + w
+        term = next_term
+    return total
+
+
+def nx_components(graph):
+    return list(nx.weakly_connected_components(graph))
+
+
+def nx_normalized(graph):
+    undirected = graph.to_undirected()
+    undirected.add_edges_from((n, n, {'weight': 1.0}) for n in undirected)
+    return nx.normalized_laplacian_matrix(undirected) # I - D^-1/2 A D^-1/2 (같은 연산량)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="graph_analytics vs networkx 벤치마크")
+    parser.add_argument('--nodes', type=int, nargs='+', default=[500, 2500])
+    parser.add_argument('--density', type=float, default=0.002)
+    parser.add_argument('--k', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+    if nx is None: print("networkx 미설치: 기준 구현 측정 생략")
+
+    print(f"{'nodes':>6} {'edges':>8} {'operation':<22} {'sparse(ms)':>11} {'networkx(ms)':>13} {'speedup':>8}")
+    for nodes in args.nodes:
+        adjacency = make_adjacency(nodes, args.density, seed=7)
+        ownership = ownership_matrix(nodes)
+        cases = [
+            ('degree+strength', lambda: (ga.degree(adjacency), ga.strength(adjacency)),
+             lambda g: nx_degree_strength(g)),
+            (f'{args.k}-hop reachability', lambda: ga.k_hop_reachability(adjacency, args.k),
+             lambda g: nx_k_hop(g, args.k)),
+            ('indirect ownership', lambda: ga.indirect_ownership(ownership),
+             lambda g: nx_indirect_ownership(g_own, ga.OWNERSHIP_TOL)),
+            ('weak components', lambda: ga.connected_components(adjacency),
+             lambda g: nx_components(g)),
+            ('normalized adjacency', lambda: ga.normalized_adjacency(adjacency, symmetrize=True),
+             lambda g: nx_normalized(g)),
+        ]
+        graph = nx.from_scipy_sparse_array(adjacency, create_using=nx.DiGraph) if nx else None
+        g_own = nx.from_scipy_sparse_array(ownership, create_using=nx.DiGraph) if nx else None
+        for name, sparse_func, nx_func in cases:
+            sparse_time, _ = best_time(sparse_func, args.repeat)
+            if nx is not None:
+                nx_time, _ = best_time(lambda: nx_func(graph), max(1, args.repeat // 2))
+                nx_text, speedup = f"{nx_time * 1000:>13.1f}", f"{nx_time / sparse_time:>7.1f}x"
+            else:
+                nx_text, speedup = f"{'-':>13}", f"{'-':>8}"
+            print(f"{nodes:>6} {adjacency.nnz:>8} {name:<22} {sparse_time * 1000:>11.1f} {nx_text} {speedup}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_import_time.py
+# core 모듈 임포트 시간 측정 + 예산 검사
+# 각 모듈을 새 인터프리터에서 임포트해 (반복 중 최솟값) 시간을 재고, 무거운 선택적 의존성이
+# 임포트 시점에 로드되지 않았는지 확인합니다. 예산 초과/금지 모듈 로드 시 종료 코드 1.
+#
+# 사용법:
+#   python benchmarks/bench_import_time.py                   # 기본 모듈 전체
+#   python benchmarks/bench_import_time.py matrix_builder --repeat 5
+#   python benchmarks/bench_import_time.py core.dart_utils   # 패키지 임포트 (프로젝트 루트만 sys.path 에 둠)
+#   python -X importtime -c "import matrix_builder"          # (core 폴더에서) 상세 분석
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+CORE_DIR = os.path.join(PROJECT_DIR, 'core')
+
+# 모듈별 임포트 시간 예산(ms). matrix_builder 만 쓰는 행렬 작업은 numpy + scipy.sparse 비용만 내야 함
+IMPORT_BUDGET_MS = {
+    'matrix_builder': 600,
+    'matrix_store': 600,
+    'temporal_store': 600,
+    'relation_extractor': 600,
+    'mention_index': 250,
+    'dart_utils': 250,
+    'section_chunker': 250,
+    'batch_parser': 250,
+    'pdf_processor': 150,
+    'run_manifest': 100,
+    'report_cache': 100,
+    'dart_fetcher': 100,
+    # 'core.' 로 시작하면 core/ 대신 프로젝트 루트를 sys.path 에 두고 패키지로 임포트 (평면 임포트 누락 검사)
+    'core.dart_utils': 250,
+    'core.pdf_processor': 150,
+}
+# 임포트 시점에 로드되면 안 되는 무거운 선택적 의존성 (실제 사용 시 capabilities.require 로 로드)
+LAZY_MODULES = ('lxml', 'dart_fss', 'requests', 'tenacity', 'bs4', 'PyPDF2', 'langchain', 'langchain_core',
+                'pandas', 'faiss', 'sentence_transformers', 'transformers', 'torch')
+
+_CHILD = """
+import sys, time, json
+sys.path.insert(0, {path!r})
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'ms': elapsed * 1000, 'loaded': sorted(m for m in {lazy!r} if m in sys.modules)}}))
+"""
+
+
+def measure(module, repeat):
+    """ 새 프로세스에서 module 임포트. 반환: (최소 ms, 임포트 시점에 로드된 무거운 모듈 리스트) """
+    best, loaded = float('inf'), []
+    path = PROJECT_DIR if module.startswith('core.') else CORE_DIR
+    code = _CHILD.format(path=path, module=module, lazy=LAZY_MODULES)
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise ImportError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else module)
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        best, loaded = min(best, result['ms']), result['loaded']
+    return best, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="core 모듈 임포트 시간 예산 검사")
+    parser.add_argument('modules', nargs='*', default=list(IMPORT_BUDGET_MS))
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'module':<20} {'import(ms)':>11} {'budget(ms)':>11}  eager heavy modules")
+    for module in args.modules:
+        try:
+            elapsed, loaded = measure(module, args.repeat)
+        except ImportError as e:
+            failed = True
+            print(f"{module:<20} {'-':>11} {'-':>11}  IMPORT FAILED: {e}")
+            continue
+        budget = IMPORT_BUDGET_MS.get(module)
+        over = budget is not None and elapsed > budget
+        failed |= over or bool(loaded)
+        status = ' OVER BUDGET' if over else ''
+        print(f"{module:<20} {elapsed:>11.1f} {budget if budget else '-':>11}  {', '.join(loaded) or '-'}{status}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# benchmarks/bench_mention_index.py
+# mention_index 후보 쌍 생성 vs 전체 기업 쌍(N^2) 검사 비교 벤치마크
+#
+# 사용법:
+#   python benchmarks/bench_mention_index.py --universe 100 500 2500 --sections 200
+#
+# 기업 명단: data/kospi100_name_map.xlsx 의 실제 이름 + (universe 가 더 크면) 임의 한글 합성 이름.
+# 섹션: 합성 DART 보고서 섹션 본문에 기업명을 섹션당 mentions 개씩 무작위로 삽입.
+# 기준 구현은 모든 기업 쌍마다 두 이름이 섹션에 모두 있는지 확인 (노트북에서 쌍별 프롬프트를 만들던 방식).
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, os.pardir, 'core')))
+sys.path.insert(0, BENCH_DIR)
+
+from fixtures import make_dart_xml
+from dart_utils import extract_sections_streaming
+from mention_index import MentionIndex, alias_variants
+
+_SYLLABLES = [chr(c) for c in range(0xAC00, 0xD7A4, 97)]
+
+
+def make_universe(size, seed=0):
+    """ {종목코드: [별칭, ...]} - 실제 KOSPI100 이름 + 합성 이름으로 size 개 """
+    import pandas as pd
+    rng = random.Random(seed)
+    name_map = pd.read_excel(os.path.join(BENCH_DIR, os.pardir, 'data', 'kospi100_name_map.xlsx'), dtype=str)
+    universe, used = {}, set()
+    for row in name_map.itertuples(index=False):
+        if len(universe) >= size: break
+        aliases = alias_variants(row.company_name_ko, row.company_name_en)
+        if used.isdisjoint(a.lower() for a in aliases):
+            universe[row.stock_code] = aliases
+            used.update(a.lower() for a in aliases)
+    while len(universe) < size:
+        name = ''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(3, 5)))
+        if name in used: continue
+        used.add(name)
+        universe[f"{900000 + len(universe):06d}"] = [name]
+    return universe
+
+
+def make_sections(universe, count, mentions, seed=0):
+    rng = random.Random(seed)
+    report = make_dart_xml(2000, seed=seed)
+    sections = [s['content'] for s in extract_sections_streaming(report, 'bench', '005930', '삼성전자')]
+    codes = list(universe)
+    texts = []
+    for i in range(count):
+        words = sections[i % len(sections)][:4000].split(' ')
+        for code in rng.sample(codes, mentions):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(universe[code]))
+        texts.append({'content': ' '.join(words), 'original_section': f's{i}', 'company_code': '005930'})
+    return texts
+
+
+def naive_pairs(universe, sections):
+    """ 모든 기업 쌍 x 섹션: 두 기업의 별칭이 모두 본문에 있으면 후보 """
+    codes = sorted(universe)
+    found = 0
+    for section in sections:
+        text = section['content'].lower()
+        present = {code: any(alias.lower() in text for alias in universe[code]) for code in codes}
+        for i, a in enumerate(codes):
+            for b in codes[i + 1:]:
+                found += present[a] and present[b]
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="mention_index 후보 쌍 벤치마크")
+    parser.add_argument('--universe', type=int, nargs='+', default=[100, 500, 2500])
+    parser.add_argument('--sections', type=int, default=200)
+    parser.add_argument('--mentions', type=int, default=5, help="섹션당 삽입할 기업 언급 수")
+    args = parser.parse_args()
+
+    print(f"{'universe':>8} {'all pairs x sections':>21} {'candidates':>11} {'index(ms)':>10} {'naive(ms)':>10} {'speedup':>8}")
+    for size in args.universe:
+        universe = make_universe(size)
+        sections = make_sections(universe, args.sections, args.mentions)
+        build_start = time.perf_counter()
+        index = MentionIndex(universe)
+        build_ms = (time.perf_counter() - build_start) * 1000
+        start = time.perf_counter()
+        candidates = index.candidate_pairs(sections, include_subject=False)
+        index_s = time.perf_counter() - start
+        start = time.perf_counter()
+        naive = naive_pairs(universe, sections)
+        naive_s = time.perf_counter() - start
+        total_pairs = size * (size - 1) // 2 * len(sections)
+        print(f"{size:>8} {total_pairs:>21} {len(candidates):>11} {index_s * 1000:>10.1f} {naive_s * 1000:>10.1f} "
+              f"{naive_s / index_s:>7.1f}x   (색인 생성 {build_ms:.0f}ms, 쌍별 검사 후보 {naive})")
+
+
+if __name__ == '__main__':
+    main()
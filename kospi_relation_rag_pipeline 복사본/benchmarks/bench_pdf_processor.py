@@ -0,0 +1,55 @@
+# benchmarks/bench_pdf_processor.py
+# FnGuide PDF 처리 처리량(pages/sec) 벤치마크: 직렬 process_fnguide_pdf vs 프로세스 풀 iter_process_fnguide_pdfs
+#
+# 사용법:
+#   python benchmarks/bench_pdf_processor.py data/fnguide/*.pdf --workers 8
+#   (디렉터리를 주면 하위의 .pdf 전체 사용)
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+CORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'core')
+sys.path.insert(0, os.path.abspath(CORE_DIR))
+
+from pdf_processor import count_pdf_pages, iter_process_fnguide_pdfs, process_fnguide_pdf, PDF_WORKERS, PAGES_PER_TASK
+
+
+def collect_pdfs(paths):
+    pdfs = []
+    for path in paths:
+        if os.path.isdir(path): pdfs.extend(sorted(glob.glob(os.path.join(path, '**', '*.pdf'), recursive=True)))
+        else: pdfs.append(path)
+    return pdfs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FnGuide PDF 처리 pages/sec 벤치마크")
+    parser.add_argument('paths', nargs='+', help=".pdf 파일 또는 디렉터리")
+    parser.add_argument('--workers', type=int, default=PDF_WORKERS)
+    parser.add_argument('--pages-per-task', type=int, default=PAGES_PER_TASK)
+    parser.add_argument('--skip-serial', action='store_true', help="직렬 기준 측정 생략")
+    args = parser.parse_args()
+
+    pdfs = collect_pdfs(args.paths)
+    total_pages = sum(count_pdf_pages(p) for p in pdfs)
+    jobs = [(p, os.path.splitext(os.path.basename(p))[0]) for p in pdfs]
+    print(f"PDFs: {len(pdfs)}, pages: {total_pages}")
+
+    if not args.skip_serial:
+        start = time.perf_counter()
+        docs = sum(len(process_fnguide_pdf(p, code)) for p, code in jobs)
+        elapsed = time.perf_counter() - start
+        print(f"{'serial':<24} {elapsed:>8.2f}s {total_pages / elapsed:>10.1f} pages/s  docs={docs}")
+
+    start = time.perf_counter()
+    docs = sum(len(d) for _code, _path, d, _pages in
+               iter_process_fnguide_pdfs(jobs, max_workers=args.workers, pages_per_task=args.pages_per_task))
+    elapsed = time.perf_counter() - start
+    print(f"{f'process pool (x{args.workers})':<24} {elapsed:>8.2f}s {total_pages / elapsed:>10.1f} pages/s  docs={docs}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_relation_extractor.py
+# relation_extractor 배치/버킷/캐시 효과 측정 (스텁 모델, CPU, 모델 다운로드 없음)
+#
+# 사용법:
+#   python benchmarks/bench_relation_extractor.py --kb 2000 --batch-size 8
+#
+# 스텁 모델은 호출당 고정 비용 + (배치 크기 x 가장 긴 프롬프트 토큰) 비례 비용을 sleep 으로 흉내냄
+# (패딩된 배치 생성 비용 모델). 합성 DART 보고서를 iter_section_chunks 로 나눈 청크를 입력으로 사용.
+# 측정: 1건씩 생성 / 버킷 없는 배치 / 길이 버킷 배치 / 같은 입력 재실행(캐시)
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, os.pardir, 'core')))
+sys.path.insert(0, BENCH_DIR)
+
+from fixtures import make_dart_xml
+from matrix_builder import CompanyIndex, RelationGraphBuilder
+from relation_extractor import RelationExtractor
+from section_chunker import approx_token_count, iter_section_chunks
+
+CALL_OVERHEAD_S = 0.02 # 생성 호출당 고정 비용
+TOKEN_COST_S = 2e-6 # 패딩 포함 토큰당 비용
+STUB_COMPANIES = ['삼성전자', 'SK하이닉스', 'LG전자', 'NAVER']
+
+
+def stub_generate(prompts):
+    """ 패딩 배치 비용을 흉내내고 본문에 나온 기업명을 경쟁 관계로 답하는 스텁 모델 """
+    longest = max(approx_token_count(p) for p in prompts)
+    time.sleep(CALL_OVERHEAD_S + TOKEN_COST_S * longest * len(prompts))
+    outputs = []
+    for prompt in prompts:
+        body = prompt.split('본문:', 1)[-1]
+        found = [name for name in STUB_COMPANIES[1:] if name in body]
+        outputs.append(json.dumps([{'company_b': name, 'relationships': [{'type': 'competition', 'strength': 'medium'}]}
+                                   for name in found], ensure_ascii=False))
+    return outputs
+
+
+def run_case(chunks, index, cache_dir, batch_size, bucket_tokens):
+    extractor = RelationExtractor(cache_dir, model_name='stub', generate_fn=stub_generate,
+                                  batch_size=batch_size, bucket_tokens=bucket_tokens)
+    try:
+        return extractor.extract_into(RelationGraphBuilder(index), chunks,
+                                      {'company_code': '005930', 'company_name': '삼성전자', 'rcept_no': 'bench'})
+    finally:
+        extractor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="relation_extractor 배치/캐시 벤치마크 (스텁 모델)")
+    parser.add_argument('--kb', type=int, default=1000, help="합성 보고서 크기 (KB)")
+    parser.add_argument('--max-tokens', type=int, default=512, help="청크 최대 토큰 수")
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--bucket-tokens', type=int, default=64)
+    args = parser.parse_args()
+
+    report = make_dart_xml(args.kb, seed=3)
+    chunks = list(iter_section_chunks(report, '005930', 'bench', '삼성전자', max_tokens=args.max_tokens))
+    index = CompanyIndex(['005930', '000660', '066570', '035420'],
+                         {'005930': ['삼성전자'], '000660': ['SK하이닉스'], '066570': ['LG전자'], '035420': ['NAVER']})
+    print(f"청크 {len(chunks)}개 (보고서 {args.kb}KB, 최대 {args.max_tokens} 토큰)")
+
+    workdir = tempfile.mkdtemp(prefix='bench-relx-')
+    try:
+        cases = [
+            ('one prompt per call', os.path.join(workdir, 'single'), 1, args.bucket_tokens),
+            ('batched, no buckets', os.path.join(workdir, 'flat'), args.batch_size, 10 ** 9),
+            ('batched, length buckets', os.path.join(workdir, 'bucketed'), args.batch_size, args.bucket_tokens),
+            ('re-run (cache)', os.path.join(workdir, 'bucketed'), args.batch_size, args.bucket_tokens),
+        ]
+        print(f"{'case':<26} {'seconds':>8} {'calls':>6} {'generated':>10} {'cache hits':>11} {'padding tok':>12} {'edges':>6}")
+        for name, cache_dir, batch_size, bucket_tokens in cases:
+            stats = run_case(chunks, index, cache_dir, batch_size, bucket_tokens)
+            print(f"{name:<26} {stats['seconds']:>8.2f} {stats['batches']:>6} {stats['generated']:>10} "
+                  f"{stats['cache_hits']:>11} {stats['padding_tokens']:>12} {stats['edges']:>6}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
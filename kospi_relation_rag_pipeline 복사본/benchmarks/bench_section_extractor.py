@@ -0,0 +1,71 @@
+# benchmarks/bench_section_extractor.py
+# 섹션 추출기 비교 벤치마크: extract_targeted_data_from_xml (기존) vs extract_sections_streaming (단일 패스)
+#
+# 사용법:
+#   python benchmarks/bench_section_extractor.py data/dart_downloads/005930/20241114002593.zip [...]
+#   (인자로 .zip 또는 디코딩 전 .xml 파일 경로를 여러 개 지정 가능)
+#
+# 측정 항목: 보고서별 파싱 시간(반복 중 최솟값), tracemalloc 기준 Python 힙 최대 사용량,
+#           추출 섹션 수, 전체 섹션 텍스트 길이(중복 텍스트 감소 확인용)
+# 참고: tracemalloc은 libxml2 내부(C) 할당을 추적하지 않으므로 Python 객체(문자열/리스트) 기준 수치임.
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+import zipfile
+
+CORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'core')
+sys.path.insert(0, os.path.abspath(CORE_DIR))
+
+from dart_utils import decode_content, extract_targeted_data_from_xml, extract_sections_streaming, read_report_from_zip
+
+
+def load_report_bytes(path):
+    """ .zip이면 보고서 멤버(read_report_from_zip 기준), 아니면 파일 자체의 바이트를 반환 """
+    if zipfile.is_zipfile(path):
+        report_bytes, _, _ = read_report_from_zip(path)
+        if report_bytes is None: raise ValueError(f"Report member not found in {path}")
+        return report_bytes
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def measure(func, content, repeat):
+    """ (최소 실행 시간 초, 최대 메모리 바이트, 결과) 반환 """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(content, 'bench', 'bench', 'bench')
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(content, 'bench', 'bench', 'bench')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DART 섹션 추출기 성능 비교")
+    parser.add_argument('paths', nargs='+', help=".zip 또는 .xml 보고서 경로")
+    parser.add_argument('--repeat', type=int, default=3, help="시간 측정 반복 횟수")
+    args = parser.parse_args()
+
+    extractors = [
+        ('legacy', extract_targeted_data_from_xml),
+        ('streaming', extract_sections_streaming),
+    ]
+    print(f"{'report':<32} {'extractor':<10} {'size(KB)':>9} {'time(ms)':>10} {'peak(MB)':>9} {'sections':>8} {'chars':>10}")
+    for path in args.paths:
+        content = decode_content(load_report_bytes(path))
+        size_kb = len(content.encode('utf-8')) / 1024
+        for name, func in extractors:
+            elapsed, peak, sections = measure(func, content, args.repeat)
+            chars = sum(len(s['content']) for s in sections)
+            print(f"{os.path.basename(path)[:32]:<32} {name:<10} {size_kb:>9.1f} {elapsed * 1000:>10.1f} "
+                  f"{peak / 2**20:>9.2f} {len(sections):>8} {chars:>10}")
+
+
+if __name__ == '__main__':
+    main()
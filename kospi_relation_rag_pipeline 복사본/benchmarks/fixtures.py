@@ -0,0 +1,170 @@
+# benchmarks/fixtures.py
+# 오프라인 벤치마크용 합성 데이터 생성기 (네트워크/실제 DART·FnGuide 파일 불필요)
+# - DART 형식 XML 보고서 (utf-8 / cp949, 크기 지정): "I. 회사의 개요", "II. 사업의 내용", "IX. 계열회사 등에 관한 사항" 등 실제 목차 구조
+# - DART 원본파일 형식 ZIP (본문 XML + 첨부 XML)
+# - FnGuide 형식 다중 페이지 PDF (외부 라이브러리 없이 PDF 객체를 직접 작성, 일부 페이지에 경쟁사 비교 지표 포함)
+# - 관계 인접 행렬 (희소/밀집)
+# 모든 생성기는 seed 로 결과가 고정되므로 실행 간 결과를 비교할 수 있음.
+
+import random
+import zipfile
+
+import numpy as np
+import scipy.sparse as sp
+
+# (섹션 제목, 하위 섹션 제목 리스트) - DART 정기보고서 목차 기준
+DART_SECTIONS = [
+    ("I. 회사의 개요", ["1. 회사의 개요", "2. 회사의 연혁", "3. 자본금 변동사항"]),
+    ("II. 사업의 내용", ["1. 사업의 개요", "2. 주요 제품 및 서비스", "3. 원재료 및 생산설비",
+                        "4. 매출 및 수주상황", "5. 위험관리 및 파생거래", "6. 주요계약 및 연구개발활동"]),
+    ("III. 재무에 관한 사항", ["1. 요약재무정보", "2. 연결재무제표"]),
+    ("VII. 주주에 관한 사항", []),
+    ("IX. 계열회사 등에 관한 사항", []),
+    ("XII. 상세표", ["1. 연결대상 종속회사 현황(상세)", "2. 계열회사 현황(상세)"]),
+]
+_PHRASES = [
+    "당사는 반도체 및 디스플레이 부문에서 글로벌 경쟁사와 경쟁하고 있습니다",
+    "주요 원재료는 웨이퍼, 화학약품, 가스 등이며 복수의 공급사로부터 구매하고 있습니다",
+    "주요 매출처는 국내외 전자제품 제조사이며 장기 공급계약을 체결하고 있습니다",
+    "연결대상 종속회사는 해외 판매법인과 생산법인으로 구성되어 있습니다",
+    "당기 중 신규 설비 투자로 생산능력이 증가하였으며 가동률은 높은 수준을 유지하였습니다",
+    "최대주주 및 특수관계인의 지분율은 전기 대비 변동이 없습니다",
+    "연구개발 조직은 차세대 제품 개발을 위해 지속적으로 인력을 확충하고 있습니다",
+]
+_COMPANIES = ["삼성전자", "SK하이닉스", "LG전자", "현대자동차", "POSCO홀딩스", "NAVER", "카카오", "LG화학"]
+
+
+def _paragraph(rng, sentences=3):
+    return ' '.join(f"{rng.choice(_PHRASES)}." for _ in range(sentences))
+
+
+def _table(rng, rows=6):
+    cells = ''.join(
+        f"<TR><TD>{rng.choice(_COMPANIES)}</TD><TD>{rng.randint(1, 100)}.{rng.randint(0, 99):02d}%</TD>"
+        f"<TD>{rng.randint(1000, 9999999):,}</TD></TR>" for _ in range(rows))
+    return f"<TABLE BORDER=\"1\"><TBODY><TR><TH>회사명</TH><TH>지분율</TH><TH>장부가액</TH></TR>{cells}</TBODY></TABLE>"
+
+
+def make_dart_xml(target_kb=500, encoding='utf-8', seed=0):
+    """
+    DART 정기보고서 형식의 합성 XML 을 bytes 로 생성 (선언부 encoding 포함).
+    target_kb: 인코딩 후 대략적인 크기(KB). 섹션 목차를 반복하며 본문 문단/표를 채움.
+    """
+    rng = random.Random(seed)
+    target = target_kb * 1024
+    parts = [
+        f'<?xml version="1.0" encoding="{encoding}"?>',
+        '<DOCUMENT><DOCUMENT-NAME ACODE="11011">사업보고서</DOCUMENT-NAME>'
+        '<COMPANY-NAME AREGCIK="00000000">합성전자</COMPANY-NAME><BODY>',
+    ]
+    size = sum(len(p.encode(encoding)) for p in parts)
+    per_section = max(1, int(target / (len(DART_SECTIONS) * 4)))
+    while size < target:
+        for title, subsections in DART_SECTIONS:
+            body = [f'<SECTION-1 ACLASS="MANDATORY"><TITLE ATOC="Y" AASSOCNOTE="D-0-1-0-0">{title}</TITLE>']
+            for sub in subsections or [None]:
+                if sub: body.append(f'<SECTION-2 ACLASS="MANDATORY"><TITLE ATOC="Y">{sub}</TITLE>')
+                written = 0
+                while written < per_section / max(1, len(subsections)):
+                    block = f"<P>{_paragraph(rng)}</P>" if rng.random() < 0.7 else _table(rng)
+                    body.append(block)
+                    written += len(block.encode(encoding))
+                if sub: body.append('</SECTION-2>')
+            body.append('</SECTION-1>')
+            chunk = ''.join(body)
+            parts.append(chunk)
+            size += len(chunk.encode(encoding))
+            if size >= target: break
+    parts.append('</BODY></DOCUMENT>')
+    return ''.join(parts).encode(encoding)
+
+
+def make_dart_zip(path, report_bytes, rcept_no='20240000000001', attachments=2, seed=0):
+    """ DART 원본파일 형식 ZIP 작성: 루트의 <rcept_no>.xml 본문 + 감사보고서 등 첨부 XML. 경로 반환 """
+    rng = random.Random(seed)
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(f"{rcept_no}.xml", report_bytes)
+        for i in range(attachments):
+            # 첨부는 본문보다 작게 (select_report_member 가 본문을 고르도록)
+            attachment = make_dart_xml(max(1, len(report_bytes) // 1024 // 8), 'utf-8', seed=rng.randint(0, 1 << 30))
+            zf.writestr(f"{rcept_no}_{i:05d}.xml", attachment)
+    return path
+
+
+# --- PDF ---
+_COMPETITOR_LINES = ["Investment Opinion", "Margin & Growth", "Price & Fundamentals", "Peer Price Return Comparison"]
+_FILLER_LINES = [
+    "Revenue grew on stronger memory pricing and higher shipments.",
+    "Operating margin improved as utilisation recovered in the second half.",
+    "Capex guidance remains unchanged for the fiscal year.",
+    "Inventory days declined quarter on quarter.",
+]
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+_TEXT_SHOW_FORMATS = {'Tj': "({}) Tj T*", "'": "({}) '", '"': '0 0 ({}) "'}
+
+
+def make_fnguide_pdf(path, pages=20, competitor_every=5, lines_per_page=40, seed=0, form_xobject=False,
+                     text_operator='Tj'):
+    """
+    FnGuide 리포트 형식의 합성 PDF 작성 (Helvetica 텍스트 페이지).
+    competitor_every 페이지마다 경쟁사 비교 지표(Margin/Growth/Price/Fundamentals)를 넣어
+    process_fnguide_pdf 가 찾을 페이지를 만듦. 반환: (경로, 경쟁사 페이지 번호 리스트)
+    form_xobject=True 면 본문을 Form XObject 에 넣고 페이지는 '/Fm1 Do' 만 그림 (폰트도 폼 리소스에만 있음)
+    text_operator: 줄마다 쓰는 텍스트 표시 연산자 ('Tj', "'", '"')
+    """
+    show = _TEXT_SHOW_FORMATS[text_operator]
+    rng = random.Random(seed)
+    objects = {1: b"<< /Type /Catalog /Pages 2 0 R >>",
+               3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    page_ids, competitor_pages = [], []
+    next_id = 4
+    for page_num in range(1, pages + 1):
+        lines = [rng.choice(_FILLER_LINES) for _ in range(lines_per_page)]
+        if competitor_every and page_num % competitor_every == 0:
+            lines[:len(_COMPETITOR_LINES)] = _COMPETITOR_LINES
+            competitor_pages.append(page_num)
+        stream = "BT /F1 9 Tf 12 TL 40 800 Td " + ' '.join(show.format(_pdf_escape(line)) for line in lines) + " ET"
+        stream = stream.encode('latin-1')
+        content_id, page_id = next_id, next_id + 1
+        next_id += 2
+        resources = b"<< /Font << /F1 3 0 R >> >>"
+        if form_xobject:
+            form_id = next_id
+            next_id += 1
+            objects[form_id] = (b"<< /Type /XObject /Subtype /Form /BBox [0 0 595 842] /Resources " + resources +
+                                b" /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+            stream, resources = b"q /Fm1 Do Q", b"<< /XObject << /Fm1 %d 0 R >> >>" % form_id
+        objects[content_id] = b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        objects[page_id] = (b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                            b"/Resources " + resources + b" /Contents %d 0 R >>" % content_id)
+        page_ids.append(page_id)
+    kids = ' '.join(f"{pid} 0 R" for pid in page_ids).encode('ascii')
+    objects[2] = b"<< /Type /Pages /Kids [" + kids + b"] /Count %d >>" % len(page_ids)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for obj_id in sorted(objects):
+        offsets[obj_id] = len(out)
+        out += b"%d 0 obj\n" % obj_id + objects[obj_id] + b"\nendobj\n"
+    xref_pos = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for obj_id in range(1, len(objects) + 1):
+        out += b"%010d 00000 n \n" % offsets[obj_id]
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_pos)
+    with open(path, 'wb') as f:
+        f.write(out)
+    return path, competitor_pages
+
+
+# --- 행렬 ---
+def make_adjacency(num_nodes=100, density=0.05, sparse=True, seed=0):
+    """ 관계 강도(1~3) 값을 갖는 합성 인접 행렬 (sparse=True 면 CSR, 아니면 float32 ndarray) """
+    rng = np.random.default_rng(seed)
+    matrix = sp.random(num_nodes, num_nodes, density=density, format='csr', dtype=np.float32,
+                       random_state=rng, data_rvs=lambda n: rng.integers(1, 4, n).astype(np.float32))
+    return matrix if sparse else matrix.toarray()
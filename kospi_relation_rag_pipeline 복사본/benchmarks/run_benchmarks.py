@@ -0,0 +1,231 @@
+# benchmarks/run_benchmarks.py
+# 오프라인 재현 가능 벤치마크 모음: fixtures.py 의 합성 DART/FnGuide 데이터로
+# decode_content, 섹션 추출(기존/스트리밍), ZIP 추출, process_fnguide_pdf, save_matrix,
+# batch_parser 배치 파싱(workers=1..N 확장성)을 규모별로 측정
+#
+# 사용법:
+#   python benchmarks/run_benchmarks.py                                  # 전체 (small, medium)
+#   python benchmarks/run_benchmarks.py --scales small medium large --suites decode extract
+#   python benchmarks/run_benchmarks.py --suites batch --max-workers 8                # 워커 수별 배치 파싱
+#   python benchmarks/run_benchmarks.py --baseline benchmarks/results/bench-20240101-000000.jsonl
+#
+# 결과: benchmarks/results/bench-<시각>.jsonl (첫 줄 실행 환경, 이후 케이스별 한 줄)
+# --baseline 을 주면 같은 (suite, case, scale) 의 min_s 를 비교해 --threshold 이상 느려진 케이스를 표시하고 종료 코드 1 반환.
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.abspath(os.path.join(BENCH_DIR, os.pardir, 'core')))
+sys.path.insert(0, BENCH_DIR)
+
+from fixtures import make_adjacency, make_dart_xml, make_dart_zip, make_fnguide_pdf
+
+# 규모별 입력 크기
+SCALES = {
+    'small': {'xml_kb': 100, 'pdf_pages': 10, 'nodes': 100, 'reports': 8},
+    'medium': {'xml_kb': 500, 'pdf_pages': 50, 'nodes': 1000, 'reports': 16},
+    'large': {'xml_kb': 2000, 'pdf_pages': 200, 'nodes': 5000, 'reports': 32},
+}
+DENSE_MAX_NODES = 2000 # 밀집 행렬은 이 크기까지만 측정 (5000x5000 float64 = 200MB)
+MATRIX_DENSITY = 0.01
+SUITES = ('decode', 'extract', 'zip', 'pdf', 'matrix', 'batch')
+DEFAULT_RESULTS_DIR = os.path.join(BENCH_DIR, 'results')
+
+
+def timeit(func, repeat):
+    """ func() 를 repeat 번 실행. 반환: (실행 시간 리스트, 마지막 결과) """
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+
+def make_record(suite, case, scale, times, input_bytes=None, **extra):
+    record = {'suite': suite, 'case': case, 'scale': scale, 'repeat': len(times),
+              'min_s': round(min(times), 6), 'median_s': round(statistics.median(times), 6)}
+    if input_bytes:
+        record['input_bytes'] = input_bytes
+        record['mb_per_s'] = round(input_bytes / 2**20 / min(times), 3) if min(times) > 0 else None
+    record.update(extra)
+    return record
+
+
+# --- 스위트 ---
+def bench_decode(scale, params, repeat, workdir):
+    from dart_utils import decode_content
+    for encoding in ('utf-8', 'cp949'):
+        raw = make_dart_xml(params['xml_kb'], encoding, seed=1)
+        times, text = timeit(lambda: decode_content(raw), repeat)
+        yield make_record('decode', f'decode_content[{encoding}]', scale, times, len(raw), chars=len(text))
+
+
+def bench_extract(scale, params, repeat, workdir):
+    from dart_utils import decode_content, extract_sections_streaming, extract_targeted_data_from_xml
+    for encoding in ('utf-8', 'cp949'):
+        raw = make_dart_xml(params['xml_kb'], encoding, seed=2)
+        text = decode_content(raw)
+        cases = [
+            ('extract_targeted_data_from_xml', lambda: extract_targeted_data_from_xml(text, 'bench', 'bench', 'bench')),
+            ('extract_sections_streaming', lambda: extract_sections_streaming(raw, 'bench', 'bench', 'bench')),
+        ]
+        for name, func in cases:
+            times, sections = timeit(func, repeat)
+            yield make_record('extract', f'{name}[{encoding}]', scale, times, len(raw),
+                              sections=len(sections), chars=sum(len(s['content']) for s in sections))
+
+
+def bench_zip(scale, params, repeat, workdir):
+    from dart_utils import extract_report_file_from_zip, read_report_from_zip
+    raw = make_dart_xml(params['xml_kb'], 'utf-8', seed=3)
+    zip_path = make_dart_zip(os.path.join(workdir, f'{scale}.zip'), raw, attachments=3, seed=3)
+    extract_base = os.path.join(workdir, 'extracted')
+    os.makedirs(extract_base, exist_ok=True)
+    times, result = timeit(lambda: extract_report_file_from_zip(zip_path, extract_base), repeat)
+    yield make_record('zip', 'extract_report_file_from_zip', scale, times, os.path.getsize(zip_path), ok=bool(result[0]))
+    times, result = timeit(lambda: read_report_from_zip(zip_path), repeat)
+    yield make_record('zip', 'read_report_from_zip', scale, times, os.path.getsize(zip_path), ok=result[0] is not None)
+
+
+def bench_pdf(scale, params, repeat, workdir):
+    from pdf_processor import process_fnguide_pdf
+    pdf_path, competitor_pages = make_fnguide_pdf(os.path.join(workdir, f'{scale}.pdf'), params['pdf_pages'], seed=4)
+    times, docs = timeit(lambda: process_fnguide_pdf(pdf_path, 'bench'), repeat)
+    yield make_record('pdf', 'process_fnguide_pdf', scale, times, os.path.getsize(pdf_path),
+                      pages=params['pdf_pages'], pages_per_s=round(params['pdf_pages'] / min(times), 2),
+                      docs=len(docs), expected_docs=len(competitor_pages))
+
+
+def bench_matrix(scale, params, repeat, workdir):
+    from matrix_builder import save_matrix
+    nodes = params['nodes']
+    layouts = [('sparse', True)] + ([('dense', False)] if nodes <= DENSE_MAX_NODES else [])
+    for layout, sparse in layouts:
+        matrix = make_adjacency(nodes, MATRIX_DENSITY, sparse=sparse, seed=5)
+        path = os.path.join(workdir, f'{scale}-{layout}.npz')
+        times, _ = timeit(lambda: save_matrix(matrix, path), repeat)
+        yield make_record('matrix', f'save_matrix[{layout}]', scale, times, nodes=nodes,
+                          nnz=int(matrix.nnz if sparse else (matrix != 0).sum()), file_bytes=os.path.getsize(path))
+
+
+def worker_counts(max_workers):
+    """ 1, 2, 4, ... max_workers (마지막은 항상 max_workers) """
+    counts, n = [], 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    return counts + [max_workers]
+
+
+def bench_batch(scale, params, repeat, workdir):
+    from batch_parser import STATUS_PARSED, iter_parse_reports
+    jobs, total_bytes = [], 0
+    for i in range(params['reports']):
+        raw = make_dart_xml(params['xml_kb'], 'utf-8', seed=100 + i)
+        zip_path = make_dart_zip(os.path.join(workdir, f'{scale}-batch-{i}.zip'), raw, seed=100 + i)
+        jobs.append((zip_path, f'{i:06d}', f'bench-{i}', f'R{i}'))
+        total_bytes += len(raw)
+    single = None
+    for workers in worker_counts(params['max_workers']):
+        times, results = timeit(lambda: list(iter_parse_reports(jobs, max_workers=workers)), repeat)
+        single = single or min(times)
+        yield make_record('batch', f'iter_parse_reports[workers={workers}]', scale, times, total_bytes,
+                          reports=len(jobs), workers=workers, speedup=round(single / min(times), 2),
+                          parsed=sum(r['status'] == STATUS_PARSED for r in results))
+
+
+SUITE_FUNCS = {'decode': bench_decode, 'extract': bench_extract, 'zip': bench_zip, 'pdf': bench_pdf, 'matrix': bench_matrix,
+               'batch': bench_batch}
+
+
+# --- 결과 파일 ---
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCH_DIR,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {'type': 'meta', 'created_at': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(), 'platform': platform.platform(),
+            'cpu_count': os.cpu_count(), 'git_commit': commit}
+
+
+def load_results(path):
+    """ 결과 파일 -> {(suite, case, scale): record} """
+    results = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get('type') == 'meta': continue
+            results[(record['suite'], record['case'], record['scale'])] = record
+    return results
+
+
+def compare(records, baseline, threshold):
+    """ 기준 결과 대비 min_s 비율 출력. 반환: 회귀 케이스 리스트 """
+    regressions = []
+    print(f"\n{'suite':<8} {'case':<46} {'scale':<7} {'base(ms)':>10} {'now(ms)':>10} {'ratio':>7}")
+    for record in records:
+        base = baseline.get((record['suite'], record['case'], record['scale']))
+        if base is None: continue
+        ratio = record['min_s'] / base['min_s'] if base['min_s'] > 0 else float('inf')
+        flag = ' REGRESSION' if ratio > 1 + threshold else ''
+        if flag: regressions.append(record)
+        print(f"{record['suite']:<8} {record['case'][:46]:<46} {record['scale']:<7} {base['min_s'] * 1000:>10.2f} "
+              f"{record['min_s'] * 1000:>10.2f} {ratio:>7.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="합성 데이터 기반 오프라인 벤치마크")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['small', 'medium'])
+    parser.add_argument('--suites', nargs='+', choices=SUITES, default=list(SUITES))
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1,
+                        help="batch 스위트의 최대 워커 수 (1, 2, 4, ... 까지 측정)")
+    parser.add_argument('--repeat', type=int, default=5, help="케이스별 반복 횟수 (min/median 기록)")
+    parser.add_argument('--output', help="결과 JSON-lines 경로 (기본: benchmarks/results/bench-<시각>.jsonl)")
+    parser.add_argument('--baseline', help="비교할 이전 결과 파일")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀 판정 기준 (0.2 = 20%% 이상 느려짐)")
+    args = parser.parse_args()
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"bench-{datetime.datetime.now():%Y%m%d-%H%M%S}.jsonl")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    workdir = tempfile.mkdtemp(prefix='kospi-bench-')
+    records = []
+    try:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(environment(), ensure_ascii=False) + '\n')
+            for scale in args.scales:
+                for suite in args.suites:
+                    for record in SUITE_FUNCS[suite](scale, dict(SCALES[scale], max_workers=args.max_workers),
+                                                               args.repeat, workdir):
+                        records.append(record)
+                        f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                        f.flush()
+                        rate = f" {record['mb_per_s']:>8.2f} MB/s" if record.get('mb_per_s') else ''
+                        print(f"{record['suite']:<8} {record['case'][:46]:<46} {scale:<7} "
+                              f"min {record['min_s'] * 1000:>9.2f} ms  median {record['median_s'] * 1000:>9.2f} ms{rate}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    print(f"\n결과 저장: {output}")
+
+    if args.baseline:
+        regressions = compare(records, load_results(args.baseline), args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)}개 케이스가 기준 대비 {args.threshold:.0%} 이상 느려졌습니다.")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
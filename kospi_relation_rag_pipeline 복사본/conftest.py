@@ -0,0 +1,10 @@
+# conftest.py
+# pytest 공통 설정: 프로젝트 루트(core 패키지)와 benchmarks/(합성 입력 fixtures) 를 sys.path 에 추가
+# 테스트는 노트북과 달리 core 모듈을 패키지(core.xxx)로 임포트해 상대/평면 임포트 폴백을 함께 검사
+
+import os
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.abspath(__file__))
+for path in (PROJECT_DIR, os.path.join(PROJECT_DIR, 'benchmarks')):
+    if path not in sys.path: sys.path.insert(0, path)
@@ -0,0 +1,3 @@
+# core/__init__.py
+# core 모듈은 패키지(core.xxx)로 임포트할 때와 core/ 를 sys.path 에 두고 평면 임포트할 때(노트북) 모두 동작하도록
+# 내부 모듈(config 포함)을 상대 임포트로 가져오고, ImportError 이면 평면 임포트로 대체
@@ -0,0 +1,145 @@
+# core/batch_parser.py
+# DART 보고서 XML 배치 파싱: ProcessPoolExecutor 로 여러 ZIP 을 병렬 파싱하고 완료 순서대로 결과를 yield
+# - 작업: (zip_path, company_code, company_name[, rcept_no]) 또는 {'zip_path', 'code', 'name'[, 'rcept_no']} dict
+# - 작업별 제한 시간(워커 프로세스 내부 SIGALRM)과 예외를 결과 dict 로 기록 (배치 전체는 중단되지 않음)
+# - 실패 목록은 {'code', 'name', 'zip_path', 'status', 'reason'} 형태의 구조화된 dict 리스트
+# - manifest(run_manifest.RunManifest)를 주면 rcept_no 가 있는 작업의 'parsed' 완료/실패를 기록
+
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    from .config import logger, PARSE_WORKERS, PARSE_TIMEOUT_SECONDS
+    from .dart_utils import read_report_from_zip, extract_sections_streaming
+    from .profiler import PROFILER
+except ImportError:
+    from config import logger, PARSE_WORKERS, PARSE_TIMEOUT_SECONDS
+    from dart_utils import read_report_from_zip, extract_sections_streaming
+    from profiler import PROFILER
+
+# 결과 status
+STATUS_PARSED = 'parsed'
+STATUS_CACHED = 'cached'
+STATUS_EMPTY = 'empty' # 파싱은 됐지만 추출된 섹션 없음
+STATUS_TIMEOUT = 'timeout'
+STATUS_FAILED = 'failed'
+SUCCESS_STATUSES = {STATUS_PARSED, STATUS_CACHED}
+
+
+class ParseTimeout(BaseException):
+    """ 파싱 제한 시간 초과. extract_sections_streaming 의 except Exception 에 잡히지 않도록 BaseException 상속 """
+
+
+def _raise_timeout(signum, frame):
+    raise ParseTimeout()
+
+
+def _normalize_job(job):
+    """ (zip_path, code, name[, rcept_no]) 튜플 또는 같은 키의 dict -> 작업 dict """
+    if isinstance(job, dict): return dict({'rcept_no': None}, **job)
+    zip_path, company_code, company_name, *rest = job
+    return {'zip_path': zip_path, 'code': company_code, 'name': company_name, 'rcept_no': rest[0] if rest else None}
+
+
+def _result(job, status, sections=None, reason=None, member=None, elapsed=0.0):
+    return dict(job, status=status, sections=sections or [], reason=reason, member=member, elapsed=elapsed)
+
+
+def parse_report_job(job, timeout=PARSE_TIMEOUT_SECONDS):
+    """ 워커 프로세스에서 실행: ZIP 에서 보고서를 읽어 섹션 추출. 예외를 던지지 않고 결과 dict 반환 """
+    job = _normalize_job(job)
+    start = time.perf_counter()
+    use_alarm = bool(timeout) and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        report_bytes, _ext, member = read_report_from_zip(job['zip_path'])
+        if report_bytes is None:
+            return _result(job, STATUS_FAILED, reason='ZIP 내 보고서 파일 없음', elapsed=time.perf_counter() - start)
+        source_id = job['rcept_no'] or os.path.basename(job['zip_path'])
+        sections = extract_sections_streaming(report_bytes, source_id, job['code'], job['name'])
+        status = STATUS_PARSED if sections else STATUS_EMPTY
+        reason = None if sections else '정보 추출 실패(XML Parse)'
+        return _result(job, status, sections, reason, member, time.perf_counter() - start)
+    except ParseTimeout:
+        return _result(job, STATUS_TIMEOUT, reason=f'파싱 시간 초과 ({timeout}s)', elapsed=time.perf_counter() - start)
+    except Exception as e:
+        return _result(job, STATUS_FAILED, reason=f"{e.__class__.__name__}: {e}", elapsed=time.perf_counter() - start)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _mark_parsed(manifest, result):
+    """ 파싱 결과를 매니페스트에 기록 (rcept_no 없는 작업은 건너뜀) """
+    if manifest is None or not result['rcept_no']: return
+    if result['status'] in SUCCESS_STATUSES:
+        manifest.mark(None, result['rcept_no'], 'parsed', sections=len(result['sections']))
+    else:
+        manifest.mark_failed(None, result['rcept_no'], 'parsed', f"{result['status']}: {result['reason']}")
+
+
+def iter_parse_reports(jobs, max_workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT_SECONDS, cache=None, manifest=None):
+    """
+    여러 보고서를 프로세스 풀로 파싱하고 완료되는 순서대로 결과 dict 를 yield.
+    결과: {'zip_path', 'code', 'name', 'rcept_no', 'status', 'sections', 'reason', 'member', 'elapsed'}
+    cache(report_cache.ReportCache)와 rcept_no 가 있으면 캐시된 섹션은 파싱 없이 반환하고, 새 결과는 캐시에 저장.
+    manifest(run_manifest.RunManifest)를 주면 rcept_no 가 있는 작업의 'parsed' 단계 완료/실패를 기록.
+    """
+    pending = []
+    for job in jobs:
+        job = _normalize_job(job)
+        if cache is not None and job['rcept_no']:
+            sections = cache.get_sections(job['rcept_no'])
+            if sections is not None:
+                result = _result(job, STATUS_CACHED, sections)
+                _mark_parsed(manifest, result)
+                yield result
+                continue
+        pending.append(job)
+    if not pending: return
+
+    logger.info(f"배치 파싱 시작: {len(pending)}건, workers={max_workers}, timeout={timeout}s")
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(parse_report_job, job, timeout): job for job in pending}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e: # 워커 프로세스 비정상 종료 등
+                result = _result(job, STATUS_FAILED, reason=f"{e.__class__.__name__}: {e}")
+            # 워커 프로세스 안의 계측은 부모로 오지 않으므로 워커가 잰 시간을 여기서 기록
+            PROFILER.record('parse', result['elapsed'], company=job['code'], ok=result['status'] in SUCCESS_STATUSES,
+                            sections=len(result['sections']))
+            if result['status'] == STATUS_PARSED and cache is not None and job['rcept_no']:
+                cache.put_sections(job['rcept_no'], result['sections'])
+            _mark_parsed(manifest, result)
+            if result['status'] in SUCCESS_STATUSES:
+                logger.info(f"{job['code']}: {len(result['sections'])}개 섹션 추출 ({result['elapsed']:.2f}s)")
+            else:
+                logger.warning(f"{job['code']}: 파싱 실패 ({result['status']}: {result['reason']})")
+            yield result
+    finally:
+        # 소비자가 중간에 멈추면(break/close) 대기 중인 작업은 취소하고 기다리지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def failure_record(result):
+    """ 결과 dict 에서 로그/재처리용 실패 레코드 생성 """
+    return {key: result.get(key) for key in ('code', 'name', 'zip_path', 'rcept_no', 'status', 'reason')}
+
+
+def parse_reports(jobs, max_workers=PARSE_WORKERS, timeout=PARSE_TIMEOUT_SECONDS, cache=None, manifest=None):
+    """ iter_parse_reports 를 모두 소비. 반환: ({company_code: sections}, [실패 레코드]) """
+    sections_by_code, failures = {}, []
+    for result in iter_parse_reports(jobs, max_workers, timeout, cache, manifest):
+        if result['status'] in SUCCESS_STATUSES: sections_by_code[result['code']] = result['sections']
+        else: failures.append(failure_record(result))
+    logger.info(f"배치 파싱 완료 (성공: {len(sections_by_code)}, 실패: {len(failures)})")
+    if failures: logger.warning(f"파싱 실패 목록: {failures}")
+    return sections_by_code, failures
@@ -0,0 +1,60 @@
+# core/capabilities.py
+# 선택적 의존성 확인/지연 로드 API
+# - has(name): 모듈을 임포트하지 않고 설치 여부만 확인 (importlib.util.find_spec)
+# - require(name): 처음 사용할 때 임포트해서 반환. 없으면 설치 안내가 담긴 MissingDependencyError
+# - report(): 노트북에서 환경 점검용 {기능: 사용 가능 여부}
+# 모듈 최상단에서 무거운 라이브러리(dart_fss, lxml, langchain 등)를 임포트하거나
+# 임포트 시점에 print 하지 않고, 실제 기능 호출 시점에 require() 로 로드합니다.
+
+import importlib
+import importlib.util
+
+# 기능 이름 -> (임포트할 모듈, pip 패키지 이름, 사용처)
+CAPABILITIES = {
+    'lxml': ('lxml.etree', 'lxml', "DART XML 섹션 추출 (dart_utils)"),
+    'dart_fss': ('dart_fss', 'dart-fss', "dart-fss 기반 보고서 검색/다운로드 (dart_utils)"),
+    'dart_download': ('dart_fss.api.filings', 'dart-fss', "공시서류 원본파일 다운로드 (dart_utils.download_report_file)"),
+    'requests': ('requests', 'requests', "DART OpenAPI 동시 수집 (dart_fetcher)"),
+    'tenacity': ('tenacity', 'tenacity', "재시도 (dart_utils, dart_fetcher)"),
+    'pypdf2': ('PyPDF2', 'PyPDF2', "FnGuide PDF 텍스트 추출 (pdf_processor)"),
+    'langchain': ('langchain.docstore.document', 'langchain', "Document 객체 (pdf_processor)"),
+    'pandas': ('pandas', 'pandas openpyxl', "기업명 매핑 엑셀 로드 (matrix_builder.CompanyIndex)"),
+    'faiss': ('faiss', 'faiss-cpu', "벡터 인덱스 (embedding_store)"),
+    'sentence_transformers': ('sentence_transformers', 'sentence-transformers', "임베딩 모델 (embedding_store)"),
+    'transformers': ('transformers', 'transformers accelerate', "로컬 LLM 관계 추출 (relation_extractor)"),
+}
+
+_available = {} # 기능 이름 -> bool (find_spec 결과 캐시)
+
+
+class MissingDependencyError(ImportError):
+    """ 선택적 의존성이 설치되지 않아 기능을 사용할 수 없음 """
+    def __init__(self, name):
+        module, package, usage = CAPABILITIES[name]
+        super().__init__(f"'{module}' 모듈이 필요합니다 ({usage}). 'pip install {package}' 로 설치해주세요.")
+        self.capability = name
+
+
+def has(name):
+    """ 기능 사용 가능 여부 (모듈을 실제로 임포트하지 않음) """
+    if name not in _available:
+        module = CAPABILITIES[name][0]
+        try:
+            _available[name] = importlib.util.find_spec(module) is not None
+        except (ImportError, ValueError): # 상위 패키지가 없으면 find_spec 이 ModuleNotFoundError
+            _available[name] = False
+    return _available[name]
+
+
+def require(name):
+    """ 기능에 필요한 모듈을 임포트해서 반환 (두 번째 호출부터는 sys.modules 캐시). 없으면 MissingDependencyError """
+    try:
+        return importlib.import_module(CAPABILITIES[name][0])
+    except ImportError as e:
+        _available[name] = False
+        raise MissingDependencyError(name) from e
+
+
+def report():
+    """ {기능 이름: 사용 가능 여부} """
+    return {name: has(name) for name in CAPABILITIES}
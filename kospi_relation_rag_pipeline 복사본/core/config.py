@@ -6,12 +6,54 @@ import sys
 
 # --- 재시도 설정 (dart_utils에서 사용) ---
 RETRY_ATTEMPTS = 3
-RETRY_WAIT_SECONDS = 5
+RETRY_WAIT_SECONDS = 5 # 지수 백오프 기본 대기 시간 (multiplier)
+RETRY_MAX_WAIT_SECONDS = 60 # 지수 백오프 최대 대기 시간
 
 # --- DART 관련 설정 (dart_utils에서 사용) ---
 # 처리 대상 보고서 코드 (사업보고서, 반기보고서, 분기보고서, 1Q보고서)
 TARGET_REPORT_CODES = ['11011', '11012', '11013', '11014']
 
+# --- DART OpenAPI 동시 수집 설정 (dart_fetcher에서 사용) ---
+DART_API_BASE_URL = "https://opendart.fss.or.kr/api"
+# DART 호출 한도(분당 약 1,000회 초과 시 차단)보다 여유 있게 설정
+DART_RATE_LIMIT_PER_MINUTE = 600
+DART_FETCH_WORKERS = 8 # 동시 검색/다운로드 스레드 수 (= HTTP 커넥션 풀 크기)
+DART_REQUEST_TIMEOUT = 30 # 초
+
+# --- 보고서 캐시 설정 (report_cache에서 사용) ---
+# 접수번호(rcept_no)가 같은 보고서는 바뀌지 않으므로 ZIP/섹션 결과를 재사용
+REPORT_CACHE_MAX_BYTES = 2 * 1024 ** 3 # 2GB 초과 시 오래 안 쓴 항목부터 삭제 (LRU)
+SEARCH_CACHE_TTL_SECONDS = 24 * 60 * 60 # 보고서 검색 결과 유효 시간
+
+# --- 배치 파싱 설정 (batch_parser에서 사용) ---
+PARSE_WORKERS = os.cpu_count() or 1 # XML 파싱 프로세스 수
+PARSE_TIMEOUT_SECONDS = 120 # 보고서 1건 파싱 제한 시간
+
+# --- 임베딩 단계 설정 (embedding_store에서 사용, CPU 전용) ---
+EMBEDDING_MODEL_NAME = "jhgan/ko-sroberta-multitask" # 한국어 sentence-transformers 모델
+EMBEDDING_BATCH_SIZE = 64
+FAISS_INDEX_TYPE = 'flat' # 'flat' | 'hnsw' | 'ivf'
+
+# --- 섹션 청킹 설정 (section_chunker에서 사용) ---
+CHUNK_MAX_TOKENS = 512 # 청크 최대 토큰 수 (임베딩 모델 입력 한도 기준)
+CHUNK_OVERLAP_TOKENS = 0 # 긴 블록 분할 시 창 사이 겹침 토큰 수
+
+# --- 단계별 계측 설정 (profiler에서 사용) ---
+PROFILING_ENABLED = False # True 면 단계별 시간/바이트/섹션 수 기록 (노트북에서 PROFILER.enable() 로도 켤 수 있음)
+PROFILE_MODE = None # None | 'cprofile' | 'tracemalloc' (실행 전체 프로파일링)
+PROFILE_REPORT_PATH = os.path.join('logs', 'pipeline_profile.jsonl') # 실행 종료 시 JSON-lines 리포트
+
+# --- LLM 관계 추출 설정 (relation_extractor에서 사용) ---
+LLM_MODEL_NAME = "Qwen/Qwen2.5-7B-Instruct" # 로컬 HuggingFace 생성 모델 (transformers + accelerate)
+LLM_BATCH_SIZE = 8 # 한 번에 생성할 프롬프트 수
+LLM_MAX_NEW_TOKENS = 512
+LLM_BUCKET_TOKENS = 256 # 길이 버킷 폭 (토큰): 비슷한 길이의 섹션끼리 배치해 패딩 낭비를 줄임
+LLM_QUEUE_MAXSIZE = 256 # 섹션 큐 크기 (파싱 단계가 앞서 나가도 메모리 상한 유지)
+
+# --- 기간별 스냅샷 설정 (temporal_store에서 사용) ---
+# 기준 스냅샷(전체 행렬) 사이 기간은 변경된 간선만 델타로 저장. 복원 시 기준 스냅샷부터 최대 이 수만큼 델타 적용
+TEMPORAL_CHECKPOINT_EVERY = 4 # 분기 기준 1년마다 기준 스냅샷
+
 # --- 로거 인스턴스 생성 ---
 # 다른 모듈(dart_utils, matrix_builder)에서 이 로거를 가져다 사용할 수 있도록 함.
 # 로거의 상세 설정(핸들러 추가, 레벨 설정 등)은 메인 노트북 Cell 1에서 수행함.
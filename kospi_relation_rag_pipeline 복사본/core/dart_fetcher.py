@@ -0,0 +1,295 @@
+# core/dart_fetcher.py
+# DART OpenAPI 동시 수집 단계: 여러 기업의 보고서 검색/다운로드를 스레드 풀로 병렬 실행
+# - 모든 요청은 공유 토큰 버킷(TokenBucket)을 거쳐 DART 호출 한도를 넘지 않음
+# - 재시도는 dart_utils.dart_retry (지터가 포함된 지수 백오프, tenacity.wait_random_exponential)
+# - requests.Session 커넥션 풀 재사용
+# - base_url 을 바꾸면 로컬 가짜 DART 서버(검색 JSON, ZIP 응답)로 테스트 가능
+# - cache(report_cache.ReportCache)를 주면 캐시된 검색 결과/ZIP은 네트워크 없이 재사용
+# - manifest(run_manifest.RunManifest)를 주면 이미 모든 단계를 마친 보고서는 건너뛰고, 미완료 보고서는 재개 단계 표시
+
+import os
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# requests, tenacity 는 처음 사용할 때 로드 (capabilities.require)
+try:
+    from .capabilities import require
+    from .config import (logger, DART_API_BASE_URL, DART_RATE_LIMIT_PER_MINUTE, DART_FETCH_WORKERS,
+                         DART_REQUEST_TIMEOUT)
+    from .dart_utils import dart_retry
+    from .profiler import stage
+except ImportError:
+    from capabilities import require
+    from config import (logger, DART_API_BASE_URL, DART_RATE_LIMIT_PER_MINUTE, DART_FETCH_WORKERS,
+                        DART_REQUEST_TIMEOUT)
+    from dart_utils import dart_retry
+    from profiler import stage
+
+# 보고서 코드(reprt_code) -> 공시 상세유형(pblntf_detail_ty), 보고서명, 보고 기간 말 월
+# list.json 에는 reprt_code 가 없으므로 report_nm('분기보고서 (2024.03)')의 보고서명 + 기간 월로 구분
+# (1분기/3분기는 보고서명이 같음). 사업보고서는 결산월이 기업마다 달라 월을 보지 않음
+REPORT_CODE_DETAIL_TYPES = {
+    '11011': ('A001', '사업보고서', None),
+    '11012': ('A002', '반기보고서', '06'),
+    '11013': ('A003', '분기보고서', '03'), # 1분기
+    '11014': ('A003', '분기보고서', '09'), # 3분기
+}
+_REPORT_PERIOD_REGEX = re.compile(r'\(\d{4}\.(\d{2})\)')
+LIST_PAGE_COUNT = 100 # list.json 페이지당 건수 (DART 최대 100)
+
+# DART 응답 status 코드
+DART_STATUS_OK = '000'
+DART_STATUS_NO_DATA = '013'
+DART_RETRYABLE_STATUSES = {'020', '800'} # 요청 제한 초과, 시스템 점검
+
+
+class DartAPIError(Exception):
+    """ DART 가 오류 status 를 반환한 경우 (키 오류 등, 재시도하지 않음) """
+    def __init__(self, status, message=""):
+        super().__init__(f"DART API error {status}: {message}")
+        self.status = status
+
+
+class DartRetryableError(DartAPIError):
+    """ 요청 제한 초과/점검 등 잠시 후 재시도하면 되는 DART 오류 """
+
+
+class TokenBucket:
+    """ 스레드 안전 토큰 버킷. acquire()는 토큰이 생길 때까지 대기 """
+    def __init__(self, rate_per_second, capacity=None):
+        if rate_per_second <= 0: raise ValueError("rate_per_second must be positive")
+        self.rate = float(rate_per_second)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate_per_second))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, calls_per_minute, capacity=None):
+        return cls(calls_per_minute / 60.0, capacity)
+
+    def acquire(self, tokens=1.0):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+# 네트워크 오류와 일시적인 DART 오류만 재시도 (requests 는 첫 호출 시 로드)
+_dart_retry = dart_retry(lambda: (require('requests').RequestException, DartRetryableError), reraise=True)
+
+
+def match_report_code(report_nm, report_codes):
+    """ report_nm 이 report_codes 중 어느 보고서인지 판별해 reprt_code 반환 (해당 없으면 None) """
+    period = _REPORT_PERIOD_REGEX.search(report_nm)
+    month = period.group(1) if period else None
+    for code in report_codes:
+        if code not in REPORT_CODE_DETAIL_TYPES: continue
+        _detail_ty, name, period_month = REPORT_CODE_DETAIL_TYPES[code]
+        if name in report_nm and (period_month is None or month is None or month == period_month): return code
+    return None
+
+
+def _check_status(payload):
+    """ DART JSON 응답의 status 검사. 데이터 없음이면 False, 정상이면 True """
+    status = str(payload.get('status', ''))
+    if status == DART_STATUS_OK: return True
+    if status == DART_STATUS_NO_DATA: return False
+    if status in DART_RETRYABLE_STATUSES: raise DartRetryableError(status, payload.get('message', ''))
+    raise DartAPIError(status, payload.get('message', ''))
+
+
+class DartFetcher:
+    """
+    DART OpenAPI(list.json, document.xml) 클라이언트.
+    하나의 인스턴스(세션 + 토큰 버킷)를 여러 스레드가 공유합니다.
+    """
+    def __init__(self, api_key, base_url=DART_API_BASE_URL, rate_limiter=None,
+                 max_workers=DART_FETCH_WORKERS, timeout=DART_REQUEST_TIMEOUT, cache=None, manifest=None):
+        if not api_key: raise ValueError("DART API key 없음")
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.rate_limiter = rate_limiter or TokenBucket.per_minute(DART_RATE_LIMIT_PER_MINUTE)
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.cache = cache
+        self.manifest = manifest
+        requests = require('requests')
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _get(self, endpoint, params, stream=False):
+        self.rate_limiter.acquire()
+        response = self.session.get(f"{self.base_url}/{endpoint}", params={'crtfc_key': self.api_key, **params},
+                                    timeout=self.timeout, stream=stream)
+        if response.status_code == 429 or response.status_code >= 500:
+            response.close()
+            raise DartRetryableError(str(response.status_code), "HTTP error")
+        response.raise_for_status()
+        return response
+
+    @_dart_retry
+    def _list_page(self, params, page_no):
+        """ list.json 한 페이지 payload (페이지 단위로 재시도). 데이터 없음이면 None """
+        payload = self._get('list.json', dict(params, page_no=page_no, page_count=LIST_PAGE_COUNT)).json()
+        return payload if _check_status(payload) else None
+
+    def search_latest_report(self, corp_code, year, report_codes=('11011',)):
+        """
+        지정 연도의 최신 정기보고서 1건을 dict(rcept_no, report_nm, reprt_code, ...)로 반환. 없으면 None
+        최신순 목록을 페이지 단위로 넘기며 report_codes 에 해당하는 첫 보고서를 찾음
+        """
+        wanted = [c for c in report_codes if c in REPORT_CODE_DETAIL_TYPES]
+        logger.debug(f"Searching for report: corp={corp_code}, year={year}, codes={','.join(report_codes)}")
+        params = {'corp_code': corp_code, 'bgn_de': f"{year}0101", 'end_de': f"{year}1231",
+                  'pblntf_ty': 'A', 'sort': 'date', 'sort_mth': 'desc'}
+        page_no, total_page = 1, 1
+        while page_no <= total_page:
+            payload = self._list_page(params, page_no)
+            if payload is None:
+                logger.warning(f"{corp_code}({year}) 대상 보고서 없음.")
+                return None
+            for report in payload.get('list', []):
+                report_nm = report.get('report_nm', '')
+                reprt_code = match_report_code(report_nm, wanted) if wanted else None
+                if not wanted or reprt_code:
+                    logger.info(f"{corp_code}({year}) 최신 보고서({report_nm}) 찾음: rcept_no={report.get('rcept_no')}")
+                    return dict(report, reprt_code=reprt_code) if reprt_code else report
+            total_page = int(payload.get('total_page') or 1)
+            page_no += 1
+        logger.warning(f"{corp_code}({year}) 대상 보고서({','.join(report_codes)}) 없음.")
+        return None
+
+    @_dart_retry
+    def download_report(self, rcept_no, download_path):
+        """ 공시서류 원본파일(ZIP)을 download_path/<rcept_no>.zip 으로 저장 후 경로 반환. 실패 시 None """
+        if not rcept_no: raise ValueError("다운로드할 rcept_no 없음")
+        os.makedirs(download_path, exist_ok=True)
+        file_path = os.path.join(download_path, f"{rcept_no}.zip")
+        tmp_path = f"{file_path}.part-{threading.get_ident()}"
+        logger.info(f"다운로드 시도: rcept_no={rcept_no}, 경로={download_path}")
+        try:
+            with self._get('document.xml', {'rcept_no': rcept_no}, stream=True) as response:
+                chunks = response.iter_content(chunk_size=64 * 1024)
+                head = next(chunks, b'')
+                if not head.startswith(b'PK'):
+                    # ZIP 대신 오류 XML 이 온 경우 status 확인
+                    body = head + b''.join(chunks)
+                    status = _parse_error_status(body)
+                    if status in DART_RETRYABLE_STATUSES: raise DartRetryableError(status, "document.xml")
+                    logger.error(f"다운로드 실패: ZIP 아님 (rcept_no={rcept_no}, status={status})")
+                    return None
+                with open(tmp_path, 'wb') as f:
+                    f.write(head)
+                    for chunk in chunks: f.write(chunk)
+            if not zipfile.is_zipfile(tmp_path):
+                logger.error(f"다운로드 실패: BadZipFile (rcept_no={rcept_no})")
+                return None
+            os.replace(tmp_path, file_path)
+        finally:
+            # 중간에 끊긴 다운로드/검증 실패 시 임시 파일 정리 (성공 시에는 이미 이동됨)
+            if os.path.exists(tmp_path): os.remove(tmp_path)
+        logger.info(f"보고서 {rcept_no} 다운로드 및 검증 완료: {file_path}")
+        return file_path
+
+    def fetch_report(self, job, year, download_dir, report_codes=('11011',)):
+        """
+        한 기업의 검색 + 다운로드. job 딕셔너리에 결과 필드를 더한 dict 반환 (예외를 던지지 않음)
+        status: 'downloaded' | 'cached' | 'resumed' | 'unchanged' | 'no_report' | 'failed'
+        """
+        result = dict(job, status='failed', report=None, zip_path=None, reason=None, resume_stage=None)
+        code = job.get('code') or job['corp_code']
+        try:
+            report = self.cache.get_search(job['corp_code'], year, report_codes) if self.cache else None
+            if report is None:
+                with stage('search', company=code):
+                    report = self.search_latest_report(job['corp_code'], year, report_codes)
+                if self.cache: self.cache.put_search(job['corp_code'], year, report_codes, report)
+            if report is None:
+                result.update(status='no_report', reason='대상 보고서 없음')
+                return result
+            result['report'] = report
+            rcept_no = report['rcept_no']
+
+            if self.manifest:
+                todo, _unchanged = self.manifest.diff(
+                    [dict(report, corp_code=job['corp_code'], stock_code=report.get('stock_code') or job.get('code'))])
+                if not todo:
+                    logger.info(f"{code}: 변경 없음 (rcept_no={rcept_no}, 모든 단계 완료)")
+                    result.update(status='unchanged')
+                    return result
+                result['resume_stage'] = todo[0]['resume_stage']
+                known_zip = todo[0]['manifest_info'].get('zip_path')
+                if result['resume_stage'] != 'downloaded' and known_zip and os.path.exists(known_zip):
+                    logger.info(f"{code}: '{result['resume_stage']}' 단계부터 재개 (rcept_no={rcept_no})")
+                    result.update(status='resumed', zip_path=known_zip)
+                    return result
+
+            zip_path = self.cache.get_zip_path(rcept_no) if self.cache else None
+            if zip_path:
+                logger.info(f"{code}: 캐시된 보고서 사용 (rcept_no={rcept_no})")
+                result.update(status='cached', zip_path=zip_path)
+                return result
+            with stage('download', company=code) as record:
+                if self.cache:
+                    # 캐시 스테이징 폴더로 받은 뒤 content-addressed 위치로 이동
+                    zip_path = self.download_report(rcept_no, os.path.join(self.cache.staging_dir, code))
+                    if zip_path: zip_path = self.cache.put_zip(rcept_no, zip_path, move=True)
+                else:
+                    zip_path = self.download_report(rcept_no, os.path.join(download_dir, code))
+                if zip_path: record.add(bytes=os.path.getsize(zip_path))
+            if zip_path is None:
+                result['reason'] = '다운로드 실패'
+                if self.manifest: self.manifest.mark_failed(job['corp_code'], rcept_no, 'downloaded', result['reason'])
+                return result
+            result.update(status='downloaded', zip_path=zip_path)
+            if self.manifest: self.manifest.mark(job['corp_code'], rcept_no, 'downloaded', zip_path=zip_path)
+        except Exception as e:
+            logger.error(f"{code}: DART 수집 실패 - {e.__class__.__name__}: {e}")
+            result['reason'] = f"{e.__class__.__name__}: {e}"
+        return result
+
+    def fetch_many(self, jobs, year, download_dir, report_codes=('11011',)):
+        """
+        여러 기업의 검색/다운로드를 스레드 풀로 동시에 실행하고, 완료되는 순서대로 결과 dict를 yield.
+        jobs: [{'corp_code': '00126380', 'code': '005930', 'name': '삼성전자'}, ...] ('corp_code' 필수)
+        """
+        jobs = list(jobs)
+        logger.info(f"DART 동시 수집 시작: {len(jobs)}개 기업, workers={self.max_workers}")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [executor.submit(self.fetch_report, job, year, download_dir, report_codes) for job in jobs]
+            for future in as_completed(futures):
+                yield future.result()
+
+
+def _parse_error_status(body):
+    """ DART 오류 응답(XML/JSON) 본문에서 status 코드 추출 """
+    text = body[:2048].decode('utf-8', errors='replace')
+    start = text.find('<status>')
+    if start != -1:
+        end = text.find('</status>', start)
+        return text[start + len('<status>'):end].strip()
+    start = text.find('"status"')
+    if start != -1:
+        return text[start:].split('"')[3]
+    return None
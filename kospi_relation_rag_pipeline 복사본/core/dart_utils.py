@@ -1,63 +1,91 @@
 # core/dart_utils.py (v5 - 최종: 섹션 추출 + 기존 함수 유지)
 
+import codecs
+import functools
 import os
 import re
+import shutil
 import traceback
 import zipfile
 import io
-import requests # 필요시 사용
-from bs4 import BeautifulSoup # decode_content 에서 사용
-try:
-    from lxml import etree # XML/HTML 파싱용
-    LXML_AVAILABLE = True
-except ImportError:
-    LXML_AVAILABLE = False
-    print("CRITICAL ERROR: lxml 라이브러리가 필요합니다. 'pip install lxml' 로 설치해주세요. XML 파싱이 불가능합니다.")
+from collections import deque
+from types import SimpleNamespace
 
+# lxml, dart_fss, tenacity 는 처음 사용할 때 로드 (capabilities.require)
+# 설치 여부는 capabilities.has('lxml') / has('dart_download') 로 확인
 try:
-    import dart_fss as dart
+    from .capabilities import has, require
+    from .config import logger, RETRY_ATTEMPTS, RETRY_WAIT_SECONDS, RETRY_MAX_WAIT_SECONDS
+    from .page_classifier import PageClassifier
+    from .profiler import stage, timed
 except ImportError:
-    print("ERROR: dart-fss 라이브러리가 설치되지 않았습니다. pip install dart-fss")
-    dart = None
+    from capabilities import has, require
+    from config import logger, RETRY_ATTEMPTS, RETRY_WAIT_SECONDS, RETRY_MAX_WAIT_SECONDS
+    from page_classifier import PageClassifier
+    from profiler import stage, timed
 
-from tenacity import retry, stop_after_attempt, wait_fixed
+# 이전 버전의 모듈 수준 플래그 (하위 호환용, 접근 시점에 확인)
+_DEPRECATED_FLAGS = {'LXML_AVAILABLE': 'lxml', 'DOWNLOAD_FUNC_AVAILABLE': 'dart_download'}
 
-# --- config.py 에서 설정값 가져오기 ---
-try:
-    # 로거와 재시도 설정만 가져옴
-    from config import logger, RETRY_ATTEMPTS, RETRY_WAIT_SECONDS
-    # TARGET_REPORT_CODES는 여기서 직접 사용 안 함 (상위에서 필터링)
-except ImportError:
-    import logging
-    # 로거 이름 통일 (메인 노트북과 동일하게)
-    logger = logging.getLogger("KospiRAGPipeline")
-    logger.warning("config.py 로드 실패. dart_utils에서 기본 로거 및 재시도 설정 사용.")
-    # 기본값 설정
-    RETRY_ATTEMPTS = 3
-    RETRY_WAIT_SECONDS = 5
-    # 핸들러 없으면 추가 (경고 방지용)
-    if not logger.hasHandlers():
-        logger.setLevel(logging.INFO)
-        logger.addHandler(logging.NullHandler())
-
-
-# --- download_document 함수 임포트 ---
-DOWNLOAD_FUNC_AVAILABLE = False
-if dart: # dart_fss 임포트 성공 시에만 시도
-    try:
-        from dart_fss.api.filings import download_document
-        DOWNLOAD_FUNC_AVAILABLE = True
-        logger.info("dart_fss.api.filings.download_document imported successfully.")
-    except ImportError:
-        logger.error("dart_fss.api.filings.download_document import 실패. dart-fss 버전 또는 설치를 확인하세요.")
+def __getattr__(name):
+    if name in _DEPRECATED_FLAGS: return has(_DEPRECATED_FLAGS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def dart_retry(retry_on=None, reraise=False):
+    """
+    지터 포함 지수 백오프 재시도 데코레이터 팩토리 (tenacity 는 첫 호출 시 로드).
+    retry_on: 재시도할 예외 타입 튜플을 돌려주는 함수 (첫 호출 시 평가, 지연 로드되는 예외 타입용).
+              None 이면 ImportError(의존성 누락)를 뺀 모든 예외를 재시도.
+    재시도 횟수/대기 시간은 첫 호출 시점의 RETRY_ATTEMPTS / RETRY_WAIT_SECONDS / RETRY_MAX_WAIT_SECONDS.
+    """
+    def decorator(func):
+        retrying = None
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal retrying
+            if retrying is None:
+                tenacity = require('tenacity')
+                retry = (tenacity.retry_if_exception_type(retry_on()) if retry_on
+                         else tenacity.retry_if_not_exception_type(ImportError))
+                retrying = tenacity.retry(
+                    retry=retry,
+                    stop=tenacity.stop_after_attempt(RETRY_ATTEMPTS),
+                    wait=tenacity.wait_random_exponential(multiplier=RETRY_WAIT_SECONDS, max=RETRY_MAX_WAIT_SECONDS),
+                    reraise=reraise)(func)
+            return retrying(*args, **kwargs)
+        return wrapper
+    return decorator
+
+_dart_retry = dart_retry()
 
 # === 보고서 검색, 다운로드, ZIP 추출, 디코딩 함수 ===
 # 이 함수들은 파일 처리의 앞단에서 필요하므로 유지합니다.
+# 여러 기업을 동시에 수집할 때는 dart_fetcher.DartFetcher.fetch_many 사용 (토큰 버킷 + 커넥션 풀).
+
+# 검색 캐시(report_cache.ReportCache.put_search)에 남길 dart-fss Report 속성
+REPORT_SEARCH_FIELDS = ('rcept_no', 'report_nm', 'corp_code', 'corp_name', 'stock_code', 'rcept_dt', 'flr_nm', 'rm')
 
-@retry(stop=stop_after_attempt(RETRY_ATTEMPTS), wait=wait_fixed(RETRY_WAIT_SECONDS))
-def find_latest_annual_report(corp_code, year, report_codes=['11011']): # 기본값을 사업보고서로 변경 가능
-    """ 특정 기업의 지정된 연도 최신 정기보고서(기본: 사업보고서) 객체를 찾습니다. """
-    if not dart: raise ImportError("dart-fss 모듈 로드 실패")
+def find_latest_annual_report(corp_code, year, report_codes=['11011'], cache=None): # 기본값을 사업보고서로 변경 가능
+    """
+    특정 기업의 지정된 연도 최신 정기보고서(기본: 사업보고서) 객체를 찾습니다.
+    cache(report_cache.ReportCache)를 주면 TTL 안의 같은 검색은 dart-fss 호출 없이 재사용
+    (캐시 적중 시에는 REPORT_SEARCH_FIELDS 속성만 가진 SimpleNamespace 반환)
+    """
+    if cache is not None:
+        cached = cache.get_search(corp_code, year, report_codes)
+        if cached is not None:
+            logger.debug(f"{corp_code}({year}) 검색 캐시 사용: rcept_no={cached.get('rcept_no')}")
+            return SimpleNamespace(**cached)
+    report = _search_latest_report(corp_code, year, report_codes)
+    if cache is not None and report is not None:
+        cache.put_search(corp_code, year, report_codes, {f: getattr(report, f, None) for f in REPORT_SEARCH_FIELDS})
+    return report
+
+@timed('search', company_arg=0)
+@_dart_retry
+def _search_latest_report(corp_code, year, report_codes):
+    """ dart-fss 로 최신 정기보고서 검색 (재시도/계측 대상, 캐시는 find_latest_annual_report 에서 처리) """
+    dart = require('dart_fss')
     report_type_name = ','.join(report_codes) if report_codes else 'any'
     logger.debug(f"Searching for report: corp={corp_code}, year={year}, codes={report_type_name}")
     try:
@@ -77,12 +105,13 @@ def find_latest_annual_report(corp_code, year, report_codes=['11011']): # 기본
             return None
     except Exception as e:
         logger.error(f"{corp_code} 보고서 검색 오류: {e.__class__.__name__} - {e}", exc_info=True)
-        raise # 오류 재발생시켜 @retry 작동
+        raise # 오류 재발생시켜 @_dart_retry 작동
 
-@retry(stop=stop_after_attempt(RETRY_ATTEMPTS), wait=wait_fixed(RETRY_WAIT_SECONDS))
+@timed('download')
+@_dart_retry
 def download_report_file(rcept_no, download_path):
     """ 지정된 접수번호의 공시서류 원본파일(ZIP)을 다운로드하고 검증합니다. """
-    if not DOWNLOAD_FUNC_AVAILABLE: raise ImportError("download_document 함수 사용 불가")
+    download_document = require('dart_download').download_document
     if not rcept_no: raise ValueError("다운로드할 rcept_no 없음")
     logger.info(f"다운로드 시도: rcept_no={rcept_no}, path={download_path}")
     file_path = None
@@ -111,11 +140,59 @@ def download_report_file(rcept_no, download_path):
         logger.error(f"다운로드 중 예외 발생 (rcept_no={rcept_no}): {e.__class__.__name__} - {e}", exc_info=True)
         raise # 오류 재발생
 
+REPORT_FILE_EXTENSIONS = ('.xml', '.html', '.htm')
+
+def select_report_member(zip_ref):
+    """
+    ZIP 메타데이터(infolist)만으로 보고서 멤버 선택 (압축 해제 없음).
+    1순위: 루트의 XML, 2순위: 루트의 HTML 계열, 3순위: 하위 폴더 포함 XML/HTML 중 file_size 최대
+    """
+    candidates = [info for info in zip_ref.infolist()
+                  if not info.is_dir() and info.filename.lower().endswith(REPORT_FILE_EXTENSIONS)]
+    root_files = [info for info in candidates if '/' not in info.filename.rstrip('/')]
+    for info in root_files:
+        if info.filename.lower().endswith('.xml'): return info
+    for info in root_files:
+        logger.warning(f"XML not found, using root HTML file: {info.filename}")
+        return info
+    if candidates:
+        info = max(candidates, key=lambda i: i.file_size)
+        logger.warning(f"Using largest XML/HTML file found: {info.filename}")
+        return info
+    return None
+
+@timed('unzip')
+def read_report_from_zip(zip_file_path):
+    """
+    ZIP 파일에서 보고서 멤버 하나만 메모리로 읽어 반환 (임시 폴더/전체 압축 해제 없음).
+    반환: (report_bytes, 확장자, 멤버 이름) - 실패 시 (None, None, None)
+    """
+    if not zip_file_path or not os.path.exists(zip_file_path) or not zipfile.is_zipfile(zip_file_path):
+        logger.error(f"유효하지 않은 ZIP 파일 경로: {zip_file_path}")
+        return None, None, None
+    try:
+        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+            info = select_report_member(zip_ref)
+            if info is None:
+                logger.error(f"No suitable report file (XML/HTML) found in ZIP: {zip_file_path}")
+                return None, None, None
+            report_bytes = zip_ref.read(info)
+            logger.info(f"Report member read from ZIP: {info.filename} ({info.file_size} bytes)")
+            return report_bytes, os.path.splitext(info.filename)[1].lower(), info.filename
+    except Exception as e:
+        logger.error(f"Error reading from ZIP ({zip_file_path}): {e}", exc_info=True)
+        return None, None, None
+
+@timed('unzip')
 def extract_report_file_from_zip(zip_file_path, extract_dir_base):
-    """ ZIP 파일에서 보고서 파일(XML 우선)을 찾아 임시 폴더에 압축 해제 후 경로 반환 """
+    """
+    ZIP 파일에서 보고서 파일(XML 우선)을 찾아 임시 폴더에 해당 파일만 압축 해제 후 경로 반환.
+    반환: (파일 경로, 확장자, 압축 해제 폴더) - 실패 시 경로/확장자는 None.
+    파일 경로가 필요 없으면 read_report_from_zip 사용 (디스크 쓰기 없음).
+    """
     if not zip_file_path or not os.path.exists(zip_file_path) or not zipfile.is_zipfile(zip_file_path):
         logger.error(f"유효하지 않은 ZIP 파일 경로: {zip_file_path}")
-        return None, None
+        return None, None, None
 
     extract_dir = None
     try:
@@ -126,66 +203,135 @@ def extract_report_file_from_zip(zip_file_path, extract_dir_base):
         os.makedirs(extract_dir)
 
         with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-            zip_ref.extractall(extract_dir)
-            logger.debug(f"ZIP 압축 해제 완료: {extract_dir}")
-
-            all_files = [os.path.join(extract_dir, f) for f in zip_ref.namelist()]
-            # 1순위: 루트의 XML 파일
-            xml_files = [f for f in all_files if f.lower().endswith('.xml') and os.path.dirname(f) == extract_dir]
-            if xml_files:
-                 target_file = xml_files[0]
-                 logger.info(f"Root XML file found: {os.path.basename(target_file)}")
-                 return target_file, '.xml'
-            # 2순위: 루트의 HTML 계열 파일
-            html_files = [f for f in all_files if f.lower().endswith(('.html', '.htm')) and os.path.dirname(f) == extract_dir]
-            if html_files:
-                 target_file = html_files[0]
-                 logger.warning(f"XML not found, using root HTML file: {os.path.basename(target_file)}")
-                 return target_file, os.path.splitext(target_file)[1].lower()
-            # 3순위: 하위 폴더 포함 모든 XML/HTML 파일 중 가장 큰 파일 ( heuristics )
-            candidates = [f for f in all_files if f.lower().endswith(('.xml', '.html', '.htm'))]
-            if candidates:
-                 target_file = max(candidates, key=os.path.getsize)
-                 logger.warning(f"Using largest XML/HTML file found: {os.path.relpath(target_file, extract_dir_base)}")
-                 # !!! 수정: extract_dir도 반환하도록 변경 !!!
-                 return target_file, os.path.splitext(target_file)[1].lower(), extract_dir
-
-            logger.error(f"No suitable report file (XML/HTML) found in ZIP: {zip_file_path}")
-            # !!! 수정: 실패 시에도 extract_dir 반환 (None 처리) !!!
-            return None, None, extract_dir
+            info = select_report_member(zip_ref)
+            if info is None:
+                logger.error(f"No suitable report file (XML/HTML) found in ZIP: {zip_file_path}")
+                return None, None, extract_dir
+            target_file = zip_ref.extract(info, extract_dir)
+            logger.info(f"Report file extracted: {info.filename}")
+            return target_file, os.path.splitext(target_file)[1].lower(), extract_dir
 
     except Exception as e:
         logger.error(f"Error extracting from ZIP ({zip_file_path}): {e}", exc_info=True)
-        # !!! 수정: 오류 발생 시에도 extract_dir 반환 (None 처리) !!!
         return None, None, extract_dir
     # finally 블록은 필요 없음 (상위에서 처리)
 
+# --- 인코딩 감지 (BeautifulSoup 트리 생성 없이) ---
+ENCODING_SNIFF_BYTES = 4096 # 선언부(XML/meta) 탐색 범위
+ENCODING_PROBE_CHUNK = 64 * 1024 # 점진적 디코딩 검사 단위
+_BOMS = [
+    (b'\xef\xbb\xbf', 'utf-8'),
+    (b'\xff\xfe', 'utf-16-le'),
+    (b'\xfe\xff', 'utf-16-be'),
+]
+_XML_DECL_ENCODING_REGEX = re.compile(rb'<\?xml[^>]*?encoding\s*=\s*["\']([A-Za-z0-9._:-]+)', re.IGNORECASE)
+_META_CHARSET_REGEX = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?([A-Za-z0-9._:-]+)', re.IGNORECASE)
+# 한글 레거시 인코딩은 상위 집합인 cp949 로 통일
+_CP949_ALIASES = {'ks_c_5601-1987', 'ks_c_5601', 'euc_kr', 'euc-kr', 'windows-949', 'x-windows-949', 'ms949', 'uhc'}
+
+def _normalize_encoding(name):
+    """ 인코딩 이름 정규화 (한글 계열 -> cp949). 파이썬이 모르는 이름이면 None """
+    if not name: return None
+    if isinstance(name, bytes): name = name.decode('ascii', errors='ignore')
+    name = name.strip().lower()
+    if name in _CP949_ALIASES: name = 'cp949'
+    try: codecs.lookup(name)
+    except LookupError: return None
+    return name
+
+def _probe_encoding(report_bytes, encoding):
+    """ 청크 단위 점진적 디코딩으로 전체 바이트가 해당 인코딩으로 유효한지 검사 """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    view = memoryview(report_bytes)
+    try:
+        for start in range(0, len(view), ENCODING_PROBE_CHUNK):
+            decoder.decode(view[start:start + ENCODING_PROBE_CHUNK])
+        decoder.decode(b'', final=True)
+        return True
+    except UnicodeDecodeError:
+        return False
+
+def detect_encoding(report_bytes, encoding_hint=None):
+    """
+    보고서 바이트의 인코딩 감지. 순서: BOM -> encoding_hint -> 앞부분의 XML 선언/<meta charset> -> utf-8/cp949 유효성 검사.
+    항상 파이썬 codec 이름을 반환 (최후 수단은 'utf-8').
+    """
+    for bom, encoding in _BOMS:
+        if report_bytes.startswith(bom): return encoding
+    encoding = _normalize_encoding(encoding_hint)
+    if encoding: return encoding
+
+    head = report_bytes[:ENCODING_SNIFF_BYTES]
+    for regex in (_XML_DECL_ENCODING_REGEX, _META_CHARSET_REGEX):
+        match = regex.search(head)
+        encoding = _normalize_encoding(match.group(1)) if match else None
+        if encoding:
+            logger.debug(f"Encoding declared in document: {encoding}")
+            return encoding
+
+    for encoding in ('utf-8', 'cp949'):
+        if _probe_encoding(report_bytes, encoding):
+            logger.debug(f"Encoding detected by probe: {encoding}")
+            return encoding
+    logger.warning(f"Encoding detection failed. Falling back to utf-8 replace.")
+    return 'utf-8'
+
+def _prepare_report_bytes(report_content, encoding_hint=None):
+    """ 파서 입력 준비: str 은 utf-8 로 인코딩, bytes 는 디코딩 없이 감지한 인코딩과 함께 그대로 lxml 에 전달 """
+    if isinstance(report_content, str): return report_content.encode('utf-8'), 'utf-8'
+    encoding = detect_encoding(report_content, encoding_hint)
+    if encoding.startswith('utf-16'): # BOM 포함 utf-16 은 lxml 에 직접 넘기면 실패하므로 utf-8 로 변환 (드문 경우)
+        return report_content.decode('utf-16', errors='replace').encode('utf-8'), 'utf-8'
+    return report_content, encoding
+
 def decode_content(report_bytes, encoding_hint=None):
-    """ 바이트 내용을 추측 또는 명시된 인코딩으로 디코딩 (개선) """
+    """ 바이트 내용을 추측 또는 명시된 인코딩으로 디코딩 (detect_encoding 사용) """
     if not report_bytes: return ""
-    # ... (이전 답변의 decode_content 함수 내용 유지) ...
-    detected_encoding = None
-    try:
-        if report_bytes.startswith(b'\xef\xbb\xbf'): return report_bytes[3:].decode('utf-8', errors='replace')
-        try: # bs4 이용
-            soup_temp = BeautifulSoup(report_bytes, 'lxml', from_encoding=encoding_hint)
-            original_encoding = soup_temp.original_encoding
-            if original_encoding:
-                detected_encoding = original_encoding.lower().replace('ks_c_5601-1987', 'cp949').replace('euc_kr', 'cp949').replace('windows-949', 'cp949')
-                logger.info(f"Encoding detected by parser: {detected_encoding}")
-                return report_bytes.decode(detected_encoding, errors='replace')
-        except Exception: pass
-        # 직접 시도
-        for enc in ['utf-8', 'cp949', 'euc-kr']:
-             try: return report_bytes.decode(enc); logger.info(f"Decoded with '{enc}'.")
-             except UnicodeDecodeError: continue
-        # 최후
-        logger.warning(f"Encoding detection failed. Falling back to utf-8 replace.")
-        return report_bytes.decode('utf-8', errors='replace')
-    except Exception as e: logger.error(f"Content decoding error: {e}"); return ""
+    with stage('decode', bytes=len(report_bytes)) as record:
+        try:
+            encoding = detect_encoding(report_bytes, encoding_hint)
+            logger.info(f"Encoding detected: {encoding}")
+            # BOM 은 utf-8-sig/utf-16 코덱이 제거
+            if encoding == 'utf-8' and report_bytes.startswith(b'\xef\xbb\xbf'): encoding = 'utf-8-sig'
+            elif encoding in ('utf-16-le', 'utf-16-be'): encoding = 'utf-16'
+            return report_bytes.decode(encoding, errors='replace')
+        except Exception as e:
+            logger.error(f"Content decoding error: {e}")
+            record.fail()
+            return ""
 
 # === XML 파싱 관련 함수 (섹션 단위 추출용) ===
 
+# --- 추출 대상 섹션 정의 (사용자 지정 기반) ---
+# 키: 내부 ID, 값: [ 대표 섹션명 (메타데이터용), [정규식 패턴] ]
+SECTION_PATTERNS_MAP = {
+    "BUSINESS_CONTENT": ["II. 사업의 내용", [r"^[II]+\.\s*사업의\s*내용"]],
+    # "BUSINESS_CONTENT" 하위 주요 섹션도 별도 추출 원하면 추가
+    "RAW_MATERIALS": ["II-3. 원재료 관련", [r"\d+\.?\s*원재료"]], # 사업의 내용 하위
+    "SALES_ORDERS": ["II-4. 매출 및 수주 관련", [r"\d+\.?\s*매출"]], # 사업의 내용 하위
+    "CONTRACTS_RD": ["II-6. 주요계약 및 연구개발", [r"\d+\.?\s*주요\s*계약", r"\d+\.?\s*연구개발"]], # 사업의 내용 하위
+    "AFFILIATES": ["IX. 계열회사 등에 관한 사항", [r"^[IX]+\.\s*계열회사"]],
+    # 상세표는 내용 없을 수 있으므로 주의
+    "APPENDIX_SUBSIDIARIES": ["XII-1. 연결대상 종속회사 현황", [r"1\.\s*연결대상\s*종속회사"]],
+    "APPENDIX_AFFILIATES": ["XII-2. 계열회사 현황", [r"2\.\s*계열회사\s*현황"]],
+}
+
+# 섹션 제목 후보 태그
+TITLE_TAGS = frozenset({'title', 'h1', 'h2', 'h3', 'h4', 'p', 'b', 'strong'})
+# 내용에서 제외할 태그 (하위 텍스트 포함)
+SKIP_TAGS = frozenset({'style', 'script', 'head'})
+# 종료 시 줄바꿈으로 구분할 블록 태그 (DART XML 태그는 HTML 파서에서 소문자로 변환됨)
+BLOCK_TAGS = frozenset({
+    'title', 'h1', 'h2', 'h3', 'h4', 'p', 'div', 'br', 'li', 'tr', 'table',
+    'section-1', 'section-2', 'section-3', 'library', 'pgbrk',
+})
+
+
+# 모든 섹션 패턴을 한 번의 search 로 검사하는 공유 분류기 (pdf_processor 페이지 분류와 같은 구현)
+SECTION_TITLE_CLASSIFIER = PageClassifier(
+    pattern_sets={key: patterns for key, (_display_title, patterns) in SECTION_PATTERNS_MAP.items()})
+_WORD_CHAR_REGEX = re.compile(r'\w')
+
 def _get_text_content_lxml(element):
     """ lxml 요소와 그 모든 자식 요소들의 텍스트를 결합 (개선) """
     if element is None: return ""
@@ -221,7 +367,7 @@ def _is_possible_section_title(element, title_patterns):
 
 # --- 메인 XML 데이터 추출 함수 (섹션 단위 추출) ---
 def extract_targeted_data_from_xml(
-    xml_content_str: str | None,
+    xml_content_str: str | bytes | None,
     source_document_id: str,
     company_code: str,
     company_name: str,
@@ -230,31 +376,20 @@ def extract_targeted_data_from_xml(
     """
     DART XML(HTML 파서로 처리)에서 사용자 지정 주요 섹션 제목을 기준으로,
     각 섹션의 전체 텍스트를 추출하여 딕셔너리 리스트로 반환합니다.
+    ZIP에서 읽은 bytes 를 그대로 넘기면 decode_content 없이 감지한 인코딩으로 바로 파싱합니다.
     """
     if not xml_content_str: logger.warning(f"XML content empty for {source_document_id}."); return []
-    if not LXML_AVAILABLE: logger.error("lxml library not available."); return []
+    if not has('lxml'): logger.error("lxml library not available."); return []
 
     extracted_sections = []
     logger.info(f"Starting SECTION-LEVEL XML parsing for: {source_document_id}")
     try:
-        parser = etree.HTMLParser(encoding='utf-8', recover=True)
-        root = etree.fromstring(xml_content_str.encode('utf-8'), parser=parser)
+        etree = require('lxml')
+        content_bytes, encoding = _prepare_report_bytes(xml_content_str, kwargs.get('encoding'))
+        parser = etree.HTMLParser(encoding=encoding, recover=True)
+        root = etree.fromstring(content_bytes, parser=parser)
         if root is None: logger.error("Failed to parse XML/HTML root."); return []
 
-        # --- 추출 대상 섹션 정의 (사용자 지정 기반) ---
-        # 키: 내부 ID, 값: [ 대표 섹션명 (메타데이터용), [정규식 패턴] ]
-        section_patterns_map = {
-            "BUSINESS_CONTENT": ["II. 사업의 내용", [r"^[II]+\.\s*사업의\s*내용"]],
-            # "BUSINESS_CONTENT" 하위 주요 섹션도 별도 추출 원하면 추가
-            "RAW_MATERIALS": ["II-3. 원재료 관련", [r"\d+\.?\s*원재료"]], # 사업의 내용 하위
-            "SALES_ORDERS": ["II-4. 매출 및 수주 관련", [r"\d+\.?\s*매출"]], # 사업의 내용 하위
-            "CONTRACTS_RD": ["II-6. 주요계약 및 연구개발", [r"\d+\.?\s*주요\s*계약", r"\d+\.?\s*연구개발"]], # 사업의 내용 하위
-            "AFFILIATES": ["IX. 계열회사 등에 관한 사항", [r"^[IX]+\.\s*계열회사"]],
-            # 상세표는 내용 없을 수 있으므로 주의
-            "APPENDIX_SUBSIDIARIES": ["XII-1. 연결대상 종속회사 현황", [r"1\.\s*연결대상\s*종속회사"]],
-            "APPENDIX_AFFILIATES": ["XII-2. 계열회사 현황", [r"2\.\s*계열회사\s*현황"]],
-        }
-
         body = root.find('.//body');
         if body is None: body = root
 
@@ -271,7 +406,7 @@ def extract_targeted_data_from_xml(
             title_text_found = None
 
             # 현재 요소가 새로운 섹션 제목인지 판별
-            for section_key, (display_title, patterns) in section_patterns_map.items():
+            for section_key, (display_title, patterns) in SECTION_PATTERNS_MAP.items():
                 match_text = _is_possible_section_title(element, patterns)
                 if match_text:
                     # 더 구체적인 제목(예: 'II-3')이 이미 찾은 상위 제목(예: 'II.')과 관련 없을 때만 새 섹션으로 처리하는 로직 추가 가능
@@ -322,4 +457,140 @@ def extract_targeted_data_from_xml(
         return []
 
     logger.info(f"SECTION-LEVEL XML parsing finished for {source_document_id}. Extracted {len(extracted_sections)} sections.")
-    return extracted_sections
\ No newline at end of file
+    return extracted_sections
+
+# --- 단일 패스 스트리밍 섹션 추출 (iterparse 기반) ---
+
+def _match_section_title(text):
+    """ 제목 후보 텍스트가 섹션 제목이면 (섹션 키, 텍스트) 반환, 아니면 None (_is_possible_section_title과 동일 기준) """
+    if not text or len(text) > 150 or text.isdigit() or "페이지" in text: return None
+    if len(_WORD_CHAR_REGEX.findall(text)) < 2: return None
+    match = SECTION_TITLE_CLASSIFIER.search(text)
+    if match: return match[0], text
+    return None
+
+def iter_section_blocks(report_content, encoding=None):
+    """
+    DART 보고서를 lxml iterparse 로 한 번 순회하며 블록(문단/표 행 등) 단위 텍스트를 yield 하는 제너레이터.
+    yield: (섹션 번호, 섹션 제목, 블록 텍스트, 블록 태그) - 섹션 번호는 새 섹션 제목을 만날 때마다 1씩 증가.
+    각 텍스트 노드는 정확히 한 번 기록되고, 처리가 끝난 요소는 즉시 해제되므로 메모리는 문서 깊이 수준으로 유지됩니다.
+    """
+    ready = deque() # 이벤트 처리 중 완성된 블록 (메인 루프에서 yield)
+    section = {'no': 0, 'title': "문서 시작"}
+    line = [] # 현재 블록 텍스트 조각
+    title_parts = None # 제목 후보 태그 내부 텍스트 (수집 중일 때만 리스트)
+    title_element = None # 수집 중인 최상위 제목 후보 요소
+    skip_depth = 0 # style/script/head 내부 깊이
+
+    def emit(text):
+        if skip_depth or not text: return
+        text = text.strip()
+        if not text: return
+        (title_parts if title_parts is not None else line).append(text)
+
+    def emit_break(tag):
+        if title_parts is not None:
+            if title_parts and title_parts[-1] != "\n": title_parts.append("\n")
+            return
+        if line:
+            ready.append((section['no'], section['title'], ' '.join(line), tag))
+            line.clear()
+
+    def emit_preceding(node):
+        # node 앞의 텍스트(이전 형제의 tail 또는 부모의 text)는 node 시작 시점에 확정됨
+        prev = node.getprevious()
+        if prev is not None: emit(prev.tail)
+        else:
+            parent = node.getparent()
+            if parent is not None: emit(parent.text)
+
+    etree = require('lxml')
+    report_bytes, encoding = _prepare_report_bytes(report_content, encoding)
+    context = etree.iterparse(
+        io.BytesIO(report_bytes), events=('start', 'end', 'comment', 'pi'),
+        html=True, recover=True, encoding=encoding
+    )
+    for event, element in context:
+        if event in ('comment', 'pi'):
+            emit_preceding(element)
+            continue
+
+        tag = element.tag.lower() if isinstance(element.tag, str) else ''
+        if event == 'start':
+            emit_preceding(element)
+            if tag in SKIP_TAGS: skip_depth += 1
+            elif tag in TITLE_TAGS and title_parts is None and not skip_depth:
+                title_parts, title_element = [], element
+            continue
+
+        # event == 'end': 요소 내부의 마지막 텍스트(마지막 자식 tail 또는 자신의 text) 기록
+        if len(element): emit(element[-1].tail)
+        else: emit(element.text)
+
+        if tag in SKIP_TAGS: skip_depth -= 1
+        elif element is title_element:
+            title_text = ' '.join(p for p in title_parts if p != "\n")
+            parts, title_parts, title_element = title_parts, None, None
+            if _match_section_title(title_text):
+                emit_break('text') # 이전 섹션의 남은 텍스트
+                section['no'] += 1
+                section['title'] = title_text
+            else: # 제목이 아니면 본문으로 기록
+                for part in parts:
+                    if part == "\n": emit_break(tag)
+                    else: line.append(part)
+        if tag in BLOCK_TAGS: emit_break(tag)
+
+        # 처리 완료된 요소 해제 (tail은 다음 이벤트에서 기록되므로 유지)
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+        while ready: yield ready.popleft()
+    del context
+
+    emit_break('text')
+    while ready: yield ready.popleft()
+
+def extract_sections_streaming(
+    report_content: str | bytes | None,
+    source_document_id: str,
+    company_code: str,
+    company_name: str,
+    **kwargs
+    ) -> list[dict]:
+    """
+    extract_targeted_data_from_xml 의 단일 패스 버전 (iter_section_blocks 결과를 섹션 단위로 결합).
+    report_content 는 str 또는 ZIP에서 읽은 bytes (bytes 는 detect_encoding 결과로 lxml 이 직접 디코딩).
+    반환 형식은 동일: [{"content": ..., "original_section": ...}, ...]
+    """
+    if not report_content: logger.warning(f"XML content empty for {source_document_id}."); return []
+    if not has('lxml'): logger.error("lxml library not available."); return []
+
+    extracted_sections = []
+    current = {'no': None, 'title': None, 'blocks': []}
+
+    def flush_section():
+        section_text = "\n".join(current['blocks']).strip()
+        if len(section_text) > 20:
+            extracted_sections.append({"content": section_text, "original_section": current['title']})
+            logger.debug(f"Saved section '{current['title'][:60]}...' (Length: {len(section_text)})")
+
+    logger.info(f"Starting STREAMING SECTION-LEVEL XML parsing for: {source_document_id}")
+    with stage('parse', company=company_code, bytes=len(report_content)) as record:
+        try:
+            for section_no, title, text, _tag in iter_section_blocks(report_content, kwargs.get('encoding')):
+                if section_no != current['no']:
+                    flush_section()
+                    current = {'no': section_no, 'title': title, 'blocks': []}
+                current['blocks'].append(text)
+            flush_section()
+        except Exception as e:
+            logger.error(f"Error in STREAMING SECTION-LEVEL XML extraction ({source_document_id}): {e}", exc_info=True)
+            record.fail()
+            return []
+        record.add(sections=len(extracted_sections))
+
+    logger.info(f"STREAMING SECTION-LEVEL XML parsing finished for {source_document_id}. Extracted {len(extracted_sections)} sections.")
+    return extracted_sections
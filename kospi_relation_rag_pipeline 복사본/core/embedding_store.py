@@ -0,0 +1,249 @@
+# core/embedding_store.py
+# 섹션/문서 청크 임베딩 단계 (CPU 전용)
+# - 입력: extract_targeted_data_from_xml / extract_sections_streaming 의 섹션 dict, process_fnguide_pdf 의 Document
+# - 내용 해시(SHA-256)로 중복 제거: 기업마다 반복되는 계열회사 상용구 등은 한 번만 임베딩
+# - 임베딩 캐시(SQLite): (모델, 내용 해시) -> 벡터. 재실행 시 모델 호출 없이 재사용
+# - FAISS 인덱스(flat/hnsw/ivf)에 새 벡터만 add_with_ids 로 추가 후 디스크에 저장 (전체 재구축 없음)
+#   ivf 는 학습 벡터가 IVF_MIN_TRAIN_VECTORS 개 모인 뒤부터 검색 가능 (소규모는 flat/hnsw 권장)
+# - add_documents() 가 처리량(chunks/sec)을 반환/로그
+# - manifest(run_manifest.RunManifest)를 주면 add_documents 로 인덱스에 들어간 보고서(rcept_no)의 'embedded' 단계를 기록
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+try:
+    from .capabilities import require
+    from .config import logger, EMBEDDING_MODEL_NAME, EMBEDDING_BATCH_SIZE, FAISS_INDEX_TYPE
+    from .profiler import stage
+except ImportError:
+    from capabilities import require
+    from config import logger, EMBEDDING_MODEL_NAME, EMBEDDING_BATCH_SIZE, FAISS_INDEX_TYPE
+    from profiler import stage
+
+INDEX_FILE = 'index.faiss'
+DB_FILE = 'store.sqlite3'
+HNSW_M = 32
+IVF_NLIST = 128
+IVF_MIN_TRAIN_VECTORS = IVF_NLIST * 39 # faiss 권장 최소 학습 벡터 수 (그 전까지는 인덱스에 넣지 않고 대기)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS embedding_cache (model TEXT NOT NULL, content_hash TEXT NOT NULL, vector BLOB NOT NULL,
+                                            PRIMARY KEY (model, content_hash));
+CREATE TABLE IF NOT EXISTS vectors (id INTEGER PRIMARY KEY, content_hash TEXT NOT NULL UNIQUE, content TEXT NOT NULL);
+"""
+# 같은 (벡터, 메타데이터) 청크는 한 행만: 같은 보고서를 다시 add_documents 해도 검색 메타데이터가 늘지 않음
+_CHUNKS_TABLE = ("CREATE TABLE IF NOT EXISTS chunks (vector_id INTEGER NOT NULL, metadata TEXT NOT NULL, "
+                 "UNIQUE (vector_id, metadata))")
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _to_chunk(item, extra_metadata=None):
+    """ 섹션 dict 또는 langchain Document -> (텍스트, 메타데이터) """
+    if isinstance(item, dict):
+        text = item.get('content') or ''
+        metadata = {k: v for k, v in item.items() if k != 'content'}
+    else: # langchain Document
+        text, metadata = item.page_content or '', dict(item.metadata or {})
+    if extra_metadata: metadata = dict(extra_metadata, **metadata)
+    return text, metadata
+
+
+def sentence_transformer_embedder(model_name=EMBEDDING_MODEL_NAME, batch_size=EMBEDDING_BATCH_SIZE):
+    """ sentence-transformers 모델(CPU)로 텍스트 리스트를 float32 정규화 벡터로 변환하는 함수 반환 """
+    # 임베딩 단계에서만 로드
+    model = require('sentence_transformers').SentenceTransformer(model_name, device='cpu')
+
+    def embed(texts):
+        return model.encode(texts, batch_size=batch_size, convert_to_numpy=True,
+                            normalize_embeddings=True, show_progress_bar=False).astype(np.float32)
+    return embed
+
+
+class EmbeddingStore:
+    """
+    중복 제거 + 임베딩 캐시 + 증분 FAISS 인덱스.
+    embed_fn: list[str] -> np.ndarray(float32, (n, dim)). 없으면 model_name 의 sentence-transformers 모델을 CPU 로 로드.
+    manifest: run_manifest.RunManifest (선택). 청크 메타데이터의 rcept_no 별로 'embedded' 단계 완료 기록
+    """
+    def __init__(self, store_dir, model_name=EMBEDDING_MODEL_NAME, embed_fn=None,
+                 index_type=FAISS_INDEX_TYPE, batch_size=EMBEDDING_BATCH_SIZE, manifest=None):
+        if index_type not in ('flat', 'hnsw', 'ivf'): raise ValueError(f"unknown index_type: {index_type}")
+        faiss = require('faiss') # faiss-cpu, 인덱스를 열 때만 로드
+        self._faiss = faiss
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self.model_name = model_name
+        self.index_type = index_type
+        self.batch_size = batch_size
+        self._embed_fn = embed_fn
+        self.manifest = manifest
+        self._db = sqlite3.connect(os.path.join(store_dir, DB_FILE))
+        self._db.executescript(_SCHEMA)
+        self._db.execute(_CHUNKS_TABLE)
+        self._migrate_chunks()
+        index_path = os.path.join(store_dir, INDEX_FILE)
+        self.index = faiss.read_index(index_path) if os.path.exists(index_path) else None
+        self._pending_train = None # IVF 학습 전까지 모아두는 (ids, vectors)
+        self._restore_pending()
+
+    def _migrate_chunks(self):
+        """ UNIQUE 제약 없이 만들어진 이전 chunks 테이블을 중복 행을 제거해 재구성 """
+        sql = self._db.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'chunks'").fetchone()[0]
+        if 'UNIQUE' in sql: return
+        with self._db:
+            self._db.execute("ALTER TABLE chunks RENAME TO chunks_legacy")
+            self._db.execute("DROP INDEX IF EXISTS idx_chunks_vector_id")
+            self._db.execute(_CHUNKS_TABLE)
+            self._db.execute("INSERT OR IGNORE INTO chunks (vector_id, metadata) "
+                             "SELECT vector_id, metadata FROM chunks_legacy ORDER BY rowid")
+            self._db.execute("DROP TABLE chunks_legacy")
+
+    @property
+    def embed_fn(self):
+        if self._embed_fn is None:
+            self._embed_fn = sentence_transformer_embedder(self.model_name, self.batch_size)
+        return self._embed_fn
+
+    def close(self):
+        self.save()
+        self._db.close()
+
+    # --- FAISS 인덱스 ---
+    def _new_index(self, dim):
+        faiss = self._faiss
+        if self.index_type == 'hnsw':
+            base = faiss.IndexHNSWFlat(dim, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        elif self.index_type == 'ivf':
+            base = faiss.IndexIVFFlat(faiss.IndexFlatIP(dim), dim, IVF_NLIST, faiss.METRIC_INNER_PRODUCT)
+        else:
+            base = faiss.IndexFlatIP(dim)
+        return faiss.IndexIDMap2(base)
+
+    def _add_to_index(self, ids, vectors):
+        if self.index is None: self.index = self._new_index(vectors.shape[1])
+        if not self.index.is_trained:
+            # IVF: 학습용 벡터가 충분히 모일 때까지 보류
+            if self._pending_train is not None:
+                ids = np.concatenate([self._pending_train[0], ids])
+                vectors = np.vstack([self._pending_train[1], vectors])
+            if len(vectors) < IVF_MIN_TRAIN_VECTORS:
+                self._pending_train = (ids, vectors)
+                return
+            self.index.train(vectors)
+            self._pending_train = None
+        self.index.add_with_ids(vectors, ids)
+
+    def _restore_pending(self):
+        """ 인덱스에 아직 없는 벡터(IVF 학습 대기분)를 캐시에서 복원. id 는 추가 순서대로이므로 ntotal 이후가 대기분 """
+        added = self.index.ntotal if self.index is not None else 0
+        rows = self._db.execute(
+            "SELECT v.id, c.vector FROM vectors v JOIN embedding_cache c ON c.content_hash = v.content_hash AND c.model = ? "
+            "WHERE v.id >= ? ORDER BY v.id", (self.model_name, added)).fetchall()
+        if rows:
+            self._add_to_index(np.array([r[0] for r in rows], dtype=np.int64),
+                               np.vstack([np.frombuffer(r[1], dtype=np.float32) for r in rows]))
+
+    def save(self):
+        if self.index is not None and self.index.is_trained:
+            tmp_path = os.path.join(self.store_dir, INDEX_FILE + '.tmp')
+            self._faiss.write_index(self.index, tmp_path)
+            os.replace(tmp_path, os.path.join(self.store_dir, INDEX_FILE))
+
+    # --- 임베딩 캐시 ---
+    def _cached_vectors(self, hashes):
+        found = {}
+        for start in range(0, len(hashes), 500):
+            batch = hashes[start:start + 500]
+            rows = self._db.execute(
+                f"SELECT content_hash, vector FROM embedding_cache WHERE model = ? AND content_hash IN ({','.join('?' * len(batch))})",
+                (self.model_name, *batch)).fetchall()
+            found.update((h, np.frombuffer(v, dtype=np.float32)) for h, v in rows)
+        return found
+
+    def _embed_uncached(self, texts_by_hash):
+        """ 캐시에 없는 해시만 batch_size 단위로 임베딩 후 캐시에 저장. 반환: {hash: vector} """
+        hashes = list(texts_by_hash)
+        vectors = self._cached_vectors(hashes)
+        missing = [h for h in hashes if h not in vectors]
+        for start in range(0, len(missing), self.batch_size):
+            batch = missing[start:start + self.batch_size]
+            embedded = np.asarray(self.embed_fn([texts_by_hash[h] for h in batch]), dtype=np.float32)
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO embedding_cache (model, content_hash, vector) VALUES (?, ?, ?)",
+                                     [(self.model_name, h, v.tobytes()) for h, v in zip(batch, embedded)])
+            vectors.update(zip(batch, embedded))
+        return vectors, len(missing)
+
+    # --- 공개 API ---
+    def add_documents(self, items, extra_metadata=None):
+        """
+        섹션 dict / Document 리스트를 임베딩해 인덱스에 추가.
+        extra_metadata: 모든 청크에 붙일 메타데이터 (예: {'company_code': ..., 'rcept_no': ...})
+        반환: {'chunks', 'unique', 'new_vectors', 'embedded', 'seconds', 'chunks_per_sec'}
+        """
+        start = time.perf_counter()
+        chunks = [_to_chunk(item, extra_metadata) for item in items]
+        chunks = [(text, meta) for text, meta in chunks if text.strip()]
+        texts_by_hash = {}
+        for text, _meta in chunks: texts_by_hash.setdefault(content_hash(text), text)
+
+        # 이미 인덱스에 있는 내용은 메타데이터만 추가
+        known = {}
+        hashes = list(texts_by_hash)
+        for i in range(0, len(hashes), 500):
+            batch = hashes[i:i + 500]
+            known.update(self._db.execute(
+                f"SELECT content_hash, id FROM vectors WHERE content_hash IN ({','.join('?' * len(batch))})", batch).fetchall())
+        new_hashes = {h: texts_by_hash[h] for h in hashes if h not in known}
+        with stage('embed', sections=len(chunks), bytes=sum(len(t.encode('utf-8')) for t in new_hashes.values())):
+            vectors, embedded = self._embed_uncached(new_hashes) if new_hashes else ({}, 0)
+
+        with self._db:
+            next_id = (self._db.execute("SELECT COALESCE(MAX(id), -1) FROM vectors").fetchone()[0]) + 1
+            new_ids = {}
+            for h, text in new_hashes.items():
+                new_ids[h] = next_id
+                self._db.execute("INSERT INTO vectors (id, content_hash, content) VALUES (?, ?, ?)", (next_id, h, text))
+                next_id += 1
+            ids_by_hash = dict(known, **new_ids)
+            self._db.executemany("INSERT OR IGNORE INTO chunks (vector_id, metadata) VALUES (?, ?)",
+                                 [(ids_by_hash[content_hash(text)], json.dumps(meta, ensure_ascii=False, sort_keys=True))
+                                  for text, meta in chunks])
+        if new_ids:
+            self._add_to_index(np.fromiter(new_ids.values(), dtype=np.int64),
+                               np.vstack([vectors[h] for h in new_ids]).astype(np.float32))
+            self.save()
+        if self.manifest is not None:
+            for rcept_no in dict.fromkeys(meta.get('rcept_no') for _text, meta in chunks):
+                if rcept_no: self.manifest.mark(None, rcept_no, 'embedded')
+
+        elapsed = time.perf_counter() - start
+        stats = {'chunks': len(chunks), 'unique': len(texts_by_hash), 'new_vectors': len(new_ids),
+                 'embedded': embedded, 'seconds': elapsed,
+                 'chunks_per_sec': len(chunks) / elapsed if elapsed > 0 else float('inf')}
+        logger.info(f"임베딩 완료: 청크 {stats['chunks']}개 (고유 {stats['unique']}, 신규 벡터 {stats['new_vectors']}, "
+                    f"모델 호출 {embedded}) - {stats['chunks_per_sec']:.1f} chunks/sec")
+        return stats
+
+    def search(self, query, k=5):
+        """ 질의 텍스트와 가까운 청크 [(점수, 내용, [메타데이터, ...]), ...] """
+        if self.index is None or self.index.ntotal == 0: return []
+        query_vector = np.asarray(self.embed_fn([query]), dtype=np.float32)
+        if self.index_type == 'hnsw': self._faiss.downcast_index(self.index.index).hnsw.efSearch = max(64, k)
+        scores, ids = self.index.search(query_vector, k)
+        results = []
+        for score, vector_id in zip(scores[0], ids[0]):
+            if vector_id < 0: continue
+            content = self._db.execute("SELECT content FROM vectors WHERE id = ?", (int(vector_id),)).fetchone()[0]
+            metadata = [json.loads(m) for (m,) in self._db.execute(
+                "SELECT metadata FROM chunks WHERE vector_id = ?", (int(vector_id),)).fetchall()]
+            results.append((float(score), content, metadata))
+        return results
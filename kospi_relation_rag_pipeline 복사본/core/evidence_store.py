@@ -0,0 +1,256 @@
+# core/evidence_store.py
+# 관계 근거(evidence) 열 지향 저장소: LLM 추출 관계를 중첩 dict 대신 배열 열(column)로 보관
+# - 간선 열: 출발/도착 기업 인덱스(int32, CompanyIndex 순서), 관계 유형 코드(uint8, 유형명은 인턴), 강도(float32), 출처 코드(int32)
+# - 근거 텍스트: 하나의 UTF-8 바이트 버퍼 + 시작 오프셋(int64). 간선 i 의 근거는 evidence_offsets[i]:evidence_offsets[i + 1] 범위
+# - matrices(): 유형 코드로 한 번 정렬한 뒤 유형별 구간을 _aggregate_edges 로 집계 (build_adjacency_matrix 와 같은 결과)
+# - edge_evidence(a, b, type): (유형, 행, 열) 키 정렬 인덱스 + searchsorted 로 행렬 원소 뒤의 근거 조회
+# - save()/load(): 열 배열을 .npz 하나로 저장 (근거 버퍼는 uint8 배열, 노드 순서와 기업명 별칭은 meta JSON)
+
+import json
+from array import array
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    from .config import logger
+    from .matrix_builder import (AGGREGATIONS, SYMMETRIC_RELATION_TYPES, CompanyIndex, _aggregate_edges,
+                                 normalize_relation_type, parse_strength)
+except ImportError:
+    from config import logger
+    from matrix_builder import (AGGREGATIONS, SYMMETRIC_RELATION_TYPES, CompanyIndex, _aggregate_edges,
+                                normalize_relation_type, parse_strength)
+
+STORE_FORMAT_VERSION = 1
+MAX_RELATION_TYPES = 255 # uint8 유형 코드
+NO_SOURCE = -1
+
+
+class EvidenceStore:
+    """
+    관계 간선 + 근거 텍스트 열 지향 저장소.
+    간선은 입력 그대로 한 번만 저장하고, 대칭 관계(경쟁/계열)는 행렬을 만들 때 양방향으로 펼칩니다.
+    """
+    def __init__(self, company_index, aggregation='sum'):
+        if aggregation not in AGGREGATIONS: raise ValueError(f"aggregation must be one of {AGGREGATIONS}")
+        self.company_index = company_index
+        self.aggregation = aggregation
+        self.relation_type_names = [] # 유형 코드 -> 유형명
+        self._relation_codes = {}
+        self.source_names = [] # 출처 코드 -> rcept_no 등
+        self._source_codes = {}
+        self._src, self._dst = array('i'), array('i')
+        self._rel = array('B')
+        self._strength = array('f')
+        self._source = array('i')
+        self._edge_evidence = array('q', [0]) # 간선 -> 근거 조각 범위 (길이 = 간선 수 + 1)
+        self._text_offsets = array('q', [0]) # 근거 조각 -> 버퍼 범위 (길이 = 조각 수 + 1)
+        self._text = bytearray()
+        self._lookup = None # (정렬된 키, 간선 id) - 추가 시 무효화
+        self.unresolved = {}
+
+    # --- 인턴 ---
+    def _relation_code(self, relation_type):
+        code = self._relation_codes.get(relation_type)
+        if code is None:
+            if len(self.relation_type_names) >= MAX_RELATION_TYPES: raise ValueError("too many relation types")
+            code = self._relation_codes[relation_type] = len(self.relation_type_names)
+            self.relation_type_names.append(relation_type)
+        return code
+
+    def _source_code(self, source):
+        if source is None: return NO_SOURCE
+        source = str(source)
+        code = self._source_codes.get(source)
+        if code is None:
+            code = self._source_codes[source] = len(self.source_names)
+            self.source_names.append(source)
+        return code
+
+    def _resolve(self, company):
+        idx = self.company_index.resolve(company)
+        if idx is None: self.unresolved[company] = self.unresolved.get(company, 0) + 1
+        return idx
+
+    # --- 추가 ---
+    @property
+    def num_nodes(self):
+        return len(self.company_index)
+
+    @property
+    def num_edges(self):
+        return len(self._src)
+
+    def __len__(self):
+        return self.num_edges
+
+    @property
+    def relation_types(self):
+        return sorted(self.relation_type_names)
+
+    def add_edge(self, company_a, company_b, relation_type, strength=None, evidence=(), source=None):
+        """ 간선 1개와 근거 텍스트 추가. 반환: 간선 id (기업/유형을 찾지 못하면 None) """
+        relation_type = normalize_relation_type(relation_type)
+        idx_a, idx_b = self._resolve(company_a), self._resolve(company_b)
+        if relation_type is None or idx_a is None or idx_b is None or idx_a == idx_b: return None
+        self._src.append(idx_a); self._dst.append(idx_b)
+        self._rel.append(self._relation_code(relation_type))
+        self._strength.append(parse_strength(strength))
+        self._source.append(self._source_code(source))
+        if isinstance(evidence, str): evidence = [evidence]
+        for snippet in evidence or ():
+            if not snippet: continue
+            self._text += str(snippet).encode('utf-8')
+            self._text_offsets.append(len(self._text))
+        self._edge_evidence.append(len(self._text_offsets) - 1)
+        self._lookup = None
+        return self.num_edges - 1
+
+    def add_relationships(self, relationships, source=None):
+        """
+        build_adjacency_matrix 와 같은 입력 형식 누적 (dict 하나 또는 리스트).
+        레코드에 'rcept_no'/'source' 가 있으면 그 값을, 없으면 source 인자를 출처로 기록. 반환: 추가된 간선 수
+        """
+        if not relationships: return 0
+        if isinstance(relationships, dict): relationships = [relationships]
+        added = 0
+        for record in relationships:
+            company_a, company_b = record.get('company_a'), record.get('company_b')
+            record_source = record.get('rcept_no') or record.get('source') or source
+            for rel in record.get('relationships') or []:
+                edge = self.add_edge(company_a, company_b, rel.get('type'), rel.get('strength'),
+                                     rel.get('evidence') or (), record_source)
+                added += edge is not None
+        return added
+
+    # --- 열 접근 ---
+    def columns(self):
+        """ 복사 없는 numpy 뷰: {'src', 'dst', 'rel', 'strength', 'source', 'edge_evidence', 'text_offsets'} """
+        return {
+            'src': np.frombuffer(self._src, dtype=np.int32),
+            'dst': np.frombuffer(self._dst, dtype=np.int32),
+            'rel': np.frombuffer(self._rel, dtype=np.uint8),
+            'strength': np.frombuffer(self._strength, dtype=np.float32),
+            'source': np.frombuffer(self._source, dtype=np.int32),
+            'edge_evidence': np.frombuffer(self._edge_evidence, dtype=np.int64),
+            'text_offsets': np.frombuffer(self._text_offsets, dtype=np.int64),
+        }
+
+    def memory_bytes(self):
+        """ 열 배열 + 근거 버퍼 크기 (인턴 테이블 제외) """
+        return sum(col.nbytes for col in self.columns().values()) + len(self._text)
+
+    # --- 집계 ---
+    def _type_slices(self):
+        """ 유형 코드로 안정 정렬한 간선 순서와 {유형명: (시작, 끝)} """
+        rel = self.columns()['rel']
+        order = np.argsort(rel, kind='stable')
+        bounds = np.searchsorted(rel[order], np.arange(len(self.relation_type_names) + 1))
+        return order, {name: (bounds[code], bounds[code + 1]) for code, name in enumerate(self.relation_type_names)}
+
+    def _edges_for(self, relation_type, order, span):
+        cols = self.columns()
+        selected = order[span[0]:span[1]]
+        rows, dsts, strengths = cols['src'][selected], cols['dst'][selected], cols['strength'][selected]
+        if relation_type in SYMMETRIC_RELATION_TYPES:
+            rows, dsts = np.concatenate([rows, dsts]), np.concatenate([dsts, rows])
+            strengths = np.concatenate([strengths, strengths])
+        return rows, dsts, strengths
+
+    def to_sparse(self, relation_type, aggregation=None):
+        """ 관계 유형 하나의 CSR 행렬 (RelationGraphBuilder.to_sparse 와 동일) """
+        relation_type = normalize_relation_type(relation_type)
+        n = self.num_nodes
+        if relation_type not in self._relation_codes: return sp.csr_matrix((n, n), dtype=np.float32)
+        order, spans = self._type_slices()
+        return _aggregate_edges(*self._edges_for(relation_type, order, spans[relation_type]), n,
+                                aggregation or self.aggregation)
+
+    def matrices(self, aggregation=None):
+        """ {관계 유형: CSR 행렬} - 유형 코드 정렬 1회 후 유형별 벡터화 집계 """
+        order, spans = self._type_slices()
+        return {name: _aggregate_edges(*self._edges_for(name, order, spans[name]), self.num_nodes,
+                                       aggregation or self.aggregation)
+                for name in self.relation_types}
+
+    # --- 근거 조회 ---
+    def evidence(self, edge_id):
+        """ 간선 하나의 근거 텍스트 리스트 """
+        start, end = self._edge_evidence[edge_id], self._edge_evidence[edge_id + 1]
+        return [self._text[self._text_offsets[i]:self._text_offsets[i + 1]].decode('utf-8') for i in range(start, end)]
+
+    def _build_lookup(self):
+        cols = self.columns()
+        n = np.int64(self.num_nodes)
+        keys = (cols['rel'].astype(np.int64) * n + cols['src']) * n + cols['dst']
+        order = np.argsort(keys, kind='stable')
+        self._lookup = (keys[order], order)
+        return self._lookup
+
+    def edge_ids(self, row, col, relation_type):
+        """ 행렬 원소 (row, col) 에 기여한 간선 id 배열 (대칭 유형은 (col, row) 로 저장된 간선 포함) """
+        relation_type = normalize_relation_type(relation_type)
+        code = self._relation_codes.get(relation_type)
+        if code is None: return np.empty(0, dtype=np.int64)
+        keys, order = self._lookup or self._build_lookup()
+        n = self.num_nodes
+        pairs = [(row, col), (col, row)] if relation_type in SYMMETRIC_RELATION_TYPES and row != col else [(row, col)]
+        found = []
+        for r, c in pairs:
+            key = (code * n + r) * n + c
+            lo, hi = np.searchsorted(keys, key, side='left'), np.searchsorted(keys, key, side='right')
+            found.append(order[lo:hi])
+        return np.sort(np.concatenate(found))
+
+    def edge_evidence(self, company_a, company_b, relation_type):
+        """
+        두 기업(종목코드/이름 또는 행렬 인덱스) 사이 relation_type 간선의 근거.
+        반환: [{'edge_id', 'strength', 'source', 'evidence': [...]}, ...]
+        """
+        row = company_a if isinstance(company_a, (int, np.integer)) else self.company_index.resolve(company_a)
+        col = company_b if isinstance(company_b, (int, np.integer)) else self.company_index.resolve(company_b)
+        if row is None or col is None: return []
+        results = []
+        for edge_id in self.edge_ids(int(row), int(col), relation_type):
+            source = self._source[edge_id]
+            results.append({'edge_id': int(edge_id), 'strength': float(self._strength[edge_id]),
+                            'source': self.source_names[source] if source != NO_SOURCE else None,
+                            'evidence': self.evidence(edge_id)})
+        return results
+
+    # --- 저장/로드 ---
+    def save(self, path):
+        """ 열 배열, 근거 버퍼, 인턴 테이블, 노드 순서, 기업명 별칭을 .npz 하나로 저장 """
+        meta = {'format_version': STORE_FORMAT_VERSION, 'relation_types': self.relation_type_names,
+                'sources': self.source_names, 'node_codes': self.company_index.codes,
+                'aliases': self.company_index.aliases(), 'aggregation': self.aggregation}
+        np.savez(path, text=np.frombuffer(bytes(self._text), dtype=np.uint8),
+                 meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8),
+                 **self.columns())
+        logger.info(f"근거 저장소 저장 완료: {path} (간선 {self.num_edges}, 근거 {len(self._text_offsets) - 1}, "
+                    f"{self.memory_bytes() / 2**20:.1f}MB)")
+
+    @classmethod
+    def load(cls, path, company_index=None):
+        """
+        save() 로 저장한 파일 로드. company_index 를 주면 노드 순서가 같은지 확인하고 그 인덱스를 그대로 사용,
+        없으면 저장된 노드 순서와 기업명 별칭으로 CompanyIndex 를 복원 (이후 기업명으로 add_relationships 가능)
+        """
+        with np.load(path) as data:
+            meta = json.loads(data['meta'].tobytes().decode('utf-8'))
+            if company_index is not None and list(company_index.codes) != meta['node_codes']:
+                raise ValueError("company_index 노드 순서가 저장된 근거 저장소와 다릅니다.")
+            if company_index is None:
+                company_index = CompanyIndex(meta['node_codes'], meta.get('aliases'))
+            store = cls(company_index, meta.get('aggregation', 'sum'))
+            for name in meta['relation_types']: store._relation_code(name)
+            for name in meta['sources']: store._source_code(name)
+            store._src.frombytes(data['src'].astype(np.int32).tobytes())
+            store._dst.frombytes(data['dst'].astype(np.int32).tobytes())
+            store._rel.frombytes(data['rel'].astype(np.uint8).tobytes())
+            store._strength.frombytes(data['strength'].astype(np.float32).tobytes())
+            store._source.frombytes(data['source'].astype(np.int32).tobytes())
+            store._edge_evidence = array('q', data['edge_evidence'].astype(np.int64).tobytes())
+            store._text_offsets = array('q', data['text_offsets'].astype(np.int64).tobytes())
+            store._text = bytearray(data['text'].tobytes())
+        return store
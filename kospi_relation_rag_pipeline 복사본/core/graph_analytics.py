@@ -0,0 +1,159 @@
+# core/graph_analytics.py
+# 관계 인접 행렬(scipy.sparse CSR, build_adjacency_matrix / MatrixStore.load_matrix 결과) 위의 벡터화 그래프 분석
+# - degree / strength: 연결 수와 가중 연결 합 (행 = 출발, 열 = 도착)
+# - k_hop_reachability: k 단계 이내 도달 가능 여부 (불리언 희소 행렬 곱 반복)
+# - indirect_ownership: 직접 지분 행렬 W 의 급수 W + W^2 + ... (항이 tol 이하가 되면 중단)
+# - connected_components / clusters: 경쟁사 군집 등 연결 요소 (scipy.sparse.csgraph)
+# - normalized_adjacency: GNN 입력용 D^-1/2 (A + I) D^-1/2 (또는 D^-1 (A + I))
+# networkx 그래프로 변환하지 않으므로 수천 개 노드에서도 희소 연산만으로 계산합니다.
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+
+try:
+    from .config import logger
+except ImportError:
+    from config import logger
+
+DIRECTIONS = ('out', 'in', 'both')
+OWNERSHIP_TOL = 1e-6 # 급수 항의 최대 원소가 이 값 이하이면 수렴으로 판단 (작은 값은 제거해 희소성 유지)
+OWNERSHIP_MAX_TERMS = 64 # 급수에 포함할 최대 항 수
+OWNERSHIP_DENSE_FRACTION = 0.05 # 누적 지분 nnz 가 전체 원소의 이 비율을 넘으면 밀집 곱으로 계산
+
+
+def _as_csr(matrix):
+    """ 희소/밀집/mmap 입력을 float32 CSR 로 (이미 CSR 이면 복사하지 않음) """
+    if sp.issparse(matrix): return matrix.tocsr() if matrix.format != 'csr' else matrix
+    return sp.csr_matrix(np.asarray(matrix, dtype=np.float32))
+
+
+def _pattern(matrix):
+    """ 가중치를 버린 불리언 연결 패턴 (명시적으로 저장된 0 은 제외) """
+    csr = _as_csr(matrix)
+    pattern = csr.astype(bool)
+    pattern.eliminate_zeros()
+    return pattern
+
+
+def degree(matrix, direction='out'):
+    """ 노드별 연결 수 (int64). direction: 'out'(행), 'in'(열), 'both'(합, 대칭 행렬은 2배가 되므로 'out' 사용) """
+    if direction not in DIRECTIONS: raise ValueError(f"direction must be one of {DIRECTIONS}")
+    pattern = _pattern(matrix)
+    out_deg = np.diff(pattern.indptr).astype(np.int64)
+    if direction == 'out': return out_deg
+    in_deg = np.bincount(pattern.indices, minlength=pattern.shape[1]).astype(np.int64)
+    return in_deg if direction == 'in' else out_deg + in_deg
+
+
+def strength(matrix, direction='out'):
+    """ 노드별 가중 연결 합 (float64) """
+    if direction not in DIRECTIONS: raise ValueError(f"direction must be one of {DIRECTIONS}")
+    csr = _as_csr(matrix)
+    out_str = np.asarray(csr.sum(axis=1), dtype=np.float64).ravel()
+    if direction == 'out': return out_str
+    in_str = np.asarray(csr.sum(axis=0), dtype=np.float64).ravel()
+    return in_str if direction == 'in' else out_str + in_str
+
+
+def _difference(a, b):
+    """ 불리언 희소 행렬 차집합 a AND NOT b """
+    diff = a.astype(np.int8) - a.multiply(b).astype(np.int8)
+    diff.eliminate_zeros()
+    return diff.astype(bool)
+
+
+def k_hop_reachability(matrix, k, sources=None, include_self=False):
+    """
+    k 단계 이내 도달 가능 행렬 (bool CSR). R[i, j] = i 에서 j 로 k 단계 이하 경로 존재.
+    sources: 출발 노드 인덱스 리스트를 주면 해당 행만 계산 (결과 shape = (len(sources), n)).
+    매 단계 새로 도달한 노드(프런티어)만 곱하므로 이미 방문한 노드는 다시 전파하지 않음.
+    include_self=False 면 출발 노드 자신은 제외 (networkx single_source_shortest_path_length(cutoff=k) 에서 자신을 뺀 것과 동일)
+    """
+    if k < 1: raise ValueError("k must be >= 1")
+    adjacency = _pattern(matrix)
+    n = adjacency.shape[0]
+    start = sp.identity(n, dtype=bool, format='csr')
+    if sources is not None: start = start[np.asarray(sources, dtype=np.int64)]
+    reached, frontier = start, start
+    for _ in range(k):
+        frontier = _difference((frontier @ adjacency).astype(bool), reached)
+        if frontier.nnz == 0: break
+        reached = (reached + frontier).astype(bool)
+    return reached.tocsr() if include_self else _difference(reached, start).tocsr()
+
+
+def indirect_ownership(matrix, tol=OWNERSHIP_TOL, max_terms=OWNERSHIP_MAX_TERMS):
+    """
+    누적 간접 지분: W + W^2 + W^3 + ... (W[i, j] = i 가 j 를 직접 보유한 지분율, 0~1).
+    거듭제곱 배가(S_2m = S_m + W^m S_m, W^2m = W^m W^m)로 log2(항 수) 번만 반복하고,
+    마지막 항 W^m 의 최대 원소가 tol 이하가 되면 중단 (tol 미만 원소는 버려 희소성을 유지).
+    열 합이 1을 넘는 W(지분율이 아닌 강도 점수 등)는 급수가 발산할 수 있으므로 해당 열을 합 1로 정규화.
+    반환: (누적 지분 CSR float32, 포함된 항 수, 수렴 여부)
+    """
+    direct = _as_csr(matrix).astype(np.float64)
+    column_sums = np.asarray(direct.sum(axis=0)).ravel()
+    over = column_sums > 1.0 + 1e-9
+    if over.any():
+        logger.warning(f"열 합이 1을 넘는 노드 {int(over.sum())}개: 지분율로 정규화 후 계산합니다.")
+        direct = (direct @ sp.diags(np.where(over, 1.0 / np.where(over, column_sums, 1.0), 1.0))).tocsr()
+    total, power = direct.copy(), direct # total = W + ... + W^terms, power = W^terms
+    dense_limit = OWNERSHIP_DENSE_FRACTION * direct.shape[0] * direct.shape[1]
+    terms, converged = 1, False
+    while True:
+        values = power.data if sp.issparse(power) else power
+        if not values.size or values.max() <= tol:
+            converged = True
+            break
+        if terms * 2 > max_terms: break
+        if sp.issparse(total) and total.nnz > dense_limit: # 누적 지분이 조밀해지면 BLAS 밀집 곱으로 전환
+            total, power = total.toarray(), power.toarray()
+        total = total + power @ total # W^(m+1) ... W^(2m) 추가
+        power = power @ power
+        for part in (total, power): # 작은 항 제거 (희소성 유지)
+            if sp.issparse(part):
+                part.data[part.data < tol] = 0.0
+                part.eliminate_zeros()
+            else:
+                part[part < tol] = 0.0
+        terms *= 2
+    if not converged: logger.warning(f"간접 지분 급수가 {terms}항 안에 수렴하지 않았습니다 (tol={tol}).")
+    return sp.csr_matrix(total, dtype=np.float32), terms, converged
+
+
+def connected_components(matrix, connection='weak'):
+    """ 연결 요소. connection: 'weak'(방향 무시) | 'strong'. 반환: (요소 수, 노드별 요소 번호 배열) """
+    return csgraph.connected_components(_pattern(matrix), directed=True, connection=connection)
+
+
+def clusters(matrix, node_codes=None, min_size=2, connection='weak'):
+    """
+    연결 요소를 크기 내림차순 리스트로 반환 (경쟁사 군집 등). min_size 미만 요소(고립 노드 등)는 제외.
+    node_codes(CompanyIndex.codes 등)를 주면 인덱스 대신 종목코드 리스트.
+    """
+    _count, labels = connected_components(matrix, connection)
+    order = np.argsort(labels, kind='stable')
+    boundaries = np.flatnonzero(np.diff(labels[order])) + 1
+    groups = [g for g in np.split(order, boundaries) if len(g) >= min_size]
+    groups.sort(key=len, reverse=True)
+    if node_codes is not None: return [[node_codes[i] for i in group] for group in groups]
+    return [group.tolist() for group in groups]
+
+
+def normalized_adjacency(matrix, add_self_loops=True, mode='sym', symmetrize=False):
+    """
+    GNN 입력용 정규화 인접 행렬 (float32 CSR).
+    mode='sym': D^-1/2 (A + I) D^-1/2 (GCN), mode='rw': D^-1 (A + I) (행 정규화)
+    symmetrize=True 면 방향 관계(지분/공급)를 A + A^T 로 대칭화한 뒤 정규화. 연결이 없는 노드의 차수는 0 으로 둠.
+    """
+    if mode not in ('sym', 'rw'): raise ValueError("mode must be 'sym' or 'rw'")
+    adjacency = _as_csr(matrix).astype(np.float32)
+    if symmetrize: adjacency = adjacency + adjacency.T
+    if add_self_loops: adjacency = adjacency + sp.identity(adjacency.shape[0], dtype=np.float32, format='csr')
+    deg = np.asarray(adjacency.sum(axis=1), dtype=np.float64).ravel()
+    with np.errstate(divide='ignore'):
+        inv = 1.0 / (np.sqrt(deg) if mode == 'sym' else deg)
+    inv[~np.isfinite(inv)] = 0.0
+    inv_diag = sp.diags(inv.astype(np.float32))
+    normalized = inv_diag @ adjacency @ inv_diag if mode == 'sym' else inv_diag @ adjacency
+    return normalized.astype(np.float32).tocsr()
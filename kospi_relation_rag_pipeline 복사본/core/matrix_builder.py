@@ -1,40 +1,282 @@
-### 10. core/matrix_builder.py (수정됨: scipy.sparse 대신 numpy 기능 사용)
+### 10. core/matrix_builder.py (수정됨: 관계 유형별 scipy.sparse 희소 행렬 + 기업 인덱스 매핑)
+
+import os
+import re
+from array import array
 
 import numpy as np
-# import scipy.sparse as sp # scipy.sparse 임포트 제거
-from config import logger # config.py 가 동일 경로 또는 sys.path에 있어야 함
+import scipy.sparse as sp
+
+try:
+    from .capabilities import require
+    from .config import logger
+    from .profiler import timed
+except ImportError:
+    from capabilities import require
+    from config import logger
+    from profiler import timed
+
+# --- 기본 데이터 경로 (core/ 기준 ../data) ---
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'data')
+DEFAULT_STOCK_CODES_PATH = os.path.join(DATA_DIR, 'kospi100_stock_codes.txt')
+DEFAULT_NAME_MAP_PATH = os.path.join(DATA_DIR, 'kospi100_name_map.xlsx')
+
+# --- 관계 유형 정규화 (LLM 출력 표기 -> 내부 유형명) ---
+RELATION_TYPE_ALIASES = {
+    'competition': 'competition', 'competitor': 'competition', 'competitors': 'competition', '경쟁': 'competition',
+    'ownership': 'ownership', 'shareholding': 'ownership', 'investment': 'ownership', '지분': 'ownership', '소유': 'ownership',
+    'supply': 'supply', 'supplier': 'supply', 'supply_chain': 'supply', '공급': 'supply',
+    'customer': 'customer', 'client': 'customer', '고객': 'customer', '매출처': 'customer',
+    'affiliate': 'affiliate', 'affiliation': 'affiliate', '계열': 'affiliate', '계열회사': 'affiliate',
+}
+# 방향이 없는 관계는 양방향으로 기록
+SYMMETRIC_RELATION_TYPES = {'competition', 'affiliate'}
+# 문자열 강도 -> 수치 (숫자는 그대로 사용)
+STRENGTH_MAP = {'high': 1.0, 'strong': 1.0, '강': 1.0, 'medium': 0.6, '중': 0.6, 'low': 0.3, 'weak': 0.3, '약': 0.3}
+DEFAULT_STRENGTH = 0.5
+AGGREGATIONS = ('sum', 'max', 'mean', 'count')
+
+_NAME_NOISE_REGEX = re.compile(r'\(주\)|㈜|주식회사|\s+|[.,]')
+
+
+def normalize_relation_type(relation_type):
+    """ 관계 유형 문자열 정규화. 별칭에 없으면 소문자 그대로 (새 유형 허용) """
+    key = str(relation_type or '').strip().lower().replace(' ', '_').replace('-', '_')
+    return RELATION_TYPE_ALIASES.get(key, key) or None
+
+
+def parse_strength(strength):
+    """ 강도 값(숫자 또는 'high' 등)을 float 로 변환 """
+    if strength is None: return DEFAULT_STRENGTH
+    if isinstance(strength, (int, float)): return float(strength)
+    text = str(strength).strip().lower()
+    if text in STRENGTH_MAP: return STRENGTH_MAP[text]
+    try: return float(text)
+    except ValueError: return DEFAULT_STRENGTH
+
+
+def _normalize_name(name):
+    return _NAME_NOISE_REGEX.sub('', str(name)).lower()
+
+
+class CompanyIndex:
+    """ 기업 종목코드/이름 -> 행렬 인덱스 매핑 (종목코드 목록 순서 = 노드 순서) """
+    def __init__(self, stock_codes, names=None):
+        self.codes = [str(code).strip().zfill(6) for code in stock_codes]
+        self.code_to_index = {code: i for i, code in enumerate(self.codes)}
+        if len(self.code_to_index) != len(self.codes):
+            raise ValueError("중복된 종목코드가 있습니다.")
+        self._name_to_index = {}
+        for code, code_names in (names or {}).items():
+            self.add_aliases(code, code_names)
+
+    def __len__(self):
+        return len(self.codes)
+
+    def add_aliases(self, code, aliases):
+        """ 종목코드에 이름/별칭 추가 (정규화된 이름으로 조회) """
+        idx = self.code_to_index.get(str(code).strip().zfill(6))
+        if idx is None: return
+        for alias in aliases:
+            if alias and isinstance(alias, str): self._name_to_index[_normalize_name(alias)] = idx
+
+    def aliases(self):
+        """ {종목코드: [정규화된 이름/별칭, ...]} (저장 후 add_aliases 로 복원 가능) """
+        by_code = {}
+        for name, idx in self._name_to_index.items(): by_code.setdefault(self.codes[idx], []).append(name)
+        return by_code
+
+    def resolve(self, company):
+        """ 종목코드 또는 기업명을 인덱스로 변환. 찾지 못하면 None """
+        if company is None: return None
+        key = str(company).strip()
+        if key.isdigit() and len(key) <= 6:
+            return self.code_to_index.get(key.zfill(6))
+        return self._name_to_index.get(_normalize_name(key))
+
+    @classmethod
+    def from_files(cls, stock_codes_path=DEFAULT_STOCK_CODES_PATH, name_map_path=DEFAULT_NAME_MAP_PATH):
+        """ 종목코드 목록(txt, 한 줄에 하나)과 이름 매핑 엑셀(stock_code, company_name_ko, company_name_en)에서 생성 """
+        with open(stock_codes_path, 'r', encoding='utf-8') as f:
+            codes = [line.strip() for line in f if line.strip()]
+        index = cls(codes)
+        if name_map_path and os.path.exists(name_map_path):
+            pd = require('pandas') # 엑셀 매핑이 필요할 때만 로드
+            name_map = pd.read_excel(name_map_path, dtype=str)
+            name_columns = [c for c in ('company_name_ko', 'company_name_en') if c in name_map.columns]
+            for row in name_map.itertuples(index=False):
+                index.add_aliases(getattr(row, 'stock_code'), [getattr(row, c) for c in name_columns])
+        logger.info(f"기업 인덱스 로드 완료: {len(index)}개 기업")
+        return index
+
 
-# build_adjacency_matrix 함수의 반환 타입 힌트를 numpy 배열로 변경
-def build_adjacency_matrix(relationships: dict) -> np.ndarray:
+class RelationGraphBuilder:
     """
-    LLM에서 추출된 관계 정보를 기반으로 인접 행렬 (NumPy 배열)을 생성하는 함수
+    LLM 추출 관계를 누적하여 관계 유형별 희소 인접 행렬(CSR)을 만드는 빌더.
+    간선은 유형별 COO 버퍼(array)에만 쌓이므로 N x N 밀집 행렬을 만들지 않습니다 (KRX 전체 ~2,500 노드 대응).
+    """
+    def __init__(self, company_index, aggregation='sum'):
+        if aggregation not in AGGREGATIONS: raise ValueError(f"aggregation must be one of {AGGREGATIONS}")
+        self.company_index = company_index
+        self.aggregation = aggregation
+        self._edges = {} # relation_type -> (rows, cols, strengths)
+        self.unresolved = {} # 인덱스를 찾지 못한 기업명 -> 횟수
+
+    @property
+    def num_nodes(self):
+        return len(self.company_index)
+
+    @property
+    def relation_types(self):
+        return sorted(self._edges)
+
+    def _buffers(self, relation_type):
+        if relation_type not in self._edges:
+            self._edges[relation_type] = (array('i'), array('i'), array('f'))
+        return self._edges[relation_type]
+
+    def _resolve(self, company):
+        idx = self.company_index.resolve(company)
+        if idx is None: self.unresolved[company] = self.unresolved.get(company, 0) + 1
+        return idx
+
+    def add_edge(self, company_a, company_b, relation_type, strength=None):
+        """ 간선 1개 추가. 두 기업 모두 인덱스를 찾았을 때만 True """
+        relation_type = normalize_relation_type(relation_type)
+        idx_a, idx_b = self._resolve(company_a), self._resolve(company_b)
+        if relation_type is None or idx_a is None or idx_b is None or idx_a == idx_b: return False
+        rows, cols, strengths = self._buffers(relation_type)
+        value = parse_strength(strength)
+        rows.append(idx_a); cols.append(idx_b); strengths.append(value)
+        if relation_type in SYMMETRIC_RELATION_TYPES:
+            rows.append(idx_b); cols.append(idx_a); strengths.append(value)
+        return True
+
+    def add_relationships(self, relationships):
+        """
+        LLM 추출 결과 누적. 입력: dict 하나 또는 리스트
+        {'company_a': ..., 'company_b': ..., 'relationships': [{"type": ..., "strength": ..., "evidence": [...]}, ...]}
+        반환: 추가된 간선 수
+        """
+        if not relationships: return 0
+        if isinstance(relationships, dict): relationships = [relationships]
+        added = 0
+        for record in relationships:
+            company_a, company_b = record.get('company_a'), record.get('company_b')
+            for rel in record.get('relationships') or []:
+                added += self.add_edge(company_a, company_b, rel.get('type'), rel.get('strength'))
+        return added
+
+    def to_sparse(self, relation_type, aggregation=None):
+        """ 관계 유형 하나의 CSR 행렬 (중복 간선은 aggregation 으로 집계, float32) """
+        relation_type = normalize_relation_type(relation_type)
+        n = self.num_nodes
+        if relation_type not in self._edges:
+            return sp.csr_matrix((n, n), dtype=np.float32)
+        rows, cols, strengths = (np.frombuffer(buf, dtype=dtype) for buf, dtype in
+                                 zip(self._edges[relation_type], (np.int32, np.int32, np.float32)))
+        return _aggregate_edges(rows, cols, strengths, n, aggregation or self.aggregation)
+
+    def matrices(self, aggregation=None):
+        """ {관계 유형: CSR 행렬} """
+        return {rel_type: self.to_sparse(rel_type, aggregation) for rel_type in self.relation_types}
+
+    def to_tensor(self, relation_types=None, aggregation=None):
+        """ 다중 관계 텐서: (관계 유형 리스트, [CSR 행렬, ...]) - 관계 축은 리스트, 각 행렬은 희소 유지 """
+        relation_types = relation_types or self.relation_types
+        return relation_types, [self.to_sparse(t, aggregation) for t in relation_types]
+
+
+def _aggregate_edges(rows, cols, strengths, num_nodes, aggregation):
+    """ COO 간선 배열을 (행, 열) 단위로 집계하여 CSR 로 변환 """
+    if aggregation == 'sum':
+        matrix = sp.coo_matrix((strengths, (rows, cols)), shape=(num_nodes, num_nodes), dtype=np.float32).tocsr()
+        matrix.sum_duplicates()
+        return matrix
+    keys = rows.astype(np.int64) * num_nodes + cols
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse).astype(np.float32)
+    if aggregation == 'count':
+        values = counts
+    elif aggregation == 'mean':
+        values = (np.bincount(inverse, weights=strengths) / counts).astype(np.float32)
+    else: # max
+        values = np.full(len(unique_keys), -np.inf, dtype=np.float32)
+        np.maximum.at(values, inverse, strengths)
+    return sp.csr_matrix((values, (unique_keys // num_nodes, unique_keys % num_nodes)),
+                         shape=(num_nodes, num_nodes), dtype=np.float32)
+
+
+def _mark_matrix_applied(manifest, relationships):
+    """ 행렬에 반영된 보고서(레코드의 rcept_no, EvidenceStore 는 출처 목록)의 'matrix_applied' 단계 기록 """
+    if manifest is None: return
+    if hasattr(relationships, 'source_names'): rcept_nos = relationships.source_names
+    else: rcept_nos = [record.get('rcept_no') for record in relationships or []]
+    for rcept_no in dict.fromkeys(rcept_nos):
+        if rcept_no: manifest.mark(None, rcept_no, 'matrix_applied')
+
+
+@timed('matrix_build')
+def build_adjacency_matrix(relationships, company_index=None, aggregation='sum', manifest=None) -> dict:
+    """
+    LLM에서 추출된 관계 정보를 기반으로 관계 유형별 희소 인접 행렬(scipy.sparse CSR)을 생성하는 함수
     relationships: {'company_a': ..., 'company_b': ..., 'relationships': [ { "type": ..., "strength": ... , "evidence": [...] }, ... ]}
-    이 예시는 간단히 두 기업 간 단일 관계 강도를 수치화해 인접 행렬에 반영합니다.
+                   (또는 그 리스트)
+                   이미 누적된 evidence_store.EvidenceStore 를 넘기면 그 저장소에서 바로 집계
+    company_index: CompanyIndex (없으면 data/kospi100_stock_codes.txt + kospi100_name_map.xlsx 에서 로드)
+    manifest: run_manifest.RunManifest (선택). 반영된 레코드의 rcept_no 별로 'matrix_applied' 단계 완료 기록
+    반환: {'competition': csr_matrix, 'ownership': csr_matrix, ...}
     """
-    # 예시: 100개 기업 (실제 매핑 정보 필요), 여기서는 임의 크기 100x100 행렬로 생성
-    num_nodes = 100 # 실제 노드 수로 변경 필요
-    matrix = np.zeros((num_nodes, num_nodes), dtype=np.float32) # 데이터 타입 명시 (예: float32)
+    if hasattr(relationships, 'matrices'): # EvidenceStore (열 지향 근거 저장소)
+        matrices = relationships.matrices(aggregation)
+        _mark_matrix_applied(manifest, relationships)
+        return matrices
+    if isinstance(relationships, dict): relationships = [relationships]
+    company_index = company_index or CompanyIndex.from_files()
+    builder = RelationGraphBuilder(company_index, aggregation=aggregation)
+    added = builder.add_relationships(relationships)
+    if builder.unresolved:
+        logger.warning(f"인덱스 매핑 실패 기업: {list(builder.unresolved)[:20]}")
+    matrices = builder.matrices()
+    logger.info(f"희소 인접 행렬 생성 완료 (노드: {builder.num_nodes}, 간선 추가: {added}, "
+                f"유형별 nnz: { {t: m.nnz for t, m in matrices.items()} })")
+    _mark_matrix_applied(manifest, relationships)
+    return matrices
 
-    # --- 실제 관계 데이터로 matrix 채우는 로직 필요 ---
-    # 예시: company_a -> company_b 관계 (인덱스 매핑 필요)
-    # if relationships:
-    #     # 여기에 relationships 딕셔너리를 파싱하여 matrix[idx_a, idx_b] = value 형태로 채우는 코드 추가
-    #     # 예: strength = relationships['relationships'][0]['strength'] # 실제 구조에 맞게 파싱
-    #     # matrix[company_to_index[relationships['company_a']], company_to_index[relationships['company_b']]] = strength
-    #     pass # 실제 구현 필요
-    # ---------------------------------------------
 
-    logger.info(f"NumPy 인접 행렬 생성 완료 (Shape: {matrix.shape}) - 실제 매핑 및 계산 필요")
-    # scipy.sparse 변환 없이 NumPy 배열 그대로 반환
-    return matrix
+@timed('matrix_build')
+def build_period_matrices(relationships, company_index=None, aggregation='sum', period_key='period', manifest=None) -> dict:
+    """
+    보고 기간별 관계 행렬 시계열 생성 (temporal_store.TemporalMatrixStore.append_snapshot 입력용)
+    relationships: build_adjacency_matrix 와 같은 레코드 리스트, 각 레코드에 period_key 기간 문자열
+                   (temporal_store.report_period(bsns_year, reprt_code) 형식, 예: '2024Q2')
+    manifest: run_manifest.RunManifest (선택). 기간 행렬에 반영된 레코드의 rcept_no 별로 'matrix_applied' 기록
+    반환: {기간: {관계 유형: csr_matrix}} (기간 오름차순). 기간이 없는 레코드는 제외
+    """
+    company_index = company_index or CompanyIndex.from_files()
+    if isinstance(relationships, dict): relationships = [relationships]
+    builders, missing = {}, 0
+    for record in relationships or []:
+        period = record.get(period_key)
+        if not period:
+            missing += 1
+            continue
+        if period not in builders: builders[period] = RelationGraphBuilder(company_index, aggregation=aggregation)
+        builders[period].add_relationships(record)
+    if missing: logger.warning(f"기간({period_key})이 없는 관계 레코드 {missing}건 제외")
+    series = {period: builders[period].matrices() for period in sorted(builders)}
+    logger.info(f"기간별 희소 인접 행렬 생성 완료 (기간: {list(series)})")
+    _mark_matrix_applied(manifest, [record for record in relationships or [] if record.get(period_key)])
+    return series
 
-# save_matrix 함수의 입력 타입 힌트를 numpy 배열로 변경
-def save_matrix(matrix: np.ndarray, file_path: str):
+def save_matrix(matrix, file_path: str):
     """
-    인접 행렬 (NumPy 배열)을 압축된 .npz 파일로 저장하는 함수
+    인접 행렬을 압축된 .npz 파일로 저장하는 함수
+    scipy.sparse 행렬은 save_npz (COO/CSR 구성 배열), NumPy 배열은 savez_compressed 로 저장
+    반복 로드/mmap/기간별 버전 관리가 필요하면 matrix_store.MatrixStore 사용
     """
-    if not isinstance(matrix, np.ndarray):
-        logger.error(f"Invalid input: Expected a NumPy array, but got {type(matrix)}")
+    if not isinstance(matrix, np.ndarray) and not sp.issparse(matrix):
+        logger.error(f"Invalid input: Expected a NumPy array or scipy.sparse matrix, but got {type(matrix)}")
         return
 
     # 파일 확장자가 .npz가 아니면 추가 (savez_compressed는 자동으로 추가하지 않음)
@@ -42,9 +284,13 @@ def save_matrix(matrix: np.ndarray, file_path: str):
         file_path += '.npz'
 
     try:
+        if sp.issparse(matrix):
+            sp.save_npz(file_path, matrix, compressed=True)
+            logger.info(f"희소 인접 행렬 저장 완료: {file_path} (shape={matrix.shape}, nnz={matrix.nnz})")
+            return
         # numpy.savez_compressed 사용하여 NumPy 배열 저장 (압축된 .npz 형식)
         # 키워드 인자(예: 'adjacency_matrix')를 사용하여 배열 저장 권장
         np.savez_compressed(file_path, adjacency_matrix=matrix)
         logger.info(f"NumPy 인접 행렬 저장 완료: {file_path}")
     except Exception as e:
-        logger.error(f"NumPy 인접 행렬 저장 오류 ({file_path}): {e}")
\ No newline at end of file
+        logger.error(f"인접 행렬 저장 오류 ({file_path}): {e}")
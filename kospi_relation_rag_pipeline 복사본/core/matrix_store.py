@@ -0,0 +1,169 @@
+# core/matrix_store.py
+# 버전 관리되는 인접 행렬 저장소 (save_matrix 의 .npz 대신 mmap 가능한 비압축 레이아웃)
+#
+# <root>/<period>/nodes.json                       노드 순서 (종목코드 리스트)
+# <root>/<period>/<relation_type>/manifest.json     관계 유형, shape, nnz, 노드 순서 해시, 원천 rcept_no, 생성 시각
+# <root>/<period>/<relation_type>/{indptr,indices,data}.npy   (희소 CSR 구성 배열)
+# <root>/<period>/<relation_type>/dense.npy                   (밀집 배열인 경우)
+#
+# period 는 보고 기간 문자열 (예: '2024Q3', temporal_store.report_period 형식). 같은 기간을 다시 저장하면 해당 스냅샷만 교체.
+# load_matrix(..., mmap=True) 는 np.load(mmap_mode='r') 로 열어 RAM 복사 없이 사용.
+
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    from .config import logger
+except ImportError:
+    from config import logger
+
+MANIFEST_FILE = 'manifest.json'
+NODES_FILE = 'nodes.json'
+CSR_COMPONENTS = ('indptr', 'indices', 'data')
+STORE_FORMAT_VERSION = 1
+
+
+def _nodes_sha256(node_codes):
+    return hashlib.sha256('\n'.join(node_codes).encode('utf-8')).hexdigest()
+
+
+def _write_json(path, payload):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+class MatrixStore:
+    """ 보고 기간별 스냅샷으로 관계 행렬을 저장/로드 """
+    def __init__(self, root_dir):
+        self.root_dir = root_dir
+        os.makedirs(root_dir, exist_ok=True)
+
+    # --- 경로/목록 ---
+    def _period_dir(self, period):
+        return os.path.join(self.root_dir, str(period))
+
+    def _matrix_dir(self, relation_type, period):
+        return os.path.join(self._period_dir(period), relation_type)
+
+    def list_periods(self):
+        """ 저장된 보고 기간 목록 (문자열 정렬 = 시간 순서가 되도록 '2024Q3' 형식 권장) """
+        return sorted(d for d in os.listdir(self.root_dir)
+                      if os.path.exists(os.path.join(self.root_dir, d, NODES_FILE)))
+
+    def latest_period(self):
+        periods = self.list_periods()
+        return periods[-1] if periods else None
+
+    def list_relations(self, period=None):
+        period = period or self.latest_period()
+        if period is None: return []
+        period_dir = self._period_dir(period)
+        # '.' 으로 시작하는 폴더는 저장 중인 임시 폴더 / 교체 전 스냅샷
+        return sorted(d for d in os.listdir(period_dir)
+                      if not d.startswith('.') and os.path.exists(os.path.join(period_dir, d, MANIFEST_FILE)))
+
+    # --- 저장 ---
+    def save_matrix(self, matrix, relation_type, period, node_codes, source_rcept_nos=(), extra=None):
+        """
+        행렬 스냅샷 저장 후 manifest 반환.
+        node_codes: 행/열 순서의 종목코드 리스트 (CompanyIndex.codes), source_rcept_nos: 행렬을 만든 보고서 접수번호들
+        """
+        node_codes = [str(code) for code in node_codes]
+        if matrix.shape != (len(node_codes), len(node_codes)):
+            raise ValueError(f"matrix shape {matrix.shape} does not match {len(node_codes)} nodes")
+
+        period_dir = self._period_dir(period)
+        os.makedirs(period_dir, exist_ok=True)
+        nodes_path = os.path.join(period_dir, NODES_FILE)
+        nodes_sha = _nodes_sha256(node_codes)
+        if os.path.exists(nodes_path):
+            with open(nodes_path, 'r', encoding='utf-8') as f:
+                if _nodes_sha256(json.load(f)) != nodes_sha:
+                    raise ValueError(f"노드 순서가 기존 스냅샷({period})과 다릅니다.")
+        else:
+            _write_json(nodes_path, node_codes)
+
+        # 임시 폴더에 쓴 뒤 교체 (읽는 쪽이 반쯤 쓰인 스냅샷을 보지 않도록)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{relation_type}-", dir=period_dir)
+        try:
+            if sp.issparse(matrix):
+                csr = sp.csr_matrix(matrix, dtype=np.float32)
+                csr.sum_duplicates()
+                for name in CSR_COMPONENTS:
+                    np.save(os.path.join(tmp_dir, f"{name}.npy"), getattr(csr, name))
+                layout, nnz = 'csr', int(csr.nnz)
+            else:
+                dense = np.asarray(matrix, dtype=np.float32)
+                np.save(os.path.join(tmp_dir, 'dense.npy'), dense)
+                layout, nnz = 'dense', int(np.count_nonzero(dense))
+            manifest = {
+                'format_version': STORE_FORMAT_VERSION,
+                'relation_type': relation_type,
+                'period': str(period),
+                'layout': layout,
+                'shape': list(matrix.shape),
+                'nnz': nnz,
+                'dtype': 'float32',
+                'nodes_sha256': nodes_sha,
+                'source_rcept_nos': sorted(set(map(str, source_rcept_nos))),
+                'built_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+                **(extra or {}),
+            }
+            _write_json(os.path.join(tmp_dir, MANIFEST_FILE), manifest)
+
+            target_dir = self._matrix_dir(relation_type, period)
+            # 기존 스냅샷은 지우지 않고 옆으로 옮긴 뒤 새 폴더를 rename 으로 넣고, 성공하면 그때 삭제
+            # (중간에 실패해도 이전 스냅샷이 남고, 읽는 쪽은 반쯤 지워진 폴더를 보지 않음)
+            old_dir = f"{tmp_dir}.old" if os.path.exists(target_dir) else None
+            if old_dir: os.replace(target_dir, old_dir)
+            try:
+                os.replace(tmp_dir, target_dir)
+            except Exception:
+                if old_dir: os.replace(old_dir, target_dir)
+                raise
+            if old_dir: shutil.rmtree(old_dir, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        logger.info(f"행렬 스냅샷 저장 완료: {relation_type}@{period} ({layout}, nnz={nnz})")
+        return manifest
+
+    def save_matrices(self, matrices, period, node_codes, source_rcept_nos=()):
+        """ build_adjacency_matrix 결과({관계 유형: 행렬})를 한 기간 스냅샷으로 저장 """
+        return {rel_type: self.save_matrix(m, rel_type, period, node_codes, source_rcept_nos)
+                for rel_type, m in matrices.items()}
+
+    # --- 로드 ---
+    def load_manifest(self, relation_type, period=None):
+        period = period or self.latest_period()
+        if period is None: raise FileNotFoundError(f"저장된 스냅샷 없음: {self.root_dir}")
+        with open(os.path.join(self._matrix_dir(relation_type, period), MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_nodes(self, period=None):
+        period = period or self.latest_period()
+        with open(os.path.join(self._period_dir(period), NODES_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def load_matrix(self, relation_type, period=None, mmap=True):
+        """
+        스냅샷 로드 (period 없으면 최신). mmap=True 면 배열을 읽기 전용 메모리 맵으로 열어 복사하지 않음.
+        반환: csr_matrix (희소) 또는 np.ndarray / np.memmap (밀집)
+        """
+        manifest = self.load_manifest(relation_type, period)
+        matrix_dir = self._matrix_dir(relation_type, manifest['period'])
+        mmap_mode = 'r' if mmap else None
+        if manifest['layout'] == 'dense':
+            return np.load(os.path.join(matrix_dir, 'dense.npy'), mmap_mode=mmap_mode)
+        indptr, indices, data = (np.load(os.path.join(matrix_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+                                 for name in CSR_COMPONENTS)
+        return sp.csr_matrix((data, indices, indptr), shape=tuple(manifest['shape']), copy=False)
@@ -0,0 +1,179 @@
+# core/mention_index.py
+# 기업 언급 색인: 종목별 공식명/영문명/별칭을 하나의 컴파일된 정규식으로 묶어 섹션(또는 FnGuide 페이지)을
+# 한 번만 스캔하고, 함께 언급된 기업 쌍(company_a, company_b, section)만 위치와 함께 후보로 내보냅니다.
+# N 개 기업 전체 쌍(N^2)을 LLM 에 묻는 대신 실제로 같은 섹션에 나온 쌍만 관계 추출/행렬 단계로 넘기기 위함.
+# - 별칭 정규식은 접두사 트라이로 묶어(삼성|삼성전자|삼성SDI -> 삼성(?:전자|SDI)?) 기업 수가 늘어도 위치당 비교가 늘지 않음
+# - 같은 위치에서는 가장 긴 별칭 우선 (POSCO홀딩스 가 POSCO 보다, 삼성바이오로직스 가 짧은 별칭보다 우선)
+# - 영문 별칭은 영문 단어 경계 적용, 한글은 조사가 붙으므로 경계 미적용 (page_classifier 와 같은 규칙)
+
+import os
+import re
+
+try:
+    from .capabilities import require
+    from .config import logger
+except ImportError:
+    from capabilities import require
+    from config import logger
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'data')
+DEFAULT_NAME_MAP_PATH = os.path.join(DATA_DIR, 'kospi100_name_map.xlsx')
+
+# 공시/리포트에서 자주 쓰이는 약칭·구 사명 (종목코드 -> 별칭). 여러 기업에 걸치는 그룹명('LG', '삼성')은 넣지 않음
+COMPANY_ALIASES = {
+    '005380': ['현대자동차', 'Hyundai Motor'],
+    '000270': ['기아자동차', 'Kia Motors'],
+    '005490': ['POSCO', '포스코', '포스코홀딩스'],
+    '035420': ['네이버'],
+    '035720': ['카카오'],
+    '000660': ['하이닉스', 'SK Hynix'],
+}
+# 영문명 뒤의 법인 형태 표기 (별칭 생성 시 제거: 'Samsung Electronics Co., Ltd.' -> 'Samsung Electronics')
+_CORPORATE_SUFFIX_REGEX = re.compile(
+    r'[\s,]*(?:Co\.?,?\s*Ltd\.?|Corporation|Corp\.?|Company|Inc\.?|Ltd\.?|Holdings?\s+Inc\.?|Limited)\s*$', re.IGNORECASE)
+_KOREAN_CORP_REGEX = re.compile(r'\(주\)|㈜|주식회사')
+MIN_ALIAS_LENGTH = 2 # 이보다 짧은 별칭은 오탐이 많아 제외
+_ASCII_WORD_CHAR = '[A-Za-z0-9]'
+_SPACE_REGEX = re.compile(r'\s+')
+
+
+def _alias_key(alias):
+    """ 별칭/일치 문자열 비교 키 (공백 정규화 + 소문자) """
+    return _SPACE_REGEX.sub(' ', alias.strip()).lower()
+
+
+def alias_variants(name_ko=None, name_en=None, extra=()):
+    """ 공식명/영문명/추가 별칭 -> 검색 별칭 리스트 (법인 표기 제거 변형 포함, 중복 제거) """
+    aliases = []
+    for name in (name_ko, name_en, *extra):
+        if not name or not isinstance(name, str): continue
+        name = _KOREAN_CORP_REGEX.sub('', name).strip()
+        aliases.append(name)
+        stripped = _CORPORATE_SUFFIX_REGEX.sub('', name).strip()
+        if stripped and stripped != name: aliases.append(stripped)
+    return [a for a in dict.fromkeys(aliases) if len(a) >= MIN_ALIAS_LENGTH]
+
+
+def _trie_pattern(keys):
+    """ 별칭 키(소문자) 리스트 -> 접두사 트라이 정규식 (긴 일치 우선, 공백은 \\s+, 영문 끝은 단어 경계) """
+    trie = {}
+    for key in keys:
+        node = trie
+        for ch in key: node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node, last_char):
+        branches = []
+        for ch in sorted(c for c in node if c):
+            branches.append((r'\s+' if ch == ' ' else re.escape(ch)) + build(node[ch], ch))
+        if '' in node: # 여기서 끝나는 별칭: 자식보다 뒤에 두어 더 긴 일치 우선
+            branches.append(f'(?!{_ASCII_WORD_CHAR})' if re.match(_ASCII_WORD_CHAR, last_char or '') else '')
+        if len(branches) == 1: return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+    return build(trie, None)
+
+
+class MentionIndex:
+    """
+    기업 언급 색인. aliases: {종목코드: [공식명/영문명/별칭, ...]}
+    - find_mentions(text): [(종목코드, 시작, 끝, 일치 문자열), ...] (위치 순)
+    - iter_candidate_pairs(sections): 섹션마다 함께 언급된 기업 쌍 후보 dict 를 yield
+    """
+    def __init__(self, aliases):
+        key_codes = {}
+        for code, names in aliases.items():
+            code = str(code).strip().zfill(6)
+            for alias in names:
+                if alias and isinstance(alias, str) and len(alias.strip()) >= MIN_ALIAS_LENGTH:
+                    key_codes.setdefault(_alias_key(alias), set()).add(code)
+        ambiguous = sorted(key for key, codes in key_codes.items() if len(codes) > 1)
+        if ambiguous: logger.warning(f"여러 기업에 해당하는 별칭 제외: {ambiguous[:20]}")
+        self._key_to_code = {key: next(iter(codes)) for key, codes in key_codes.items() if len(codes) == 1}
+        self.codes = sorted(set(self._key_to_code.values()))
+        ascii_keys = [k for k in self._key_to_code if re.match(_ASCII_WORD_CHAR, k)]
+        other_keys = [k for k in self._key_to_code if not re.match(_ASCII_WORD_CHAR, k)]
+        alternatives = []
+        if ascii_keys: alternatives.append(f'(?<!{_ASCII_WORD_CHAR})' + _trie_pattern(ascii_keys))
+        if other_keys: alternatives.append(_trie_pattern(other_keys))
+        pattern = '|'.join(alternatives) or r'(?!)'
+        # 별칭 키가 소문자이므로 본문을 lower() 한 뒤 대소문자 구분 검색 (IGNORECASE 보다 3배가량 빠름)
+        self._regex = re.compile(pattern)
+        self._regex_ci = re.compile(pattern, re.IGNORECASE) # lower() 로 길이가 바뀌는 문자('İ' 등)가 있으면 원문에 사용
+
+    def __len__(self):
+        return len(self._key_to_code)
+
+    @classmethod
+    def from_files(cls, name_map_path=DEFAULT_NAME_MAP_PATH, extra_aliases=None):
+        """ 이름 매핑 엑셀(stock_code, company_name_ko, company_name_en) + COMPANY_ALIASES(+ extra_aliases) 에서 생성 """
+        pd = require('pandas') # 엑셀 매핑이 필요할 때만 로드
+        name_map = pd.read_excel(name_map_path, dtype=str)
+        extra = {code: list(COMPANY_ALIASES.get(code, [])) for code in COMPANY_ALIASES}
+        for code, names in (extra_aliases or {}).items(): extra.setdefault(str(code).zfill(6), []).extend(names)
+        aliases = {}
+        for row in name_map.itertuples(index=False):
+            code = str(row.stock_code).strip().zfill(6)
+            aliases[code] = alias_variants(getattr(row, 'company_name_ko', None), getattr(row, 'company_name_en', None),
+                                           extra.get(code, ()))
+        index = cls(aliases)
+        logger.info(f"기업 언급 색인 생성 완료: {len(aliases)}개 기업, 별칭 {len(index)}개")
+        return index
+
+    def find_mentions(self, text):
+        """ 텍스트를 한 번 스캔해 [(종목코드, 시작, 끝, 일치 문자열), ...] 반환 (겹치지 않는 가장 긴 일치) """
+        if not text: return []
+        lowered = text.lower()
+        regex, target = (self._regex, lowered) if len(lowered) == len(text) else (self._regex_ci, text)
+        return [(self._key_to_code[_alias_key(m.group())], m.start(), m.end(), text[m.start():m.end()])
+                for m in regex.finditer(target)]
+
+    def mentioned_codes(self, text):
+        """ 텍스트에 언급된 종목코드 집합 """
+        return {code for code, _s, _e, _m in self.find_mentions(text)}
+
+    def iter_candidate_pairs(self, sections, extra_metadata=None, include_subject=True, max_distance=None):
+        """
+        섹션 dict(extract_sections_streaming / iter_section_chunks) 또는 langchain Document(FnGuide 페이지)를
+        하나씩 스캔해 함께 언급된 기업 쌍 후보를 yield.
+        후보 dict: company_a, company_b (종목코드, a < b), section, rcept_no, positions_a, positions_b([(시작, 끝), ...]),
+                   distance(두 기업 언급 사이 최소 글자 거리), 그리고 섹션의 company_code/period 등 메타데이터
+        include_subject=True 면 보고서 주체 기업(company_code)은 본문에 이름이 없어도('당사') 언급된 모든 기업과 쌍을 이룸 (위치는 빈 리스트)
+        max_distance: 주면 두 기업 언급이 이 글자 수 이내로 가까운 쌍만 (위치 없는 주체 기업 쌍은 유지)
+        """
+        for item in sections:
+            text, metadata = _section_text(item, extra_metadata)
+            positions, last_end, distances = {}, {}, {}
+            for code, start, end, _match in self.find_mentions(text):
+                # 일치 구간은 겹치지 않고 위치 순이므로 다른 기업의 가장 가까운 앞 언급 = 마지막으로 본 언급
+                for other, other_end in last_end.items():
+                    if other == code: continue
+                    key = (code, other) if code < other else (other, code)
+                    gap = start - other_end
+                    if key not in distances or gap < distances[key]: distances[key] = gap
+                last_end[code] = end
+                positions.setdefault(code, []).append((start, end))
+            subject = str(metadata.get('company_code') or '').zfill(6) if metadata.get('company_code') else None
+            if include_subject and subject and positions and subject not in positions: positions[subject] = []
+            codes = sorted(positions)
+            base = {'section': metadata.get('original_section') or metadata.get('page'), 'rcept_no': metadata.get('rcept_no')}
+            base.update({k: metadata[k] for k in ('company_code', 'period', 'source') if metadata.get(k)})
+            for i, code_a in enumerate(codes):
+                for code_b in codes[i + 1:]:
+                    distance = distances.get((code_a, code_b))
+                    if max_distance is not None and distance is not None and distance > max_distance: continue
+                    yield dict(base, company_a=code_a, company_b=code_b, positions_a=positions[code_a],
+                               positions_b=positions[code_b], distance=distance)
+
+    def candidate_pairs(self, sections, extra_metadata=None, include_subject=True, max_distance=None):
+        """ iter_candidate_pairs 결과 리스트 """
+        return list(self.iter_candidate_pairs(sections, extra_metadata, include_subject, max_distance))
+
+
+def _section_text(item, extra_metadata=None):
+    """ 섹션 dict 또는 langchain Document -> (텍스트, 메타데이터) """
+    if isinstance(item, dict):
+        text, metadata = item.get('content') or '', {k: v for k, v in item.items() if k != 'content'}
+    else: # langchain Document
+        text, metadata = item.page_content or '', dict(item.metadata or {})
+    return text, dict(extra_metadata or {}, **metadata)
+
@@ -0,0 +1,57 @@
+# core/page_classifier.py
+# 다중 키워드/패턴 페이지 분류기: 관계 유형별 지표 키워드를 하나의 통합 정규식으로 컴파일해
+# 페이지(또는 섹션 제목)를 한 번만 스캔하여 모든 관계 유형의 지표 개수를 계산합니다.
+# pdf_processor(FnGuide 페이지 분류)와 dart_utils(DART 섹션 제목 탐지)가 함께 사용합니다.
+
+import re
+
+# 키워드 양 끝이 영문/숫자이면 영문 단어 경계 적용 (한글은 조사가 붙으므로 경계 미적용)
+_ASCII_WORD_CHAR = '[A-Za-z0-9]'
+
+
+def _keyword_pattern(keyword):
+    pattern = re.escape(keyword.strip())
+    if re.match(_ASCII_WORD_CHAR, keyword.strip()): pattern = f'(?<!{_ASCII_WORD_CHAR}){pattern}'
+    if re.search(f'{_ASCII_WORD_CHAR}$', keyword.strip()): pattern = f'{pattern}(?!{_ASCII_WORD_CHAR})'
+    return pattern
+
+
+class PageClassifier:
+    """
+    관계 유형별 키워드(keyword_sets)와 정규식(pattern_sets)을 하나의 컴파일된 정규식으로 묶은 분류기.
+    - classify(text): 한 번의 스캔으로 {관계 유형: 고유 지표 개수}
+    - search(text): 가장 앞에서 일치하는 (관계 유형, 지표) - 섹션 제목 판별용
+    각 지표는 고유 그룹(g0, g1, ...)으로 들어가며, 그룹 번호로 (관계 유형, 지표)를 찾습니다.
+    """
+    def __init__(self, keyword_sets=None, pattern_sets=None, flags=re.IGNORECASE):
+        self._labels = {} # 그룹명 -> (관계 유형, 지표 키워드/패턴)
+        alternatives = []
+        entries = [(rel_type, kw, _keyword_pattern(kw)) for rel_type, kws in (keyword_sets or {}).items() for kw in kws]
+        entries += [(rel_type, p, p) for rel_type, ps in (pattern_sets or {}).items() for p in ps]
+        # 같은 위치에서 시작하는 지표는 긴 것 우선
+        for i, (rel_type, label, pattern) in enumerate(sorted(entries, key=lambda e: -len(e[1]))):
+            group = f'g{i}'
+            self._labels[group] = (rel_type, label)
+            alternatives.append(f'(?P<{group}>{pattern})')
+        self.relation_types = list(dict.fromkeys([e[0] for e in entries]))
+        self._search_regex = re.compile('|'.join(alternatives) or r'(?!)', flags)
+        # 위치마다 한 번씩 시도하는 0폭 lookahead 버전: 서로 겹치는 지표도 모두 셈 ("주가수익률 비교")
+        self._scan_regex = re.compile(f'(?=(?:{self._search_regex.pattern}))', flags)
+
+    def matches(self, text):
+        """ {관계 유형: set(찾은 지표)} """
+        found = {rel_type: set() for rel_type in self.relation_types}
+        if not text: return found
+        for match in self._scan_regex.finditer(text):
+            rel_type, label = self._labels[match.lastgroup]
+            found[rel_type].add(label)
+        return found
+
+    def classify(self, text):
+        """ {관계 유형: 고유 지표 개수} (같은 지표의 중복 출현은 1회로 셈) """
+        return {rel_type: len(labels) for rel_type, labels in self.matches(text).items()}
+
+    def search(self, text):
+        """ 가장 앞에서 일치하는 지표의 (관계 유형, 지표). 없으면 None """
+        match = self._search_regex.search(text) if text else None
+        return self._labels[match.lastgroup] if match else None
@@ -1,12 +1,25 @@
 # core/pdf_processor.py
 
-import PyPDF2
+from __future__ import annotations # Document 타입 힌트는 langchain 로드 없이 문자열로 유지
+
 import re
 import os
-import logging
-from langchain.docstore.document import Document
-
-logger = logging.getLogger("KospiRAGPipeline")
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING
+# PyPDF2 와 langchain 은 처음 사용할 때 로드 (capabilities.require)
+try:
+    from .capabilities import require
+    from .config import logger
+    from .page_classifier import PageClassifier
+    from .profiler import stage
+except ImportError:
+    from capabilities import require
+    from config import logger
+    from page_classifier import PageClassifier
+    from profiler import stage
+
+if TYPE_CHECKING:
+    from langchain.docstore.document import Document
 
 # --- 핵심 키워드 정의 (사용자 지정 기준) ---
 # 이 키워드들의 존재 유무로 경쟁사 비교 페이지를 식별
@@ -20,105 +33,183 @@ COMPETITOR_PAGE_INDICATORS = [
     "Price",          # "Price & Fundamentals"
     "Fundamentals"    # "Price & Fundamentals"
 ]
+# 다른 관계 유형 페이지 지표 (소유구조, 공급망, 고객) - 필요 시 확장
+OWNERSHIP_PAGE_INDICATORS = ["최대주주", "주요주주", "지분율", "지분 현황", "Shareholders", "Ownership"]
+SUPPLY_CHAIN_PAGE_INDICATORS = ["공급망", "주요 공급사", "원재료", "매입처", "Supplier", "Supply Chain"]
+CUSTOMER_PAGE_INDICATORS = ["주요 고객", "고객사", "매출처", "Customer", "Client"]
+PAGE_INDICATOR_SETS = {
+    'competition': COMPETITOR_PAGE_INDICATORS,
+    'ownership': OWNERSHIP_PAGE_INDICATORS,
+    'supply': SUPPLY_CHAIN_PAGE_INDICATORS,
+    'customer': CUSTOMER_PAGE_INDICATORS,
+}
 # 페이지 내에 아래 개수 이상의 핵심 키워드가 포함되어야 함
 MIN_INDICATORS_THRESHOLD = 2 # 임계값 (조정 가능)
 
+# 모든 지표 세트를 한 번에 검사하는 공유 분류기 (영문 키워드는 단어 경계, 대소문자 무시)
+PAGE_CLASSIFIER = PageClassifier(keyword_sets=PAGE_INDICATOR_SETS)
+
+def classify_page(text):
+    """페이지 텍스트를 한 번 스캔하여 관계 유형별 고유 지표 개수 반환 ({'competition': 3, 'ownership': 0, ...})"""
+    return PAGE_CLASSIFIER.classify(text)
+
 def count_page_indicators(text):
-    """페이지 텍스트 내 경쟁사 페이지 핵심 키워드 개수 확인"""
-    count = 0
-    processed_text = text.lower() # 대소문자 무시
-    found_indicators = set() # 동일 키워드 중복 카운트 방지
-
-    # '&'를 포함하는 원본 키워드도 확인 (선택적)
-    # if "margin & growth" in processed_text: found_indicators.add("Margin & Growth")
-    # if "price & fundamentals" in processed_text: found_indicators.add("Price & Fundamentals")
-
-    # 분리된/단일 키워드 확인
-    for keyword in COMPETITOR_PAGE_INDICATORS:
-        # 단어 경계를 고려한 정규식 매칭이 더 정확할 수 있음
-        # 예: pattern = r'\b' + re.escape(keyword.lower()) + r'\b'
-        # if re.search(pattern, processed_text):
-        #     found_indicators.add(keyword)
-
-        # 단순 포함 여부 확인 (현재 방식)
-        if keyword.lower() in processed_text:
-            found_indicators.add(keyword)
-
-    # logger.debug(f"Found indicators: {found_indicators}") # 디버깅용
-    return len(found_indicators) # 고유하게 찾은 키워드 개수 반환
-
-# extract_text_from_pdf 함수 (이전과 동일)
+    """페이지 텍스트 내 경쟁사 페이지 핵심 키워드 개수 확인 (동일 키워드 중복 카운트 방지)"""
+    return classify_page(text)['competition']
+
+_WHITESPACE_REGEX = re.compile(r'\s+')
+MIN_PAGE_TEXT_LENGTH = 50 # 이보다 짧은 페이지는 분류하지 않음
+PDF_WORKERS = os.cpu_count() or 1
+PAGES_PER_TASK = 16 # 큰 PDF 는 페이지 묶음 단위로 나눠 여러 프로세스에 분배
+
+MAX_XOBJECT_DEPTH = 4 # Form XObject 중첩 검사 깊이 (넘으면 텍스트가 있다고 보고 전체 추출)
+# 텍스트 객체 시작 연산자 BT: 텍스트 표시 연산자(Tj, TJ, ', ")는 모두 BT ... ET 안에서만 쓰임
+# 앞뒤가 공백/구분자인 토큰만 연산자로 봄 (이름/문자열 안의 'BT' 는 대부분 제외, 오탐은 전체 추출로 처리될 뿐)
+_TEXT_OBJECT_REGEX = re.compile(rb'(?<![^\s\])>])BT(?![^\s/\[(<])')
+
+def _stream_has_text(resources, data, depth=0):
+    """ 콘텐츠 스트림(또는 Form XObject)과 그 안에서 그리는 Form XObject 를 재귀적으로 검사 """
+    if depth > MAX_XOBJECT_DEPTH: return True
+    resources = resources.get_object() if resources is not None else {}
+    if '/Font' in resources and _TEXT_OBJECT_REGEX.search(data): return True
+    xobjects = resources.get('/XObject')
+    if xobjects is None or b'Do' not in data: return False
+    for xobject in xobjects.get_object().values():
+        xobject = xobject.get_object()
+        if xobject.get('/Subtype') != '/Form': continue # 이미지 XObject 는 텍스트 없음
+        # 리소스가 없는 폼은 부모 리소스를 물려받음
+        if _stream_has_text(xobject.get('/Resources', resources), xobject.get_data(), depth + 1): return True
+    return False
+
+def _page_has_text(page):
+    """
+    1차 저비용 검사: 텍스트 추출 없이 폰트 리소스와 콘텐츠 스트림의 텍스트 객체(BT) 유무만 확인.
+    페이지가 그리는 Form XObject(리포트 템플릿/표를 폼으로 넣는 경우) 안의 텍스트도 재귀적으로 확인.
+    이미지/빈 페이지는 여기서 걸러져 extract_text 를 호출하지 않음.
+    """
+    try:
+        contents = page.get_contents()
+        if contents is None: return False
+        return _stream_has_text(page.get('/Resources'), contents.get_data())
+    except Exception:
+        return True # 판단 불가 시 전체 추출 대상으로 둠
+
+def iter_pdf_pages(pdf_path, page_numbers=None):
+    """
+    PDF 페이지 텍스트를 (페이지 번호(1부터), 텍스트) 로 하나씩 yield 하는 제너레이터.
+    page_numbers 를 주면 해당 페이지만, 텍스트가 없는 페이지는 1차 검사에서 건너뜀.
+    """
+    with open(pdf_path, 'rb') as file:
+        reader = require('pypdf2').PdfReader(file)
+        num_pages = len(reader.pages)
+        for page_num in (page_numbers or range(1, num_pages + 1)):
+            if not 1 <= page_num <= num_pages: continue
+            try:
+                page = reader.pages[page_num - 1]
+                if not _page_has_text(page): continue
+                text = page.extract_text()
+                if text:
+                    yield page_num, _WHITESPACE_REGEX.sub(' ', text).strip()
+            except Exception as page_e:
+                logger.warning(f"Could not extract text from page {page_num} of {pdf_path}: {page_e}")
+
+def count_pdf_pages(pdf_path):
+    with open(pdf_path, 'rb') as file:
+        return len(require('pypdf2').PdfReader(file).pages)
+
 def extract_text_from_pdf(pdf_path):
-    """PDF 파일에서 페이지별 텍스트 추출"""
-    pages_text = {}
+    """PDF 파일에서 페이지별 텍스트 추출 ({페이지 번호: 텍스트}, iter_pdf_pages 사용)"""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            num_pages = len(reader.pages)
-            for i in range(num_pages):
-                try:
-                    page = reader.pages[i]
-                    text = page.extract_text()
-                    if text:
-                        text = re.sub(r'\s+', ' ', text).strip()
-                        pages_text[i + 1] = text
-                except Exception as page_e:
-                    logger.warning(f"Could not extract text from page {i+1} of {pdf_path}: {page_e}")
+        return dict(iter_pdf_pages(pdf_path))
     except FileNotFoundError:
         logger.error(f"PDF file not found: {pdf_path}")
         return None
     except Exception as e:
         logger.error(f"Failed to read PDF file {pdf_path}: {e}")
         return None
-    return pages_text
+
+def find_competitor_pages(pdf_path, page_numbers=None):
+    """ 경쟁사 비교 페이지만 골라 [(페이지 번호, 텍스트, 키워드 수), ...] 반환 (프로세스 풀 작업 단위) """
+    matches = []
+    for page_num, page_text in iter_pdf_pages(pdf_path, page_numbers):
+        if len(page_text) < MIN_PAGE_TEXT_LENGTH: continue
+        indicator_count = classify_page(page_text)['competition']
+        if indicator_count >= MIN_INDICATORS_THRESHOLD:
+            matches.append((page_num, page_text, indicator_count))
+    return matches
+
+def _competitor_document(pdf_path, company_code, page_num, page_text):
+    metadata = {
+        'company_code': company_code,
+        'document_type': 'FnGuide_PDF (Competition Page)', # 문서 타입 명시
+        'potential_relation_type': 'competition', # 'competition' 태그 추가
+        'section': f'Competitor Metrics Page {page_num}', # 페이지 정보
+        'source': pdf_path,
+        'report_date': 'unknown' # TODO: 날짜 추출
+    }
+    # 페이지 전체 내용을 content로 사용
+    return require('langchain').Document(page_content=page_text, metadata=metadata)
 
 def process_fnguide_pdf(pdf_path: str, company_code: str) -> list[Document]:
     """
     FnGuide PDF 처리 (사용자 지정 핵심 키워드 기반 필터링).
     핵심 키워드가 MIN_INDICATORS_THRESHOLD 개수 이상 포함된 페이지만 경쟁 컨텍스트로 처리.
+    페이지는 iter_pdf_pages 로 하나씩 처리하므로 전체 페이지 dict 를 만들지 않음.
     """
     docs = []
     if not os.path.exists(pdf_path):
         logger.error(f"FnGuide PDF not found: {pdf_path}")
         return docs
 
-    pages_content = extract_text_from_pdf(pdf_path)
-    if not pages_content:
+    try:
+        with stage('pdf_extract', company=company_code, bytes=os.path.getsize(pdf_path)):
+            matches = find_competitor_pages(pdf_path)
+    except Exception as e:
+        logger.error(f"Failed to read PDF file {pdf_path}: {e}")
         return docs
 
-    logger.info(f"Processing FnGuide PDF for {company_code} ({len(pages_content)} pages): {pdf_path}")
-
-    processed_page_nums = set() # 중복 처리 방지용
-
-    for page_num, page_text in pages_content.items():
-        if page_num in processed_page_nums or not page_text or len(page_text) < 50:
-            continue
-
-        # --- 경쟁 관계 페이지 식별 (사용자 지정 키워드 기준) ---
-        indicator_count = count_page_indicators(page_text)
-
-        # 핵심 지표 키워드가 임계값 이상 포함된 경우
-        if indicator_count >= MIN_INDICATORS_THRESHOLD:
-            logger.info(f"Page {page_num} identified as Competitor Page for {company_code} (Indicators found: {indicator_count})")
-            metadata = {
-                'company_code': company_code,
-                'document_type': 'FnGuide_PDF (Competition Page)', # 문서 타입 명시
-                'potential_relation_type': 'competition', # 'competition' 태그 추가
-                'section': f'Competitor Metrics Page {page_num}', # 페이지 정보
-                'source': pdf_path,
-                'report_date': 'unknown' # TODO: 날짜 추출
-            }
-            # 페이지 전체 내용을 content로 사용
-            docs.append(Document(page_content=page_text, metadata=metadata))
-            processed_page_nums.add(page_num) # 처리된 페이지로 기록
-            continue # 다음 페이지로
-
-        # --- (선택적) 다른 정보 추출 로직 ---
-        # ... (예: 소유구조, 요약 등)
+    logger.info(f"Processing FnGuide PDF for {company_code}: {pdf_path}")
+    for page_num, page_text, indicator_count in matches:
+        logger.info(f"Page {page_num} identified as Competitor Page for {company_code} (Indicators found: {indicator_count})")
+        docs.append(_competitor_document(pdf_path, company_code, page_num, page_text))
 
     if not docs:
          logger.warning(f"No pages meeting the competitor criteria found in FnGuide PDF for {company_code}.")
     else:
         logger.info(f"Finished processing FnGuide PDF for {company_code}. Generated {len(docs)} competition documents.")
 
-    return docs
\ No newline at end of file
+    return docs
+
+def iter_process_fnguide_pdfs(jobs, max_workers=PDF_WORKERS, pages_per_task=PAGES_PER_TASK):
+    """
+    여러 FnGuide PDF 를 프로세스 풀로 처리. jobs: [(pdf_path, company_code), ...]
+    각 PDF 를 pages_per_task 페이지 묶음으로 나눠 분배하고, 묶음이 끝날 때마다
+    (company_code, pdf_path, [Document, ...], 처리 페이지 수) 를 yield.
+    """
+    tasks = []
+    for pdf_path, company_code in jobs:
+        try:
+            num_pages = count_pdf_pages(pdf_path)
+        except Exception as e:
+            logger.error(f"Failed to read PDF file {pdf_path}: {e}")
+            continue
+        for start in range(1, num_pages + 1, pages_per_task):
+            tasks.append((pdf_path, company_code, range(start, min(start + pages_per_task, num_pages + 1))))
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(find_competitor_pages, pdf_path, pages): (pdf_path, company_code, pages)
+                   for pdf_path, company_code, pages in tasks}
+        for future in as_completed(futures):
+            pdf_path, company_code, pages = futures[future]
+            try:
+                matches = future.result()
+            except Exception as e:
+                logger.error(f"FnGuide PDF 처리 실패 ({pdf_path}, pages {pages.start}-{pages.stop - 1}): {e}")
+                matches = []
+            docs = [_competitor_document(pdf_path, company_code, page_num, page_text)
+                    for page_num, page_text, _count in matches]
+            yield company_code, pdf_path, docs, len(pages)
+    finally:
+        # 소비자가 중간에 멈추면 남은 페이지 묶음은 취소하고 기다리지 않음
+        executor.shutdown(wait=False, cancel_futures=True)
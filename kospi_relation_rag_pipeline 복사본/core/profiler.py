@@ -0,0 +1,261 @@
+# core/profiler.py
+# 파이프라인 단계별 계측: 검색/다운로드/압축해제/디코딩/파싱/PDF 추출/임베딩/행렬 생성 시간을 기록하고
+# 실행 종료 시 단계별·기업별 지연 시간/바이트/섹션 수 히스토그램을 JSON-lines 리포트로 남김
+# - 비활성화(기본) 상태에서는 stage() 가 공용 no-op 객체를 반환하므로 오버헤드는 속성 조회 1회 수준
+# - 선택적으로 cProfile 또는 tracemalloc 을 실행 전체에 걸 수 있음 (start_profile / stop_profile)
+# - 프로세스 풀 워커 안의 기록은 부모로 전달되지 않으므로, 워커 결과의 elapsed 는 부모에서 record() 로 기록
+#
+# 사용 예:
+#   PROFILER.enable()
+#   with stage('download', company='005930') as rec:
+#       path = download(...)
+#       rec.add(bytes=os.path.getsize(path))
+#   (예외를 블록 안에서 처리하고 실패 값을 반환할 때는 rec.fail() 로 오류 집계)
+#   PROFILER.write_report('logs/pipeline_profile.jsonl')
+
+import bisect
+import datetime
+import functools
+import io
+import json
+import os
+import threading
+import time
+
+try:
+    from .config import logger, PROFILING_ENABLED, PROFILE_MODE
+except ImportError:
+    from config import logger, PROFILING_ENABLED, PROFILE_MODE
+
+# 지연 시간 히스토그램 구간 상한(초). 마지막 구간은 60초 초과
+LATENCY_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PROFILE_MODES = ('cprofile', 'tracemalloc')
+PROFILE_TOP_N = 30 # 리포트에 남길 cProfile 함수 / tracemalloc 할당 위치 수
+
+
+class _NullRecord:
+    """ 비활성 상태에서 stage() 가 반환하는 no-op 컨텍스트 """
+    __slots__ = ()
+
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def add(self, **counters): pass
+    def fail(self): pass
+
+
+_NULL_RECORD = _NullRecord()
+
+
+class StageRecord:
+    """ 한 번의 단계 실행 기록. with 블록 안에서 add(bytes=..., sections=...) 로 수치 누적 """
+    __slots__ = ('profiler', 'stage', 'company', 'counters', 'start', 'elapsed', 'ok')
+
+    def __init__(self, profiler, stage, company, counters):
+        self.profiler, self.stage, self.company = profiler, stage, company
+        self.counters = dict(counters)
+        self.start, self.elapsed, self.ok = None, 0.0, True
+
+    def add(self, **counters):
+        for key, value in counters.items():
+            self.counters[key] = self.counters.get(key, 0) + (value or 0)
+
+    def fail(self):
+        """ 예외를 안에서 처리하고 빈 결과를 반환하는 단계도 오류로 집계 """
+        self.ok = False
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self.start
+        self.ok = self.ok and exc_type is None
+        self.profiler._append(self)
+        return False
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values: return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def _summarize(records):
+    """ 기록 리스트 -> 지연 시간 통계/히스토그램 + 카운터 합계 """
+    latencies = sorted(r.elapsed for r in records)
+    histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+    for value in latencies: histogram[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+    counters = {}
+    for r in records:
+        for key, value in r.counters.items(): counters[key] = counters.get(key, 0) + value
+    total = sum(latencies)
+    return {
+        'count': len(latencies),
+        'errors': sum(1 for r in records if not r.ok),
+        'total_s': round(total, 6),
+        'mean_s': round(total / len(latencies), 6) if latencies else 0.0,
+        'p50_s': round(_percentile(latencies, 0.50), 6),
+        'p90_s': round(_percentile(latencies, 0.90), 6),
+        'p99_s': round(_percentile(latencies, 0.99), 6),
+        'max_s': round(latencies[-1], 6) if latencies else 0.0,
+        'histogram': {'le': list(LATENCY_BUCKETS) + ['inf'], 'counts': histogram},
+        **counters,
+    }
+
+
+class PipelineProfiler:
+    """ 단계 실행 기록 수집기. 여러 스레드에서 공유 가능 """
+    def __init__(self, enabled=PROFILING_ENABLED, profile_mode=PROFILE_MODE):
+        self.enabled = enabled
+        self.profile_mode = profile_mode
+        self._lock = threading.Lock()
+        self._records = []
+        self._profiler = None
+        self._profile_stats = None
+        self._started_at = time.time()
+
+    def enable(self, profile_mode=None):
+        self.enabled = True
+        if profile_mode: self.profile_mode = profile_mode
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._records = []
+            self._profile_stats = None
+            self._started_at = time.time()
+
+    # --- 기록 ---
+    def stage(self, name, company=None, **counters):
+        """ 단계 타이머 컨텍스트. 비활성 상태면 no-op 객체 반환 """
+        if not self.enabled: return _NULL_RECORD
+        return StageRecord(self, name, company, counters)
+
+    def timed(self, name, company_arg=None):
+        """
+        함수 전체를 단계로 기록하는 데코레이터.
+        company_arg: 기업 식별자로 쓸 인자. 정수면 위치 인자 인덱스, 문자열이면 키워드 인자 이름 (키워드로 전달된 경우만 조회)
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled: return func(*args, **kwargs)
+                company = None
+                if isinstance(company_arg, int): company = args[company_arg] if len(args) > company_arg else None
+                elif company_arg: company = kwargs.get(company_arg)
+                with StageRecord(self, name, company, {}):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record(self, name, elapsed, company=None, ok=True, **counters):
+        """ 다른 곳(프로세스 풀 워커 등)에서 측정한 실행 시간을 직접 기록 """
+        if not self.enabled: return
+        rec = StageRecord(self, name, company, counters)
+        rec.elapsed, rec.ok = float(elapsed or 0.0), ok
+        self._append(rec)
+
+    def _append(self, rec):
+        with self._lock:
+            self._records.append(rec)
+
+    # --- cProfile / tracemalloc ---
+    def start_profile(self, mode=None):
+        """ 실행 전체 프로파일링 시작 (mode: 'cprofile' | 'tracemalloc', 없으면 profile_mode) """
+        mode = mode or self.profile_mode
+        if not self.enabled or not mode: return
+        if mode not in PROFILE_MODES: raise ValueError(f"unknown profile mode: {mode}")
+        if mode == 'cprofile':
+            import cProfile
+            self._profiler = ('cprofile', cProfile.Profile())
+            self._profiler[1].enable()
+        else:
+            import tracemalloc
+            tracemalloc.start(25)
+            self._profiler = ('tracemalloc', None)
+        logger.info(f"프로파일링 시작: {mode}")
+
+    def stop_profile(self, top_n=PROFILE_TOP_N):
+        """ 프로파일링 종료 후 상위 항목 요약 반환 (리포트에도 포함) """
+        if self._profiler is None: return None
+        mode, profiler = self._profiler
+        self._profiler = None
+        if mode == 'cprofile':
+            import pstats
+            profiler.disable()
+            stats = pstats.Stats(profiler, stream=io.StringIO())
+            entries = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top_n]
+            top = [{'function': f"{path}:{line}({func})", 'calls': nc, 'tottime_s': round(tt, 6), 'cumtime_s': round(ct, 6)}
+                   for (path, line, func), (_cc, nc, tt, ct, _callers) in entries]
+        else:
+            import tracemalloc
+            snapshot = tracemalloc.take_snapshot()
+            _current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            top = [{'location': str(stat.traceback[0]), 'size_bytes': stat.size, 'count': stat.count}
+                   for stat in snapshot.statistics('lineno')[:top_n]]
+            top.insert(0, {'peak_bytes': peak})
+        self._profile_stats = {'mode': mode, 'top': top}
+        return self._profile_stats
+
+    # --- 요약 / 리포트 ---
+    def _snapshot(self):
+        with self._lock:
+            return list(self._records)
+
+    def summary(self):
+        """ {단계: 통계} """
+        by_stage = {}
+        for rec in self._snapshot(): by_stage.setdefault(rec.stage, []).append(rec)
+        return {name: _summarize(records) for name, records in by_stage.items()}
+
+    def company_summary(self):
+        """ {(기업, 단계): 통계} (기업 정보가 있는 기록만) """
+        by_key = {}
+        for rec in self._snapshot():
+            if rec.company is not None: by_key.setdefault((str(rec.company), rec.stage), []).append(rec)
+        return {key: _summarize(records) for key, records in by_key.items()}
+
+    def iter_report_lines(self):
+        """ JSON-lines 리포트의 각 레코드 dict (run -> stage -> company_stage -> profile 순서) """
+        stage_stats = self.summary()
+        yield {
+            'type': 'run',
+            'started_at': datetime.datetime.fromtimestamp(self._started_at, datetime.timezone.utc).isoformat(timespec='seconds'),
+            'wall_s': round(time.time() - self._started_at, 3),
+            'records': sum(s['count'] for s in stage_stats.values()),
+        }
+        for name, stats in sorted(stage_stats.items(), key=lambda item: -item[1]['total_s']):
+            yield dict({'type': 'stage', 'stage': name}, **stats)
+        for (company, name), stats in sorted(self.company_summary().items()):
+            yield dict({'type': 'company_stage', 'company': company, 'stage': name}, **stats)
+        if self._profile_stats: yield dict({'type': 'profile'}, **self._profile_stats)
+
+    def write_report(self, path):
+        """ 실행 종료 시 JSON-lines 리포트 저장 후 단계별 합계를 로그로 남김. 비활성 상태면 아무것도 하지 않음 """
+        if not self.enabled: return None
+        if self._profiler is not None: self.stop_profile()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            for line in self.iter_report_lines():
+                f.write(json.dumps(line, ensure_ascii=False) + '\n')
+        for name, stats in sorted(self.summary().items(), key=lambda item: -item[1]['total_s']):
+            logger.info(f"[profile] {name}: {stats['count']}회, 합계 {stats['total_s']:.2f}s, "
+                        f"p50 {stats['p50_s']:.3f}s, p99 {stats['p99_s']:.3f}s, 오류 {stats['errors']}")
+        logger.info(f"프로파일 리포트 저장: {path}")
+        return path
+
+
+# 파이프라인 전역 프로파일러 (노트북에서 PROFILER.enable() 로 켬)
+PROFILER = PipelineProfiler()
+
+
+def stage(name, company=None, **counters):
+    """ 전역 프로파일러의 단계 타이머 컨텍스트 """
+    return PROFILER.stage(name, company, **counters)
+
+
+def timed(name, company_arg=None):
+    """ 전역 프로파일러로 함수 실행 시간을 기록하는 데코레이터 (래퍼는 한 번만 만들고, 비활성 여부는 호출 시점에 확인) """
+    return PROFILER.timed(name, company_arg)
@@ -0,0 +1,339 @@
+# core/relation_extractor.py
+# 섹션 -> 로컬 LLM 관계 추출 단계 (스트리밍 큐 + 길이 버킷 배치 + 결과 캐시)
+# - 입력: extract_sections_streaming 의 섹션 dict / iter_section_chunks 의 청크 dict (큐 또는 이터러블)
+# - 섹션을 근사 토큰 길이 버킷(LLM_BUCKET_TOKENS 폭)에 모아 버킷이 LLM_BATCH_SIZE 가 차면 한 번에 생성 (패딩 낭비 감소)
+# - 결과 캐시(SQLite): (모델, 프롬프트 템플릿 해시, 섹션 내용 해시) -> 검증된 관계 JSON. 재실행/변경 없는 공시는 모델 호출 없음
+#   같은 실행 안에서 같은 키의 섹션(계열회사 상용구 등)은 한 번만 생성
+# - mention_index(mention_index.MentionIndex)를 주면 주체 기업 외 다른 기업이 언급되지 않은 섹션은 모델에 보내지 않음
+# - 모델 출력은 JSON 파싱 + 관계 유형/강도 검증 후 build_adjacency_matrix 입력 형식 레코드로 yield
+#   extract_into() 는 레코드를 RelationGraphBuilder / EvidenceStore 에 바로 누적
+# - generate_fn(list[str] -> list[str]) 을 주입하면 모델 없이(CPU 스텁) 동작
+
+import hashlib
+import json
+import math
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+try:
+    from .capabilities import require
+    from .config import (logger, LLM_MODEL_NAME, LLM_BATCH_SIZE, LLM_MAX_NEW_TOKENS, LLM_BUCKET_TOKENS,
+                         LLM_QUEUE_MAXSIZE)
+    from .matrix_builder import RELATION_TYPE_ALIASES, normalize_relation_type, parse_strength
+    from .profiler import stage
+    from .section_chunker import approx_token_count
+except ImportError:
+    from capabilities import require
+    from config import (logger, LLM_MODEL_NAME, LLM_BATCH_SIZE, LLM_MAX_NEW_TOKENS, LLM_BUCKET_TOKENS,
+                        LLM_QUEUE_MAXSIZE)
+    from matrix_builder import RELATION_TYPE_ALIASES, normalize_relation_type, parse_strength
+    from profiler import stage
+    from section_chunker import approx_token_count
+
+DB_FILE = 'relations.sqlite3'
+KNOWN_RELATION_TYPES = frozenset(RELATION_TYPE_ALIASES.values())
+MAX_PENDING_BATCHES = 4 # 버킷 전체 대기 섹션이 batch_size * 이 값을 넘으면 가장 큰 버킷부터 생성
+END_OF_QUEUE = None # 큐 종료 표시
+
+RELATION_PROMPT_TEMPLATE = """다음은 {company_name}({company_code})의 공시 보고서 '{section}' 부분입니다.
+본문에서 {company_name}와(과) 다른 기업 사이의 관계(competition, ownership, supply, customer, affiliate)를 찾아
+JSON 배열로만 답하세요. 관계가 없으면 [] 로 답하세요.
+형식: [{{"company_b": "상대 기업명", "relationships": [{{"type": "관계 유형", "strength": "high|medium|low", "evidence": ["근거 문장"]}}]}}]
+
+본문:
+{content}
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS extraction_cache (model TEXT NOT NULL, template_hash TEXT NOT NULL, content_hash TEXT NOT NULL,
+                                             relations TEXT NOT NULL,
+                                             PRIMARY KEY (model, template_hash, content_hash));
+"""
+
+
+def _sha256(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def _prompt_fields(section, extra_metadata=None):
+    """ 템플릿에 들어가는 값 (섹션 dict 에 없으면 extra_metadata 에서) """
+    merged = dict(extra_metadata or {}, **section)
+    code = str(merged.get('company_code') or '')
+    return {
+        'company_code': code,
+        'company_name': merged.get('company_name') or code,
+        'section': merged.get('original_section') or '',
+        'content': merged.get('content') or '',
+    }
+
+
+def section_hash(fields):
+    """ 섹션 내용 해시: 템플릿에 들어가는 값 전체 (같은 문구라도 주체 기업이 다르면 결과가 다름) """
+    return _sha256(json.dumps(fields, ensure_ascii=False, sort_keys=True))
+
+
+def parse_llm_output(text):
+    """
+    모델 출력에서 첫 JSON 배열/객체를 찾아 관계 후보 리스트로 반환 (앞뒤 설명문, ```json 블록 허용).
+    {'relationships': [...]} 처럼 company_b 없이 감싼 객체는 그 리스트로. 찾지 못하면 None
+    """
+    decoder = json.JSONDecoder()
+    for i, ch in enumerate(text or ''):
+        if ch not in '[{': continue
+        try:
+            payload, _end = decoder.raw_decode(text, i)
+        except ValueError:
+            continue
+        if isinstance(payload, dict):
+            payload = payload if 'company_b' in payload else payload.get('relations', payload.get('relationships'))
+            payload = [payload] if isinstance(payload, dict) else payload
+        if isinstance(payload, list): return payload
+    return None
+
+
+def validate_relations(payload):
+    """
+    관계 후보 검증: company_b 문자열, 알려진 관계 유형(RELATION_TYPE_ALIASES), 유한한 강도만 남김.
+    반환: (검증된 [{'company_b', 'relationships': [{'type', 'strength', 'evidence'}]}], 버린 관계 수)
+    """
+    valid, rejected = [], 0
+    for item in payload or []:
+        if not isinstance(item, dict):
+            rejected += 1
+            continue
+        company_b = item.get('company_b') or item.get('company')
+        rels = item.get('relationships')
+        if not isinstance(rels, list): rels = [item] if item.get('type') else []
+        if not isinstance(company_b, str) or not company_b.strip():
+            rejected += max(1, len(rels))
+            continue
+        kept = []
+        for rel in rels:
+            rel_type = normalize_relation_type(rel.get('type')) if isinstance(rel, dict) else None
+            strength = parse_strength(rel.get('strength')) if rel_type else None
+            if rel_type not in KNOWN_RELATION_TYPES or not math.isfinite(strength):
+                rejected += 1
+                continue
+            evidence = rel.get('evidence') or []
+            evidence = [evidence] if isinstance(evidence, str) else [str(e) for e in evidence if e]
+            kept.append({'type': rel_type, 'strength': strength, 'evidence': evidence})
+        if kept: valid.append({'company_b': company_b.strip(), 'relationships': kept})
+    return valid, rejected
+
+
+def hf_generator(model_name=LLM_MODEL_NAME, max_new_tokens=LLM_MAX_NEW_TOKENS):
+    """ transformers 로컬 모델로 프롬프트 리스트를 생성 결과 리스트로 바꾸는 함수 반환 (greedy, 왼쪽 패딩 배치) """
+    transformers = require('transformers') # 추출 단계에서만 로드
+    tokenizer = transformers.AutoTokenizer.from_pretrained(model_name, padding_side='left')
+    if tokenizer.pad_token is None: tokenizer.pad_token = tokenizer.eos_token
+    model = transformers.AutoModelForCausalLM.from_pretrained(model_name, torch_dtype='auto', device_map='auto')
+    model.eval()
+
+    def generate(prompts):
+        if tokenizer.chat_template:
+            prompts = [tokenizer.apply_chat_template([{'role': 'user', 'content': p}], tokenize=False,
+                                                     add_generation_prompt=True) for p in prompts]
+        inputs = tokenizer(prompts, return_tensors='pt', padding=True).to(model.device)
+        outputs = model.generate(**inputs, max_new_tokens=max_new_tokens, do_sample=False,
+                                 pad_token_id=tokenizer.pad_token_id)
+        return tokenizer.batch_decode(outputs[:, inputs['input_ids'].shape[1]:], skip_special_tokens=True)
+    return generate
+
+
+class RelationExtractor:
+    """
+    섹션 큐 -> 길이 버킷 배치 -> LLM -> 검증 -> 관계 레코드 스트림.
+    generate_fn: list[str] -> list[str]. 없으면 model_name 의 transformers 모델을 처음 생성할 때 로드.
+    mention_index: 주면 다른 기업 언급이 없는 섹션은 건너뜀 (관계 후보가 없으므로)
+    """
+    def __init__(self, cache_dir, model_name=LLM_MODEL_NAME, generate_fn=None, template=RELATION_PROMPT_TEMPLATE,
+                 batch_size=LLM_BATCH_SIZE, bucket_tokens=LLM_BUCKET_TOKENS, token_counter=approx_token_count,
+                 mention_index=None):
+        if batch_size < 1 or bucket_tokens < 1: raise ValueError("batch_size and bucket_tokens must be positive")
+        os.makedirs(cache_dir, exist_ok=True)
+        self.model_name = model_name
+        self.template = template
+        self.template_hash = _sha256(template)
+        self.batch_size = batch_size
+        self.bucket_tokens = bucket_tokens
+        self.token_counter = token_counter
+        self.mention_index = mention_index
+        self._generate_fn = generate_fn
+        self._db = sqlite3.connect(os.path.join(cache_dir, DB_FILE), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self.stats = self._new_stats()
+
+    @staticmethod
+    def _new_stats():
+        return {key: 0 for key in ('sections', 'no_mentions', 'cache_hits', 'deduplicated', 'generated', 'batches',
+                                   'invalid_outputs', 'rejected', 'records', 'padding_tokens')}
+
+    @property
+    def generate_fn(self):
+        if self._generate_fn is None: self._generate_fn = hf_generator(self.model_name)
+        return self._generate_fn
+
+    def close(self):
+        self._db.close()
+
+    # --- 결과 캐시 ---
+    def _cached(self, key):
+        row = self._db.execute("SELECT relations FROM extraction_cache WHERE model = ? AND template_hash = ? "
+                               "AND content_hash = ?", (self.model_name, self.template_hash, key)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _store(self, items):
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO extraction_cache (model, template_hash, content_hash, relations) "
+                                 "VALUES (?, ?, ?, ?)",
+                                 [(self.model_name, self.template_hash, key, json.dumps(relations, ensure_ascii=False))
+                                  for key, relations in items])
+
+    # --- 레코드 ---
+    @staticmethod
+    def _records(relations, section, extra_metadata):
+        """ 검증된 관계 -> build_adjacency_matrix 입력 레코드 (주체 기업 = 섹션 기업, rcept_no/period 전달) """
+        merged = dict(extra_metadata or {}, **section)
+        base = {'company_a': merged.get('company_code'), 'rcept_no': merged.get('rcept_no'),
+                'section': merged.get('original_section')}
+        if merged.get('period'): base['period'] = merged['period']
+        return [dict(base, **item) for item in relations]
+
+    # --- 배치 생성 ---
+    def _run_batch(self, batch):
+        """ batch: [(key, fields, tokens, [(section, extra), ...]), ...] -> [(key, 관계 리스트 또는 None, 대기 섹션)] """
+        batch.sort(key=lambda item: item[2])
+        prompts = [self.template.format(**fields) for _key, fields, _tokens, _waiting in batch]
+        longest = batch[-1][2]
+        self.stats['padding_tokens'] += sum(longest - tokens for _k, _f, tokens, _w in batch)
+        with stage('llm_extract', sections=len(batch), bytes=sum(len(p.encode('utf-8')) for p in prompts)):
+            outputs = self.generate_fn(prompts)
+        if len(outputs) != len(prompts):
+            raise ValueError(f"generate_fn returned {len(outputs)} outputs for {len(prompts)} prompts")
+        self.stats['batches'] += 1
+        self.stats['generated'] += len(prompts)
+        results, to_cache = [], []
+        for (key, _fields, _tokens, waiting), output in zip(batch, outputs):
+            payload = parse_llm_output(output)
+            if payload is None:
+                self.stats['invalid_outputs'] += 1 # 캐시하지 않음 (다음 실행에서 다시 시도)
+                results.append((key, None, waiting))
+                continue
+            relations, rejected = validate_relations(payload)
+            self.stats['rejected'] += rejected
+            to_cache.append((key, relations))
+            results.append((key, relations, waiting))
+        if to_cache: self._store(to_cache)
+        return results
+
+    def extract_from_queue(self, section_queue, extra_metadata=None):
+        """
+        큐에서 섹션 dict 를 END_OF_QUEUE(None) 가 나올 때까지 꺼내 관계 레코드를 yield.
+        캐시 적중 섹션은 바로, 나머지는 길이 버킷이 batch_size 만큼 차거나 큐가 끝날 때 배치 생성 후 yield.
+        """
+        buckets = {} # 버킷 번호 -> [(key, fields, tokens, waiting), ...]
+        pending = {} # key -> waiting 리스트 (같은 실행 안 중복 섹션 공유)
+        pending_count = 0
+
+        def flush(bucket_id):
+            nonlocal pending_count
+            batch = buckets.pop(bucket_id)
+            pending_count -= len(batch)
+            for key, relations, waiting in self._run_batch(batch):
+                del pending[key]
+                if relations is None: continue
+                for section, extra in waiting:
+                    yield from self._emit(relations, section, extra)
+
+        while True:
+            section = section_queue.get()
+            if section is END_OF_QUEUE: break
+            self.stats['sections'] += 1
+            fields = _prompt_fields(section, extra_metadata)
+            if not fields['content'].strip(): continue
+            if self.mention_index is not None and not (self.mention_index.mentioned_codes(fields['content'])
+                                                       - {fields['company_code'].zfill(6)}):
+                self.stats['no_mentions'] += 1
+                continue
+            key = section_hash(fields)
+            if key in pending:
+                self.stats['deduplicated'] += 1
+                pending[key].append((section, extra_metadata))
+                continue
+            relations = self._cached(key)
+            if relations is not None:
+                self.stats['cache_hits'] += 1
+                yield from self._emit(relations, section, extra_metadata)
+                continue
+            tokens = self.token_counter(self.template.format(**fields))
+            bucket_id = tokens // self.bucket_tokens
+            pending[key] = [(section, extra_metadata)]
+            buckets.setdefault(bucket_id, []).append((key, fields, tokens, pending[key]))
+            pending_count += 1
+            if len(buckets[bucket_id]) >= self.batch_size:
+                yield from flush(bucket_id)
+            elif pending_count >= self.batch_size * MAX_PENDING_BATCHES: # 대기 상한: 가장 많이 찬 버킷부터
+                yield from flush(max(buckets, key=lambda b: len(buckets[b])))
+        for bucket_id in sorted(buckets):
+            yield from flush(bucket_id)
+
+    def _emit(self, relations, section, extra_metadata):
+        records = self._records(relations, section, extra_metadata)
+        self.stats['records'] += len(records)
+        return records
+
+    def iter_extract(self, sections, extra_metadata=None, queue_size=LLM_QUEUE_MAXSIZE):
+        """
+        섹션 이터러블(iter_parse_reports 결과의 섹션 등)을 별도 스레드가 큐에 채우고, 이 스레드에서 추출해 레코드 yield.
+        섹션 생성(파싱)과 모델 생성이 겹쳐 진행됨. extra_metadata: 모든 섹션에 붙일 기본값 (company_code, rcept_no, period 등)
+        """
+        section_queue = queue.Queue(maxsize=queue_size)
+        failure = []
+        stop = threading.Event()
+
+        def feed():
+            try:
+                for section in sections:
+                    while not stop.is_set():
+                        try:
+                            section_queue.put(section, timeout=0.1)
+                            break
+                        except queue.Full:
+                            continue
+                    if stop.is_set(): return
+            except Exception as e: # 생산자 예외는 소비자 쪽에서 다시 발생
+                failure.append(e)
+            finally:
+                section_queue.put(END_OF_QUEUE)
+
+        feeder = threading.Thread(target=feed, name='relation-extractor-feed', daemon=True)
+        feeder.start()
+        try:
+            yield from self.extract_from_queue(section_queue, extra_metadata)
+        finally:
+            stop.set()
+            if feeder.is_alive(): # 소비를 중단한 경우 생산자가 막혀 있지 않도록 큐를 비움
+                while feeder.is_alive():
+                    try: section_queue.get(timeout=0.1)
+                    except queue.Empty: pass
+            feeder.join()
+        if failure: raise failure[0]
+
+    def extract_into(self, builder, sections, extra_metadata=None):
+        """
+        추출 레코드를 builder(RelationGraphBuilder 또는 EvidenceStore)의 add_relationships 로 바로 누적.
+        반환: 이번 호출의 통계 {'sections', 'cache_hits', 'generated', 'batches', 'records', 'edges', 'seconds', ...}
+        """
+        self.stats = self._new_stats()
+        start = time.perf_counter()
+        edges = 0
+        for record in self.iter_extract(sections, extra_metadata):
+            edges += builder.add_relationships(record)
+        stats = dict(self.stats, edges=edges, seconds=time.perf_counter() - start)
+        logger.info(f"관계 추출 완료: 섹션 {stats['sections']}개 (언급 없음 {stats['no_mentions']}, 캐시 {stats['cache_hits']}, 중복 {stats['deduplicated']}, "
+                    f"모델 생성 {stats['generated']}건/{stats['batches']}배치, 출력 오류 {stats['invalid_outputs']}) "
+                    f"-> 레코드 {stats['records']}개, 간선 {edges}개 ({stats['seconds']:.1f}s)")
+        return stats
@@ -0,0 +1,197 @@
+# core/report_cache.py
+# DART 보고서 영구 캐시 (content-addressed)
+# - ZIP 원본과 파싱된 섹션 리스트는 SHA-256 해시 이름의 파일로 저장 (objects/ab/abcdef...)
+# - rcept_no -> ZIP 해시, (ZIP 해시, 추출기 버전) -> 섹션 해시 매핑은 SQLite 인덱스에 기록
+# - find_latest_annual_report 검색 결과는 TTL 동안 재사용
+# - 전체 크기가 max_bytes 를 넘으면 마지막 접근 시각 기준 LRU 삭제
+# - stats() 로 hit/miss 카운터 확인
+
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+
+try:
+    from .config import logger, REPORT_CACHE_MAX_BYTES, SEARCH_CACHE_TTL_SECONDS
+except ImportError:
+    from config import logger, REPORT_CACHE_MAX_BYTES, SEARCH_CACHE_TTL_SECONDS
+
+# 섹션 추출 로직이 바뀌면 버전을 올려 기존 섹션 캐시를 무효화
+DEFAULT_EXTRACTOR_VERSION = "streaming-v1"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (sha TEXT PRIMARY KEY, size INTEGER NOT NULL, last_access REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS reports (rcept_no TEXT PRIMARY KEY, zip_sha TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS sections (zip_sha TEXT NOT NULL, extractor TEXT NOT NULL, sections_sha TEXT NOT NULL,
+                                     PRIMARY KEY (zip_sha, extractor));
+CREATE TABLE IF NOT EXISTS searches (key TEXT PRIMARY KEY, payload TEXT NOT NULL, expires_at REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS idx_objects_last_access ON objects (last_access);
+"""
+
+
+def _sha256_file(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """ rcept_no 기준 DART 보고서 캐시. 여러 스레드에서 공유 가능 """
+    def __init__(self, cache_dir, max_bytes=REPORT_CACHE_MAX_BYTES, search_ttl_seconds=SEARCH_CACHE_TTL_SECONDS):
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.staging_dir = os.path.join(cache_dir, 'staging')
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.staging_dir, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.search_ttl_seconds = search_ttl_seconds
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite3'), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._counters = {key: 0 for key in (
+            'search_hits', 'search_misses', 'zip_hits', 'zip_misses',
+            'sections_hits', 'sections_misses', 'evictions')}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def stats(self):
+        """ hit/miss 카운터와 현재 캐시 크기 반환 """
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0), COUNT(*) FROM objects").fetchone()
+            return dict(self._counters, total_bytes=total[0], objects=total[1])
+
+    # --- 내부 헬퍼 ---
+    def _object_path(self, sha):
+        return os.path.join(self.objects_dir, sha[:2], sha)
+
+    def _touch(self, sha):
+        self._db.execute("UPDATE objects SET last_access = ? WHERE sha = ?", (time.time(), sha))
+
+    def _lookup_object(self, sha):
+        """ 인덱스에 있고 파일도 존재하면 경로 반환 (파일이 사라졌으면 인덱스 정리) """
+        path = self._object_path(sha)
+        if os.path.exists(path):
+            self._touch(sha)
+            return path
+        self._db.execute("DELETE FROM objects WHERE sha = ?", (sha,))
+        return None
+
+    def _store_file(self, src_path, move):
+        sha = _sha256_file(src_path)
+        dest = self._object_path(sha)
+        if not os.path.exists(dest):
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            if move: os.replace(src_path, dest)
+            else: shutil.copyfile(src_path, dest)
+        elif move:
+            os.remove(src_path)
+        self._db.execute("INSERT OR REPLACE INTO objects (sha, size, last_access) VALUES (?, ?, ?)",
+                         (sha, os.path.getsize(dest), time.time()))
+        return sha, dest
+
+    def _store_bytes(self, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.staging_dir)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        return self._store_file(tmp_path, move=True)
+
+    def _evict(self):
+        """ 전체 크기가 max_bytes 이하가 될 때까지 오래 안 쓴 객체부터 삭제 """
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        if total <= self.max_bytes: return
+        for sha, size in self._db.execute("SELECT sha, size FROM objects ORDER BY last_access").fetchall():
+            if total <= self.max_bytes: break
+            try: os.remove(self._object_path(sha))
+            except FileNotFoundError: pass
+            self._db.execute("DELETE FROM objects WHERE sha = ?", (sha,))
+            self._db.execute("DELETE FROM reports WHERE zip_sha = ?", (sha,))
+            self._db.execute("DELETE FROM sections WHERE zip_sha = ? OR sections_sha = ?", (sha, sha))
+            total -= size
+            self._counters['evictions'] += 1
+            logger.debug(f"Report cache evicted {sha[:12]} ({size} bytes)")
+
+    # --- 검색 결과 (TTL) ---
+    @staticmethod
+    def _search_key(corp_code, year, report_codes):
+        return f"{corp_code}|{year}|{','.join(sorted(report_codes or []))}"
+
+    def get_search(self, corp_code, year, report_codes):
+        """ 유효한 검색 결과(dict)가 있으면 반환, 없거나 만료되었으면 None """
+        with self._lock:
+            row = self._db.execute("SELECT payload, expires_at FROM searches WHERE key = ?",
+                                   (self._search_key(corp_code, year, report_codes),)).fetchone()
+            if row and row[1] > time.time():
+                self._counters['search_hits'] += 1
+                return json.loads(row[0])
+            self._counters['search_misses'] += 1
+            return None
+
+    def put_search(self, corp_code, year, report_codes, report):
+        if not report: return
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO searches (key, payload, expires_at) VALUES (?, ?, ?)",
+                             (self._search_key(corp_code, year, report_codes),
+                              json.dumps(report, ensure_ascii=False), time.time() + self.search_ttl_seconds))
+
+    # --- 보고서 ZIP ---
+    def get_zip_path(self, rcept_no):
+        """ 캐시된 ZIP 경로 반환 (없으면 None) """
+        with self._lock, self._db:
+            row = self._db.execute("SELECT zip_sha FROM reports WHERE rcept_no = ?", (rcept_no,)).fetchone()
+            path = self._lookup_object(row[0]) if row else None
+            self._counters['zip_hits' if path else 'zip_misses'] += 1
+            return path
+
+    def put_zip(self, rcept_no, zip_path, move=False):
+        """ 다운로드한 ZIP을 캐시에 저장하고 캐시 내 경로 반환 (move=True면 원본 파일을 옮김) """
+        with self._lock, self._db:
+            sha, dest = self._store_file(zip_path, move)
+            self._db.execute("INSERT OR REPLACE INTO reports (rcept_no, zip_sha) VALUES (?, ?)", (rcept_no, sha))
+            self._evict()
+            logger.debug(f"Report cache stored {rcept_no} -> {sha[:12]}")
+            return dest if os.path.exists(dest) else None
+
+    def zip_sha(self, rcept_no):
+        with self._lock:
+            row = self._db.execute("SELECT zip_sha FROM reports WHERE rcept_no = ?", (rcept_no,)).fetchone()
+            return row[0] if row else None
+
+    # --- 파싱된 섹션 리스트 ---
+    def get_sections(self, rcept_no, extractor=DEFAULT_EXTRACTOR_VERSION):
+        """ 같은 ZIP 내용에 대해 같은 추출기로 파싱한 섹션 리스트가 있으면 반환 """
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT s.sections_sha FROM reports r JOIN sections s ON s.zip_sha = r.zip_sha "
+                "WHERE r.rcept_no = ? AND s.extractor = ?", (rcept_no, extractor)).fetchone()
+            path = self._lookup_object(row[0]) if row else None
+            sections = None
+            if path:
+                # 다른 스레드의 _evict 가 파일을 지우지 못하도록 잠금 안에서 읽음 (다른 프로세스가 지웠으면 miss)
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        sections = json.load(f)
+                except FileNotFoundError:
+                    self._db.execute("DELETE FROM objects WHERE sha = ?", (row[0],))
+            self._counters['sections_hits' if sections is not None else 'sections_misses'] += 1
+            return sections
+
+    def put_sections(self, rcept_no, sections, extractor=DEFAULT_EXTRACTOR_VERSION):
+        """ 섹션 리스트 저장 (해당 rcept_no 의 ZIP이 캐시에 있어야 함) """
+        data = json.dumps(sections, ensure_ascii=False).encode('utf-8')
+        with self._lock, self._db:
+            row = self._db.execute("SELECT zip_sha FROM reports WHERE rcept_no = ?", (rcept_no,)).fetchone()
+            if not row:
+                logger.warning(f"Report cache: ZIP for {rcept_no} not cached, sections not stored.")
+                return
+            sha, _ = self._store_bytes(data)
+            self._db.execute("INSERT OR REPLACE INTO sections (zip_sha, extractor, sections_sha) VALUES (?, ?, ?)",
+                             (row[0], extractor, sha))
+            self._evict()
@@ -0,0 +1,173 @@
+# core/run_manifest.py
+# 증분 실행용 처리 이력(매니페스트): (corp_code, rcept_no) 별로 단계 완료 상태를 SQLite 에 기록
+# - 검색 결과를 매니페스트와 비교해 새 보고서/미완료 보고서만 이후 단계로 보냄
+# - 실패 시 실패한 단계와 사유를 기록하고, 다음 실행에서 마지막 완료 단계 다음부터 재개
+# - 각 단계(dart_fetcher, batch_parser, section_chunker, embedding_store, matrix_builder)는 manifest 를 받으면 완료 시 mark
+#   (rcept_no 만 아는 단계는 corp_code=None 으로 호출하고, 등록된 이력에서 corp_code 를 찾음)
+
+import datetime
+import json
+import sqlite3
+import threading
+
+try:
+    from .config import logger
+except ImportError:
+    from config import logger
+
+# 파이프라인 단계 (순서대로)
+STAGES = ('discovered', 'downloaded', 'parsed', 'chunked', 'embedded', 'matrix_applied')
+FINAL_STAGE = STAGES[-1]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS filings (
+    corp_code TEXT NOT NULL,
+    rcept_no TEXT NOT NULL,
+    stock_code TEXT,
+    company_name TEXT,
+    report_nm TEXT,
+    stage TEXT NOT NULL,          -- 마지막으로 완료된 단계
+    failed_stage TEXT,            -- 실패한 단계 (성공 시 NULL)
+    error TEXT,
+    info TEXT,                    -- 단계별 부가 정보 (zip_path, 섹션 수 등) JSON
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (corp_code, rcept_no)
+);
+CREATE INDEX IF NOT EXISTS idx_filings_stage ON filings (stage);
+"""
+
+
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds')
+
+
+def next_stage(stage):
+    """ 완료 단계 다음에 실행할 단계 (모두 끝났으면 None) """
+    idx = STAGES.index(stage)
+    return STAGES[idx + 1] if idx + 1 < len(STAGES) else None
+
+
+class RunManifest:
+    """ 처리 이력 매니페스트. 여러 스레드에서 공유 가능 """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def get(self, corp_code, rcept_no):
+        """ 보고서 이력 dict (없으면 None) """
+        with self._lock:
+            row = self._db.execute("SELECT * FROM filings WHERE corp_code = ? AND rcept_no = ?",
+                                   (corp_code, rcept_no)).fetchone()
+        if row is None: return None
+        record = dict(row)
+        record['info'] = json.loads(record['info'] or '{}')
+        return record
+
+    def latest(self, corp_code):
+        """ 기업의 가장 최근 rcept_no 이력 """
+        with self._lock:
+            row = self._db.execute("SELECT rcept_no FROM filings WHERE corp_code = ? ORDER BY rcept_no DESC LIMIT 1",
+                                   (corp_code,)).fetchone()
+        return self.get(corp_code, row['rcept_no']) if row else None
+
+    def register(self, corp_code, rcept_no, stock_code=None, company_name=None, report_nm=None):
+        """ 새 보고서 등록 (이미 있으면 기존 이력 유지). 반환: 이력 dict """
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO filings (corp_code, rcept_no, stock_code, company_name, report_nm, stage, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (corp_code, rcept_no, stock_code, company_name, report_nm, STAGES[0], _now()))
+        return self.get(corp_code, rcept_no)
+
+    def _corp_code_of(self, rcept_no):
+        """ rcept_no 로 등록된 corp_code (없으면 None). 접수번호는 DART 전체에서 유일 """
+        with self._lock:
+            row = self._db.execute("SELECT corp_code FROM filings WHERE rcept_no = ?", (rcept_no,)).fetchone()
+        return row['corp_code'] if row else None
+
+    def _resolve(self, corp_code, rcept_no, stage):
+        if corp_code: return corp_code
+        corp_code = self._corp_code_of(rcept_no)
+        if corp_code is None: logger.warning(f"매니페스트에 없는 보고서 '{stage}' 기록 건너뜀: rcept_no={rcept_no}")
+        return corp_code
+
+    def resume_stage(self, corp_code, rcept_no):
+        """ 이 보고서에서 다음에 실행할 단계. 처음 보는 보고서면 'downloaded', 모두 끝났으면 None """
+        record = self.get(corp_code, rcept_no)
+        return next_stage(record['stage'] if record else STAGES[0])
+
+    def mark(self, corp_code, rcept_no, stage, **info):
+        """ 단계 완료 기록 (이전 실패 정보는 지움). info 는 기존 info 에 병합. corp_code=None 이면 rcept_no 로 찾음 """
+        if stage not in STAGES: raise ValueError(f"unknown stage: {stage}")
+        corp_code = self._resolve(corp_code, rcept_no, stage)
+        if corp_code is None: return
+        record = self.get(corp_code, rcept_no) or self.register(corp_code, rcept_no)
+        merged = dict(record['info'], **info)
+        # 뒤 단계가 이미 완료된 경우 단계는 되돌리지 않음
+        done = stage if STAGES.index(stage) >= STAGES.index(record['stage']) else record['stage']
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE filings SET stage = ?, failed_stage = NULL, error = NULL, info = ?, updated_at = ? "
+                "WHERE corp_code = ? AND rcept_no = ?",
+                (done, json.dumps(merged, ensure_ascii=False), _now(), corp_code, rcept_no))
+
+    def mark_failed(self, corp_code, rcept_no, stage, error):
+        """ 단계 실패 기록. 완료 단계는 그대로이므로 다음 실행에서 이 단계부터 재시도. corp_code=None 이면 rcept_no 로 찾음 """
+        corp_code = self._resolve(corp_code, rcept_no, stage)
+        if corp_code is None: return
+        if not self.get(corp_code, rcept_no): self.register(corp_code, rcept_no)
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE filings SET failed_stage = ?, error = ?, updated_at = ? WHERE corp_code = ? AND rcept_no = ?",
+                (stage, str(error), _now(), corp_code, rcept_no))
+
+    def diff(self, reports):
+        """
+        검색 결과(find_latest_annual_report / DartFetcher.search_latest_report 의 dict 리스트,
+        'corp_code', 'rcept_no' 필수)를 매니페스트와 비교.
+        반환: (처리할 보고서 리스트(각 dict 에 'resume_stage' 추가), 변경 없는 보고서 리스트)
+        """
+        todo, unchanged = [], []
+        for report in reports:
+            corp_code, rcept_no = report['corp_code'], report['rcept_no']
+            record = self.get(corp_code, rcept_no)
+            if record is None:
+                record = self.register(corp_code, rcept_no, report.get('stock_code'),
+                                       report.get('corp_name'), report.get('report_nm'))
+            stage = next_stage(record['stage'])
+            if stage is None:
+                unchanged.append(report)
+            else:
+                todo.append(dict(report, resume_stage=stage, manifest_info=record['info']))
+        logger.debug(f"매니페스트 비교: 처리 대상 {len(todo)}건, 변경 없음 {len(unchanged)}건")
+        return todo, unchanged
+
+    def pending(self, stage):
+        """ 다음 단계가 stage 인(= 직전 단계까지 완료된) 보고서 이력 리스트. 'discovered' 는 시작 단계라 항상 빈 리스트 """
+        idx = STAGES.index(stage)
+        if idx == 0: return [] # 등록과 동시에 'discovered' 완료이므로 그 이전 단계에 머문 보고서는 없음
+        with self._lock:
+            rows = self._db.execute("SELECT corp_code, rcept_no FROM filings WHERE stage = ?", (STAGES[idx - 1],)).fetchall()
+        return [self.get(row['corp_code'], row['rcept_no']) for row in rows]
+
+    def failures(self):
+        """ 실패 상태인 보고서 [{'corp_code', 'rcept_no', 'stock_code', 'failed_stage', 'error'}, ...] """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT corp_code, rcept_no, stock_code, failed_stage, error FROM filings "
+                "WHERE failed_stage IS NOT NULL").fetchall()
+        return [dict(row) for row in rows]
+
+    def summary(self):
+        """ {단계: 보고서 수, 'failed': 실패 수} """
+        with self._lock:
+            counts = dict(self._db.execute("SELECT stage, COUNT(*) FROM filings GROUP BY stage").fetchall())
+            failed = self._db.execute("SELECT COUNT(*) FROM filings WHERE failed_stage IS NOT NULL").fetchone()[0]
+        return dict({stage: counts.get(stage, 0) for stage in STAGES}, failed=failed)
@@ -0,0 +1,127 @@
+# core/section_chunker.py
+# 섹션 인식 청커: dart_utils.iter_section_blocks 가 내보내는 블록(문단/표 행) 스트림을
+# 토큰 상한 이하의 청크로 묶어 제너레이터로 내보냄
+# - 섹션 전체 문자열을 만들지 않으므로 보고서 크기와 무관하게 메모리는 청크 1~2개 수준
+# - 블록 경계(문단, 표 행)에서만 자르고, 상한보다 긴 단일 블록만 토큰 창 단위로 분할
+# - 섹션이 바뀌면 항상 새 청크 시작
+# - manifest(run_manifest.RunManifest)를 주면 보고서 전체를 청크로 내보낸 뒤 'chunked' 단계 완료를 기록
+
+import math
+import re
+
+try:
+    from .config import logger, CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS
+    from .dart_utils import iter_section_blocks
+except ImportError:
+    from config import logger, CHUNK_MAX_TOKENS, CHUNK_OVERLAP_TOKENS
+    from dart_utils import iter_section_blocks
+
+MIN_SECTION_LENGTH = 20 # extract_sections_streaming 과 동일: 이보다 짧은 섹션은 버림
+CHARS_PER_TOKEN = 2.0 # 한국어 서브워드 토크나이저 기준 대략적인 글자/토큰 비율
+_SPLIT_REGEX = re.compile(r'\S+\s*') # 긴 블록 분할 단위 (공백 기준 어절)
+
+
+def approx_token_count(text):
+    """ 토크나이저 없이 쓰는 근사 토큰 수 (글자 수 / CHARS_PER_TOKEN) """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _split_block(text, max_tokens, overlap_tokens, token_counter):
+    """ 상한보다 긴 블록을 어절 단위 창으로 분할 (창 사이 overlap_tokens 만큼 겹침) """
+    words = _SPLIT_REGEX.findall(text)
+    window, window_tokens = [], 0
+    for word in words:
+        tokens = token_counter(word)
+        if window and window_tokens + tokens > max_tokens:
+            yield ''.join(window).strip()
+            # 겹침: 창 끝에서 overlap_tokens 이내의 어절을 다음 창 앞에 유지.
+            # 겹침도 다음 창의 상한에 포함되므로 이번 어절이 들어갈 자리(max_tokens - tokens)를 넘지 않게 줄임
+            budget = min(overlap_tokens, max_tokens - tokens)
+            kept, kept_tokens = [], 0
+            for prev in reversed(window):
+                prev_tokens = token_counter(prev)
+                if kept_tokens + prev_tokens > budget: break
+                kept.insert(0, prev); kept_tokens += prev_tokens
+            window, window_tokens = kept, kept_tokens
+        if tokens > max_tokens: # 공백 없는 초장문 어절은 글자 단위로 자름
+            step = max(1, int(max_tokens * CHARS_PER_TOKEN))
+            for start in range(0, len(word), step):
+                yield word[start:start + step].strip()
+            window, window_tokens = [], 0
+            continue
+        window.append(word); window_tokens += tokens
+    if window: yield ''.join(window).strip()
+
+
+def iter_section_chunks(
+    report_content,
+    company_code,
+    rcept_no,
+    company_name=None,
+    max_tokens=CHUNK_MAX_TOKENS,
+    overlap_tokens=CHUNK_OVERLAP_TOKENS,
+    token_counter=approx_token_count,
+    encoding=None,
+    manifest=None,
+    ):
+    """
+    DART 보고서(str 또는 ZIP에서 읽은 bytes)를 섹션 경계를 지키는 청크로 나눠 하나씩 yield.
+    청크 dict: content, original_section, company_code, company_name, rcept_no, chunk_index(보고서 내), section_chunk_index(섹션 내)
+    overlap_tokens 는 긴 블록을 분할할 때만 적용 (블록 단위 묶음은 겹치지 않음).
+    manifest 를 주면 제너레이터를 끝까지 소비했을 때 rcept_no 의 'chunked' 단계를 기록.
+    """
+    if max_tokens <= 0: raise ValueError("max_tokens must be positive")
+    overlap_tokens = min(max(0, overlap_tokens), max_tokens // 2)
+    state = {'chunk_index': 0, 'section_chunk_index': 0}
+    section = {'no': None, 'title': None, 'length': 0}
+    pending, pending_tokens = [], 0 # 현재 섹션에서 아직 내보내지 않은 블록
+    held = [] # 섹션 길이가 MIN_SECTION_LENGTH 를 넘기 전까지 보류한 청크
+    separator_tokens = token_counter("\n") # 블록 결합 문자도 상한에 포함
+
+    def make_chunk(text):
+        chunk = {
+            'content': text,
+            'original_section': section['title'],
+            'company_code': company_code,
+            'company_name': company_name,
+            'rcept_no': rcept_no,
+            'chunk_index': state['chunk_index'],
+            'section_chunk_index': state['section_chunk_index'],
+        }
+        state['chunk_index'] += 1
+        state['section_chunk_index'] += 1
+        return chunk
+
+    def release(texts):
+        # 짧은 섹션은 extract_sections_streaming 과 같은 기준으로 버리기 위해 길이가 확인될 때까지 보류
+        held.extend(texts)
+        if section['length'] <= MIN_SECTION_LENGTH: return []
+        chunks = [make_chunk(text) for text in held]
+        held.clear()
+        return chunks
+
+    for section_no, title, text, tag in iter_section_blocks(report_content, encoding):
+        if section_no != section['no']:
+            yield from release(["\n".join(pending)] if pending else [])
+            held.clear()
+            pending, pending_tokens = [], 0
+            section.update(no=section_no, title=title, length=0)
+            state['section_chunk_index'] = 0
+
+        section['length'] += len(text) + (1 if section['length'] else 0) # "\n" 결합 길이
+        tokens = token_counter(text)
+        if tokens > max_tokens: # 단일 블록이 상한 초과: 대기 블록을 먼저 내보낸 뒤 창 단위 분할
+            pieces = ["\n".join(pending)] if pending else []
+            pieces += list(_split_block(text, max_tokens, overlap_tokens, token_counter))
+            pending, pending_tokens = [], 0
+            yield from release([p for p in pieces if p])
+            continue
+        if pending and pending_tokens + separator_tokens + tokens > max_tokens:
+            yield from release(["\n".join(pending)])
+            pending, pending_tokens = [], 0
+        pending_tokens += tokens + (separator_tokens if pending else 0)
+        pending.append(text)
+
+    yield from release(["\n".join(pending)] if pending else [])
+    logger.debug(f"청크 생성 완료 ({company_code}, {rcept_no}): {state['chunk_index']}개")
+    if manifest is not None and rcept_no: manifest.mark(None, rcept_no, 'chunked', chunks=state['chunk_index'])
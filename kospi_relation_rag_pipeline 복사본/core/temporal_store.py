@@ -0,0 +1,245 @@
+# core/temporal_store.py
+# 보고 기간별 관계 행렬 시계열: 기준 스냅샷(전체 CSR) + 기간별 희소 델타
+#
+# <root>/series.json                          기간 목록(시간 순), 기간별 종류(base/delta), 노드 순서 해시, 유형별 nnz/델타 크기
+# <root>/base/<period>/...                    기준 스냅샷 (MatrixStore 레이아웃 그대로, mmap 로드)
+# <root>/delta/<period>/<relation_type>.npz   직전 기간 대비 바뀐 간선만: keys(int64, row * n + col, 정렬), values(float32, 0 = 삭제)
+#
+# 기간 문자열은 report_period() 형식('2024Q1' ~ '2024Q4', 사업보고서 = Q4)으로 문자열 정렬 = 시간 순.
+# 새 기간은 마지막 기간 뒤에만 추가 (마지막 기간은 다시 저장 가능). 노드 순서가 바뀌거나
+# 기준 스냅샷 이후 checkpoint_every 기간이 지나면 기준 스냅샷을 새로 저장해 복원 비용을 제한.
+
+import datetime
+import json
+import os
+import shutil
+
+import numpy as np
+import scipy.sparse as sp
+
+try:
+    from .config import logger, TEMPORAL_CHECKPOINT_EVERY
+    from .matrix_store import MatrixStore, _nodes_sha256, _write_json
+except ImportError:
+    from config import logger, TEMPORAL_CHECKPOINT_EVERY
+    from matrix_store import MatrixStore, _nodes_sha256, _write_json
+
+SERIES_FILE = 'series.json'
+SERIES_FORMAT_VERSION = 1
+# 보고서 코드(reprt_code) -> 분기 (1분기보고서, 반기보고서, 3분기보고서, 사업보고서)
+REPORT_CODE_QUARTERS = {'11013': 1, '11012': 2, '11014': 3, '11011': 4}
+
+
+def report_period(bsns_year, reprt_code):
+    """ 사업연도 + 보고서 코드 -> 기간 문자열 (예: 2024, '11012' -> '2024Q2') """
+    quarter = REPORT_CODE_QUARTERS.get(str(reprt_code))
+    if quarter is None: raise ValueError(f"unknown report code: {reprt_code}")
+    return f"{int(bsns_year)}Q{quarter}"
+
+
+# --- 평탄화 키 표현: 행렬 = (정렬된 row * n + col 키, 값) ---
+def _to_keys(matrix, num_nodes):
+    csr = sp.csr_matrix(matrix, dtype=np.float32, copy=True) # mmap(읽기 전용) 기준 스냅샷도 제자리 정리 가능하도록 복사
+    csr.sum_duplicates() # 행 안의 열 인덱스도 정렬되므로 키가 정렬됨
+    csr.eliminate_zeros()
+    rows = np.repeat(np.arange(num_nodes, dtype=np.int64), np.diff(csr.indptr))
+    return rows * num_nodes + csr.indices, np.asarray(csr.data, dtype=np.float32)
+
+
+def _from_keys(keys, values, num_nodes):
+    rows, cols = np.divmod(keys, num_nodes)
+    indptr = np.searchsorted(rows, np.arange(num_nodes + 1))
+    return sp.csr_matrix((values, cols.astype(np.int32), indptr), shape=(num_nodes, num_nodes), dtype=np.float32)
+
+
+def _diff(old_keys, old_values, new_keys, new_values):
+    """ old -> new 로 바뀐 간선: 새로 생기거나 값이 바뀐 키(새 값) + 사라진 키(0) """
+    if old_keys.size:
+        pos = np.minimum(np.searchsorted(old_keys, new_keys), old_keys.size - 1)
+        changed = (old_keys[pos] != new_keys) | (old_values[pos] != new_values)
+        removed = old_keys[~np.isin(old_keys, new_keys, assume_unique=True)]
+    else:
+        changed, removed = np.ones(new_keys.size, dtype=bool), old_keys
+    keys = np.concatenate([new_keys[changed], removed])
+    values = np.concatenate([new_values[changed], np.zeros(removed.size, dtype=np.float32)])
+    order = np.argsort(keys, kind='stable')
+    return keys[order], values[order]
+
+
+def _apply(keys, values, delta_keys, delta_values):
+    """ 델타 적용: 델타 키는 기존 값을 덮어쓰고 값 0 은 삭제 """
+    if not delta_keys.size: return keys, values
+    keep = ~np.isin(keys, delta_keys, assume_unique=True)
+    present = delta_values != 0
+    merged_keys = np.concatenate([keys[keep], delta_keys[present]])
+    merged_values = np.concatenate([values[keep], delta_values[present]])
+    order = np.argsort(merged_keys, kind='stable')
+    return merged_keys[order], merged_values[order]
+
+
+_EMPTY = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32))
+
+
+class TemporalMatrixStore:
+    """ 보고 기간별 관계 행렬 시계열 저장/복원 (기준 스냅샷 + 희소 델타) """
+    def __init__(self, root_dir, checkpoint_every=TEMPORAL_CHECKPOINT_EVERY):
+        if checkpoint_every < 1: raise ValueError("checkpoint_every must be >= 1")
+        self.root_dir = root_dir
+        self.checkpoint_every = checkpoint_every
+        os.makedirs(root_dir, exist_ok=True)
+        self.bases = MatrixStore(os.path.join(root_dir, 'base'))
+        self._series_path = os.path.join(root_dir, SERIES_FILE)
+        if os.path.exists(self._series_path):
+            with open(self._series_path, 'r', encoding='utf-8') as f:
+                self._series = json.load(f)
+        else:
+            self._series = {'format_version': SERIES_FORMAT_VERSION, 'periods': []}
+
+    # --- 목록 ---
+    def list_periods(self):
+        return [entry['period'] for entry in self._series['periods']]
+
+    def latest_period(self):
+        periods = self.list_periods()
+        return periods[-1] if periods else None
+
+    def period_info(self, period=None):
+        """ 기간 메타데이터 (종류, 노드 수, 유형별 nnz / 델타 크기, 원천 rcept_no) """
+        return dict(self._series['periods'][self._position(period)])
+
+    def list_relations(self, period=None):
+        return sorted(self.period_info(period)['relations'])
+
+    def _position(self, period):
+        periods = self.list_periods()
+        if not periods: raise FileNotFoundError(f"저장된 기간 없음: {self.root_dir}")
+        if period is None: return len(periods) - 1
+        try:
+            return periods.index(str(period))
+        except ValueError:
+            raise KeyError(f"저장되지 않은 기간: {period}") from None
+
+    def _base_position(self, position):
+        while self._series['periods'][position]['kind'] != 'base': position -= 1
+        return position
+
+    def _delta_path(self, relation_type, period):
+        return os.path.join(self.root_dir, 'delta', str(period), f"{relation_type}.npz")
+
+    # --- 저장 ---
+    def append_snapshot(self, matrices, period, node_codes, source_rcept_nos=()):
+        """
+        한 기간의 {관계 유형: 행렬}(build_adjacency_matrix 결과)을 시계열 끝에 추가하고 기간 메타데이터 반환.
+        직전 기간과 노드 순서가 같으면 바뀐 간선만 델타로 저장. 직전 기간에 있던 유형이 빠지면 빈 행렬로 간주.
+        """
+        period, node_codes = str(period), [str(code) for code in node_codes]
+        num_nodes, nodes_sha = len(node_codes), _nodes_sha256(node_codes)
+        latest = self.latest_period()
+        if latest is not None and period < latest:
+            raise ValueError(f"기간 {period} 은(는) 마지막 기간 {latest} 이전입니다 (시계열 끝에만 추가 가능).")
+        if period == latest: self._drop_latest()
+
+        entries = self._series['periods']
+        prev = entries[-1] if entries else None
+        is_base = (prev is None or prev['nodes_sha256'] != nodes_sha
+                   or len(entries) - self._base_position(len(entries) - 1) >= self.checkpoint_every)
+        entry = {
+            'period': period,
+            'kind': 'base' if is_base else 'delta',
+            'num_nodes': num_nodes,
+            'nodes_sha256': nodes_sha,
+            'relations': {},
+            'source_rcept_nos': sorted(set(map(str, source_rcept_nos))),
+            'built_at': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        }
+        for relation_type, matrix in matrices.items():
+            if matrix.shape != (num_nodes, num_nodes):
+                raise ValueError(f"matrix shape {matrix.shape} does not match {num_nodes} nodes")
+
+        if is_base:
+            self.bases.save_matrices(matrices, period, node_codes, source_rcept_nos)
+            for relation_type, matrix in matrices.items():
+                entry['relations'][relation_type] = {'nnz': int(_to_keys(matrix, num_nodes)[0].size)}
+        else:
+            for relation_type in sorted(set(matrices) | set(prev['relations'])):
+                new_keys, new_values = (_to_keys(matrices[relation_type], num_nodes) if relation_type in matrices
+                                        else _EMPTY)
+                delta_keys, delta_values = _diff(*self._state(relation_type, len(entries) - 1), new_keys, new_values)
+                if delta_keys.size:
+                    path = self._delta_path(relation_type, period)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    np.savez(path, keys=delta_keys, values=delta_values)
+                if relation_type in matrices or delta_keys.size:
+                    entry['relations'][relation_type] = {'nnz': int(new_keys.size), 'delta_nnz': int(delta_keys.size)}
+
+        entries.append(entry)
+        _write_json(self._series_path, self._series)
+        changed = {t: r.get('delta_nnz', r['nnz']) for t, r in entry['relations'].items()}
+        logger.info(f"기간 스냅샷 저장 완료: {period} ({entry['kind']}, 유형별 저장 간선 수: {changed})")
+        return dict(entry)
+
+    def _drop_latest(self):
+        """ 마지막 기간 삭제 (같은 기간 재저장 시) """
+        entry = self._series['periods'].pop()
+        if entry['kind'] == 'base':
+            shutil.rmtree(self.bases._period_dir(entry['period']), ignore_errors=True)
+        shutil.rmtree(os.path.join(self.root_dir, 'delta', entry['period']), ignore_errors=True)
+        _write_json(self._series_path, self._series)
+
+    # --- 복원 ---
+    def _load_base(self, relation_type, position):
+        period = self._series['periods'][position]['period']
+        if relation_type not in self.bases.list_relations(period): return _EMPTY
+        return _to_keys(self.bases.load_matrix(relation_type, period, mmap=True),
+                        self._series['periods'][position]['num_nodes'])
+
+    def _step(self, relation_type, position, keys, values):
+        """ position 기간으로 한 단계 진행 (기준 스냅샷이면 그대로 로드, 델타면 적용) """
+        if self._series['periods'][position]['kind'] == 'base': return self._load_base(relation_type, position)
+        return _apply(keys, values, *self.load_delta(relation_type, self._series['periods'][position]['period']))
+
+    def _state(self, relation_type, position):
+        base = self._base_position(position)
+        keys, values = self._load_base(relation_type, base)
+        for pos in range(base + 1, position + 1):
+            keys, values = self._step(relation_type, pos, keys, values)
+        return keys, values
+
+    def load_delta(self, relation_type, period):
+        """ 직전 기간 대비 바뀐 간선 (keys = row * n + col, values = 새 값, 0 = 삭제). 기준 스냅샷 기간은 빈 배열 """
+        path = self._delta_path(relation_type, period)
+        if not os.path.exists(path): return _EMPTY
+        with np.load(path) as delta:
+            return delta['keys'], delta['values']
+
+    def load_matrix(self, relation_type, period=None):
+        """ 기간의 관계 행렬 복원 (period 없으면 최신). 가장 가까운 기준 스냅샷 + 이후 델타 (최대 checkpoint_every - 1 개) """
+        position = self._position(period)
+        return _from_keys(*self._state(relation_type, position), self._series['periods'][position]['num_nodes'])
+
+    def iter_window(self, relation_type, start=None, end=None):
+        """
+        start ~ end 기간(양끝 포함)의 (기간, CSR 행렬)을 시간 순으로 생성.
+        첫 기간만 복원하고 이후는 델타를 이어서 적용하므로 기간당 비용은 바뀐 간선 수에 비례.
+        """
+        first = self._position(start) if start is not None else 0
+        last = self._position(end)
+        if first > last: raise ValueError(f"start {start} is after end {end}")
+        keys, values = self._state(relation_type, first)
+        for pos in range(first, last + 1):
+            if pos > first: keys, values = self._step(relation_type, pos, keys, values)
+            entry = self._series['periods'][pos]
+            yield entry['period'], _from_keys(keys, values, entry['num_nodes'])
+
+    def load_window(self, relation_type, start=None, end=None):
+        """ 롤링 이력: (기간 리스트, [CSR 행렬, ...]) - to_tensor 와 같은 형태, 각 행렬은 희소 유지 """
+        periods, matrices = [], []
+        for period, matrix in self.iter_window(relation_type, start, end):
+            periods.append(period)
+            matrices.append(matrix)
+        return periods, matrices
+
+    def load_nodes(self, period=None):
+        """ 기간의 노드 순서 (해당 기간이 속한 기준 스냅샷의 nodes.json) """
+        base = self._base_position(self._position(period))
+        return self.bases.load_nodes(self._series['periods'][base]['period'])
@@ -0,0 +1,79 @@
+# tests/test_batch_parser.py
+# batch_parser: 프로세스 풀 파싱 결과/실패 레코드, 섹션 캐시 적중, 매니페스트 'parsed' 기록, 제한 시간
+
+import time
+
+import pytest
+
+from core import batch_parser
+from core.batch_parser import (STATUS_CACHED, STATUS_FAILED, STATUS_PARSED, STATUS_TIMEOUT, iter_parse_reports,
+                               parse_report_job, parse_reports)
+from core.report_cache import ReportCache
+from core.run_manifest import RunManifest
+from fixtures import make_dart_xml, make_dart_zip
+
+
+@pytest.fixture
+def zips(tmp_path):
+    good = make_dart_zip(str(tmp_path / 'good.zip'), make_dart_xml(20), rcept_no='R1')
+    bad = tmp_path / 'bad.zip'
+    bad.write_bytes(b'not a zip')
+    return good, str(bad)
+
+
+def test_parse_reports_collects_sections_and_failures(zips):
+    good, bad = zips
+    sections, failures = parse_reports([(good, '005930', '삼성전자', 'R1'), (bad, '000660', 'SK하이닉스')], max_workers=2)
+    assert list(sections) == ['005930'] and sections['005930']
+    assert all(s['content'] and s['original_section'] for s in sections['005930'])
+    assert failures == [{'code': '000660', 'name': 'SK하이닉스', 'zip_path': bad, 'rcept_no': None,
+                         'status': STATUS_FAILED, 'reason': 'ZIP 내 보고서 파일 없음'}]
+
+
+def test_cache_hit_skips_parsing_and_marks_manifest(zips, tmp_path):
+    good, bad = zips
+    cache = ReportCache(str(tmp_path / 'cache'))
+    manifest = RunManifest(str(tmp_path / 'manifest.sqlite'))
+    manifest.register('C1', 'R1')
+    manifest.register('C2', 'R2')
+    cache.put_zip('R1', good) # 섹션 캐시는 ZIP 내용 해시에 묶임
+    try:
+        jobs = [(good, '005930', '삼성전자', 'R1'), (bad, '000660', 'SK하이닉스', 'R2')]
+        first = {r['rcept_no']: r for r in iter_parse_reports(jobs, max_workers=2, cache=cache, manifest=manifest)}
+        assert first['R1']['status'] == STATUS_PARSED and first['R2']['status'] == STATUS_FAILED
+        assert cache.get_sections('R1') == first['R1']['sections']
+        assert manifest.get('C1', 'R1')['stage'] == 'parsed'
+        assert manifest.get('C1', 'R1')['info'] == {'sections': len(first['R1']['sections'])}
+        assert manifest.failures()[0]['failed_stage'] == 'parsed' and manifest.get('C2', 'R2')['stage'] == 'discovered'
+
+        # 두 번째 실행: R1 은 캐시에서 바로 반환 (워커에 보내지 않음)
+        second = list(iter_parse_reports(jobs[:1], cache=cache, manifest=manifest))
+        assert [r['status'] for r in second] == [STATUS_CACHED]
+        assert second[0]['sections'] == first['R1']['sections']
+    finally:
+        cache.close()
+        manifest.close()
+
+
+def test_parse_report_job_timeout(zips, monkeypatch):
+    monkeypatch.setattr(batch_parser, 'extract_sections_streaming', lambda *args: time.sleep(5))
+    start = time.perf_counter()
+    result = parse_report_job((zips[0], '005930', '삼성전자'), timeout=0.1)
+    assert result['status'] == STATUS_TIMEOUT and time.perf_counter() - start < 2
+
+
+def test_dict_jobs_are_accepted(zips):
+    good, _bad = zips
+    results = list(iter_parse_reports([{'zip_path': good, 'code': '005930', 'name': '삼성전자'}], max_workers=1))
+    assert [(r['code'], r['rcept_no'], r['status']) for r in results] == [('005930', None, STATUS_PARSED)]
+    assert parse_report_job({'zip_path': good, 'code': '005930', 'name': '삼성전자', 'rcept_no': 'R1'})['sections']
+
+
+def test_early_stop_does_not_wait_for_queued_jobs(zips, monkeypatch):
+    # fork 로 시작한 워커에도 패치가 적용됨
+    monkeypatch.setattr(batch_parser, 'extract_sections_streaming', lambda *args: time.sleep(0.5) or [])
+    results = iter_parse_reports([(zips[0], f'{i:06d}', '회사') for i in range(8)], max_workers=1, timeout=None)
+    start = time.perf_counter()
+    next(results)
+    results.close()
+    assert time.perf_counter() - start < 2 # 남은 7건(약 3.5s)을 기다리지 않음
@@ -0,0 +1,77 @@
+# tests/test_benchmarks.py
+# 벤치마크 합성 데이터(fixtures)의 재현성/형식과 run_benchmarks 의 결과 파일 비교(회귀 판정)
+
+import json
+import os
+import subprocess
+import sys
+import zipfile
+
+import numpy as np
+
+import run_benchmarks
+from fixtures import make_adjacency, make_dart_xml, make_dart_zip
+
+
+def test_dart_xml_is_seeded_and_sized():
+    report = make_dart_xml(50, seed=1)
+    assert report == make_dart_xml(50, seed=1) != make_dart_xml(50, seed=2)
+    assert 50 * 1024 <= len(report) < 70 * 1024
+    cp949 = make_dart_xml(10, encoding='cp949')
+    assert cp949.startswith(b'<?xml version="1.0" encoding="cp949"?>') and '사업의 내용' in cp949.decode('cp949')
+
+
+def test_dart_zip_root_member_is_largest(tmp_path):
+    report = make_dart_xml(40)
+    path = make_dart_zip(str(tmp_path / 'r.zip'), report, rcept_no='R1', attachments=3)
+    with zipfile.ZipFile(path) as zf:
+        sizes = {info.filename: info.file_size for info in zf.infolist()}
+    assert list(sizes) == ['R1.xml', 'R1_00000.xml', 'R1_00001.xml', 'R1_00002.xml']
+    assert sizes['R1.xml'] == len(report) == max(sizes.values())
+
+
+def test_adjacency_values_and_density():
+    matrix = make_adjacency(200, density=0.05, seed=3)
+    assert matrix.shape == (200, 200) and matrix.dtype == np.float32
+    assert set(np.unique(matrix.data)) <= {1.0, 2.0, 3.0} and matrix.nnz == 2000
+    assert np.array_equal(make_adjacency(200, density=0.05, sparse=False, seed=3), matrix.toarray())
+
+
+def _write_results(path, records):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'type': 'meta'}) + '\n')
+        for record in records: f.write(json.dumps(record) + '\n')
+    return str(path)
+
+
+def test_compare_flags_regressions_over_threshold(tmp_path, capsys):
+    base = [{'suite': 'decode', 'case': c, 'scale': 'small', 'min_s': 0.1} for c in ('a', 'b', 'c')]
+    baseline = run_benchmarks.load_results(_write_results(tmp_path / 'base.jsonl', base))
+    assert set(baseline) == {('decode', c, 'small') for c in 'abc'}
+    now = [dict(base[0], min_s=0.11), dict(base[1], min_s=0.15), dict(base[2], scale='medium', min_s=9.0)]
+    regressions = run_benchmarks.compare(now, baseline, threshold=0.2)
+    assert [r['case'] for r in regressions] == ['b'] # 기준에 없는 (medium) 케이스는 비교하지 않음
+    assert 'REGRESSION' in capsys.readouterr().out
+
+
+def test_run_benchmarks_cli_writes_results(tmp_path):
+    output = tmp_path / 'now.jsonl'
+    script = os.path.join(os.path.dirname(run_benchmarks.__file__), 'run_benchmarks.py')
+    run = subprocess.run([sys.executable, script, '--scales', 'small', '--suites', 'decode', 'matrix',
+                          '--repeat', '1', '--output', str(output)], capture_output=True, text=True, timeout=300)
+    assert run.returncode == 0, run.stderr
+    lines = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+    assert lines[0]['type'] == 'meta' and {line['suite'] for line in lines[1:]} == {'decode', 'matrix'}
+    # 방금 결과를 기준으로 느슨한 임계값(100 = 10000%)으로 재실행: 비교 표 출력, 회귀 없음
+    rerun = subprocess.run([sys.executable, script, '--scales', 'small', '--suites', 'decode', '--repeat', '1',
+                            '--output', str(tmp_path / 'again.jsonl'), '--baseline', str(output), '--threshold', '100'],
+                           capture_output=True, text=True, timeout=300)
+    assert rerun.returncode == 0 and 'ratio' in rerun.stdout
+
+
+def test_batch_suite_scales_worker_counts(tmp_path):
+    assert run_benchmarks.worker_counts(1) == [1] and run_benchmarks.worker_counts(6) == [1, 2, 4, 6]
+    params = {'xml_kb': 20, 'reports': 3, 'max_workers': 2}
+    records = list(run_benchmarks.bench_batch('small', params, 1, str(tmp_path)))
+    assert [r['workers'] for r in records] == [1, 2] and records[0]['speedup'] == 1.0
+    assert all(r['suite'] == 'batch' and r['parsed'] == r['reports'] == 3 for r in records)
@@ -0,0 +1,46 @@
+# tests/test_capabilities.py
+# capabilities: 설치 여부 확인/지연 로드/설치 안내, 그리고 모든 core 모듈이 선택적 의존성을 임포트 시점에 로드하지 않는지
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from core import capabilities
+from core.capabilities import CAPABILITIES, MissingDependencyError, has, report, require
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+CORE_MODULES = sorted(name[:-3] for name in os.listdir(os.path.join(PROJECT_DIR, 'core'))
+                      if name.endswith('.py') and name != '__init__.py')
+LAZY_MODULES = sorted({module.split('.')[0] for module, _package, _usage in CAPABILITIES.values()})
+
+
+def test_has_and_require_installed_module():
+    assert has('requests') is True
+    assert require('requests') is sys.modules['requests']
+    assert set(report()) == set(CAPABILITIES)
+
+
+def test_missing_dependency_error(monkeypatch):
+    monkeypatch.setitem(CAPABILITIES, 'missing', ('no_such_module_xyz', 'no-such-package', "테스트"))
+    monkeypatch.setattr(capabilities, '_available', {})
+    assert has('missing') is False
+    with pytest.raises(MissingDependencyError, match="pip install no-such-package") as info:
+        require('missing')
+    assert isinstance(info.value, ImportError) and info.value.capability == 'missing'
+
+
+def _loaded_after_import(statement, path):
+    code = f"import json, sys; {statement}; print(json.dumps(sorted(set({LAZY_MODULES!r}) & set(sys.modules))))"
+    run = subprocess.run([sys.executable, '-c', code], cwd=path, capture_output=True, text=True, timeout=120)
+    assert run.returncode == 0, run.stderr
+    return json.loads(run.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize('module', CORE_MODULES)
+def test_core_module_imports_without_optional_dependencies(module):
+    # 패키지 임포트(프로젝트 루트)와 평면 임포트(core/ 에서 실행) 모두 선택적 의존성을 로드하지 않아야 함
+    assert _loaded_after_import(f"import core.{module}", PROJECT_DIR) == []
+    assert _loaded_after_import(f"import {module}", os.path.join(PROJECT_DIR, 'core')) == []
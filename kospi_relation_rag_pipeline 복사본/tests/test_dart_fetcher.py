@@ -0,0 +1,177 @@
+# tests/test_dart_fetcher.py
+# DartFetcher: localhost 의 가짜 DART 서버(http.server)로 실제 requests.Session 을 거쳐
+# list.json 페이지 넘김, document.xml 스트리밍 다운로드(.part -> .zip), status 020 / 5xx 재시도, 끊긴 응답 확인
+
+import json
+import os
+import threading
+import zipfile
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+requests = pytest.importorskip('requests')
+pytest.importorskip('tenacity')
+
+from core import dart_fetcher, dart_utils
+from core.dart_fetcher import DartFetcher, TokenBucket, match_report_code
+from fixtures import make_dart_xml, make_dart_zip
+
+
+class FakeDartHandler(BaseHTTPRequestHandler):
+    """ endpoint 별 응답 큐에서 (HTTP 상태, 본문, 잘림 여부)를 꺼내 응답. 큐의 마지막 응답은 계속 재사용 """
+    def do_GET(self):
+        url = urlsplit(self.path)
+        endpoint = url.path.rsplit('/', 1)[-1]
+        server = self.server
+        with server.lock:
+            server.calls.append((endpoint, {key: values[0] for key, values in parse_qs(url.query).items()}))
+            queue = server.responses[endpoint]
+            status, body, truncated = queue.pop(0) if len(queue) > 1 else queue[0]
+        self.send_response(status)
+        # 잘린 응답: Content-Length 보다 적게 보내고 연결을 닫음
+        self.send_header('Content-Length', str(len(body) + (1024 if truncated else 0)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def dart_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeDartHandler)
+    server.lock, server.responses, server.calls = threading.Lock(), {}, []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fast_retry(monkeypatch):
+    # 재시도 데코레이터는 첫 호출 때 이 값으로 만들어짐
+    monkeypatch.setattr(dart_utils, 'RETRY_WAIT_SECONDS', 0)
+    monkeypatch.setattr(dart_utils, 'RETRY_MAX_WAIT_SECONDS', 0)
+    monkeypatch.setenv('NO_PROXY', '127.0.0.1')
+
+
+def json_response(payload, status=200):
+    return status, json.dumps(payload, ensure_ascii=False).encode('utf-8'), False
+
+
+def raw_response(body=b'', status=200, truncated=False):
+    return status, body, truncated
+
+
+def list_page(reports, page_no, total_page):
+    return json_response({'status': '000', 'message': '정상', 'page_no': page_no, 'total_page': total_page,
+                          'list': reports})
+
+
+def zip_bytes(tmp_path, xml_kb=1000):
+    # 64KB 스트리밍 청크 여러 개로 나뉘어 받아지도록 충분히 큰 보고서
+    path = make_dart_zip(str(tmp_path / 'served.zip'), make_dart_xml(xml_kb, seed=7), seed=7)
+    with open(path, 'rb') as f: data = f.read()
+    os.remove(path)
+    return data
+
+
+def make_fetcher(server, responses, **kwargs):
+    server.responses.update({endpoint: list(items) for endpoint, items in responses.items()})
+    return DartFetcher('test-key', base_url=f"http://127.0.0.1:{server.server_address[1]}/api/",
+                       rate_limiter=TokenBucket(1000.0), **kwargs)
+
+
+def test_match_report_code_distinguishes_quarters():
+    assert match_report_code('분기보고서 (2024.03)', ['11013', '11014']) == '11013'
+    assert match_report_code('분기보고서 (2024.09)', ['11013', '11014']) == '11014'
+    assert match_report_code('분기보고서 (2024.03)', ['11014']) is None
+    assert match_report_code('[기재정정]사업보고서 (2023.12)', ['11011']) == '11011'
+
+
+def test_search_pages_through_list_json(dart_server):
+    fetcher = make_fetcher(dart_server, {'list.json': [
+        list_page([{'rcept_no': '1', 'report_nm': '분기보고서 (2024.09)'}], 1, 2),
+        list_page([{'rcept_no': '2', 'report_nm': '반기보고서 (2024.06)'},
+                   {'rcept_no': '3', 'report_nm': '분기보고서 (2024.03)'}], 2, 2),
+    ]})
+    with fetcher:
+        report = fetcher.search_latest_report('00126380', 2024, report_codes=('11013',))
+    assert report['rcept_no'] == '3' and report['reprt_code'] == '11013'
+    assert [params['page_no'] for _endpoint, params in dart_server.calls] == ['1', '2']
+    assert all(params['crtfc_key'] == 'test-key' and params['corp_code'] == '00126380'
+               for _endpoint, params in dart_server.calls)
+
+
+def test_search_retries_rate_limit_status_and_server_errors(dart_server):
+    fetcher = make_fetcher(dart_server, {'list.json': [
+        json_response({'status': '020', 'message': '요청 제한을 초과하였습니다.'}),
+        raw_response(b'unavailable', status=503),
+        list_page([{'rcept_no': '9', 'report_nm': '사업보고서 (2023.12)'}], 1, 1),
+    ]})
+    with fetcher:
+        report = fetcher.search_latest_report('00126380', 2024)
+    assert report['rcept_no'] == '9'
+    assert len(dart_server.calls) == 3
+
+
+def test_search_does_not_retry_key_errors(dart_server):
+    fetcher = make_fetcher(dart_server, {'list.json': [json_response({'status': '010', 'message': '등록되지 않은 키'})]})
+    with fetcher, pytest.raises(dart_fetcher.DartAPIError):
+        fetcher.search_latest_report('00126380', 2024)
+    assert len(dart_server.calls) == 1
+
+
+def test_search_no_data_returns_none(dart_server):
+    no_data = json_response({'status': '013', 'message': '조회된 데이타가 없습니다.'})
+    fetcher = make_fetcher(dart_server, {'list.json': [no_data]})
+    with fetcher:
+        assert fetcher.search_latest_report('00126380', 2024) is None
+
+
+def test_download_streams_zip(dart_server, tmp_path):
+    served = zip_bytes(tmp_path)
+    assert len(served) > 64 * 1024
+    fetcher = make_fetcher(dart_server, {'document.xml': [raw_response(b'bad gateway', status=502),
+                                                          raw_response(served)]})
+    with fetcher:
+        path = fetcher.download_report('20240312000736', str(tmp_path / 'out'))
+    assert path == os.path.join(str(tmp_path / 'out'), '20240312000736.zip')
+    with open(path, 'rb') as f: assert f.read() == served
+    assert zipfile.is_zipfile(path)
+    assert os.listdir(tmp_path / 'out') == ['20240312000736.zip'] # .part 파일은 남지 않음
+    assert [params['rcept_no'] for _endpoint, params in dart_server.calls] == ['20240312000736'] * 2
+
+
+def test_download_removes_part_file_when_stream_breaks(dart_server, tmp_path):
+    served = zip_bytes(tmp_path)
+    fetcher = make_fetcher(dart_server, {'document.xml': [raw_response(served[:100 * 1024], truncated=True)]})
+    with fetcher, pytest.raises(requests.RequestException):
+        fetcher.download_report('20240312000736', str(tmp_path / 'out'))
+    assert os.listdir(tmp_path / 'out') == []
+    assert len(dart_server.calls) == dart_utils.RETRY_ATTEMPTS # 끊긴 응답은 재시도 후 포기
+
+
+def test_download_error_xml_returns_none(dart_server, tmp_path):
+    body = '<result><status>014</status><message>파일이 존재하지 않습니다</message></result>'.encode('utf-8')
+    fetcher = make_fetcher(dart_server, {'document.xml': [raw_response(body)]})
+    with fetcher:
+        assert fetcher.download_report('20240312000736', str(tmp_path / 'out')) is None
+    assert os.listdir(tmp_path / 'out') == []
+
+
+def test_fetch_many_searches_and_downloads(dart_server, tmp_path):
+    served = zip_bytes(tmp_path, xml_kb=20)
+    fetcher = make_fetcher(dart_server, {
+        'list.json': [list_page([{'rcept_no': '20240312000736', 'report_nm': '사업보고서 (2023.12)'}], 1, 1)],
+        'document.xml': [raw_response(served)],
+    }, max_workers=2)
+    jobs = [{'corp_code': '00126380', 'code': '005930'}, {'corp_code': '00164779', 'code': '000660'}]
+    with fetcher:
+        results = {r['code']: r for r in fetcher.fetch_many(jobs, 2024, str(tmp_path / 'dl'))}
+    assert {code: r['status'] for code, r in results.items()} == {'005930': 'downloaded', '000660': 'downloaded'}
+    assert results['000660']['zip_path'] == os.path.join(str(tmp_path / 'dl'), '000660', '20240312000736.zip')
+    assert sorted(endpoint for endpoint, _params in dart_server.calls) == ['document.xml'] * 2 + ['list.json'] * 2
@@ -0,0 +1,187 @@
+# tests/test_dart_utils.py
+# dart_utils: 단일 패스 섹션 추출기(extract_sections_streaming)와 기존 추출기(extract_targeted_data_from_xml) 결과 비교
+# 기존 추출기는 조상 요소의 text_content 를 이어 붙여 같은 문장이 여러 번, 뒤 섹션 내용까지 들어가므로
+# 섹션 제목/순서가 같고 단일 패스 결과의 단어가 모두 기존 결과의 같은 섹션에 있는지 비교
+# ZIP 보고서 멤버 선택/메모리 읽기, 인코딩 감지, 재시도 데코레이터 팩토리(dart_retry)
+
+import os
+import zipfile
+
+import pytest
+
+from core import dart_utils, profiler
+from core.dart_utils import (dart_retry, decode_content, detect_encoding, extract_report_file_from_zip, extract_sections_streaming,
+                             extract_targeted_data_from_xml, iter_section_blocks, read_report_from_zip)
+from fixtures import make_dart_xml, make_dart_zip
+
+HANDWRITTEN_REPORT = """<?xml version="1.0" encoding="utf-8"?>
+<DOCUMENT><BODY>
+<P>표지 문구입니다. 이 보고서는 합성 테스트용 문서이며 섹션 앞부분의 내용입니다.</P>
+<SECTION-1><TITLE>II. 사업의 내용</TITLE>
+<P>당사는 반도체 부문에서 <B>글로벌</B> 경쟁사와 경쟁하고 있습니다.</P>
+<SECTION-2><TITLE>3. 원재료 및 생산설비</TITLE>
+<TABLE><TR><TD>웨이퍼</TD><TD>SK실트론</TD></TR><TR><TD>가스</TD><TD>공급사 A</TD></TR>
+<TR><TD>화학약품</TD><TD>동진쎄미켐</TD></TR></TABLE>
+<STYLE>p { color: red }</STYLE>
+</SECTION-2></SECTION-1>
+<SECTION-1><TITLE>IX. 계열회사 등에 관한 사항</TITLE><P>짧음</P></SECTION-1>
+<SECTION-1><TITLE>XII. 상세표</TITLE>
+<SECTION-2><TITLE>2. 계열회사 현황(상세)</TITLE><P>삼성디스플레이, 삼성바이오로직스 등 계열회사 목록입니다.</P></SECTION-2>
+</SECTION-1>
+</BODY></DOCUMENT>""".encode('utf-8')
+
+
+def _assert_same_sections(content):
+    legacy = extract_targeted_data_from_xml(content, 'doc', '005930', '삼성전자')
+    streaming = extract_sections_streaming(content, 'doc', '005930', '삼성전자')
+    assert streaming
+    # 단일 패스 섹션은 기존 섹션의 순서 보존 부분열 (기존 추출기는 뒤 내용이 섞여 짧은 섹션도 20자를 넘겨 남을 수 있음)
+    legacy_by_position = iter(legacy)
+    for section in streaming:
+        old = next((s for s in legacy_by_position if s['original_section'] == section['original_section']), None)
+        assert old is not None, section['original_section']
+        assert set(section['content'].split()) <= set(old['content'].split())
+        assert len(section['content']) <= len(old['content'])
+    return streaming
+
+
+@pytest.mark.parametrize('seed, encoding', [(0, 'utf-8'), (1, 'utf-8'), (2, 'cp949')])
+def test_streaming_matches_legacy_on_synthetic_reports(seed, encoding):
+    report = make_dart_xml(120, encoding=encoding, seed=seed)
+    streaming = _assert_same_sections(report)
+    assert len(streaming) == len(extract_targeted_data_from_xml(report, 'doc', '005930', '삼성전자'))
+
+
+def test_streaming_writes_each_text_node_once():
+    streaming = _assert_same_sections(HANDWRITTEN_REPORT)
+    assert extract_sections_streaming(decode_content(HANDWRITTEN_REPORT), 'doc', '005930', '삼성전자') == streaming
+    assert streaming == [
+        {'content': '표지 문구입니다. 이 보고서는 합성 테스트용 문서이며 섹션 앞부분의 내용입니다.', 'original_section': '문서 시작'},
+        {'content': '당사는 반도체 부문에서 글로벌 경쟁사와 경쟁하고 있습니다.', 'original_section': 'II. 사업의 내용'},
+        {'content': '웨이퍼 SK실트론\n가스 공급사 A\n화학약품 동진쎄미켐', 'original_section': '3. 원재료 및 생산설비'},
+        {'content': '삼성디스플레이, 삼성바이오로직스 등 계열회사 목록입니다.', 'original_section': '2. 계열회사 현황(상세)'},
+    ]
+
+
+def test_iter_section_blocks_yields_blocks_in_order():
+    blocks = list(iter_section_blocks(HANDWRITTEN_REPORT))
+    section_numbers = [no for no, _title, _text, _tag in blocks]
+    assert section_numbers == sorted(section_numbers)
+    assert any(tag == 'tr' and '웨이퍼' in text for _no, _title, text, tag in blocks)
+
+
+def test_empty_input():
+    assert extract_sections_streaming(b'', 'doc', '005930', '삼성전자') == []
+    assert extract_sections_streaming(None, 'doc', '005930', '삼성전자') == []
+
+
+# --- ZIP 읽기 (메모리, extractall 없음) ---
+
+def _write_zip(path, members):
+    with zipfile.ZipFile(path, 'w') as zf:
+        for name, data in members.items(): zf.writestr(name, data)
+    return str(path)
+
+
+def test_read_report_from_zip_picks_root_xml(tmp_path):
+    report = make_dart_xml(20)
+    path = make_dart_zip(str(tmp_path / 'r.zip'), report, rcept_no='20240312000736')
+    data, ext, member = read_report_from_zip(path)
+    assert (data, ext, member) == (report, '.xml', '20240312000736.xml')
+
+
+def test_select_report_member_priority(tmp_path):
+    path = _write_zip(tmp_path / 'r.zip', {'sub/big.xml': b'x' * 100, 'root.html': b'<html/>', 'readme.txt': b''})
+    assert read_report_from_zip(path)[2] == 'root.html'
+    path = _write_zip(tmp_path / 's.zip', {'a/small.xml': b'x', 'b/big.htm': b'x' * 100})
+    assert read_report_from_zip(path)[2] == 'b/big.htm'
+    path = _write_zip(tmp_path / 'n.zip', {'readme.txt': b'no report'})
+    assert read_report_from_zip(path) == (None, None, None)
+
+
+def test_read_report_from_invalid_zip(tmp_path):
+    bad = tmp_path / 'bad.zip'
+    bad.write_bytes(b'not a zip')
+    assert read_report_from_zip(str(bad)) == (None, None, None)
+    assert read_report_from_zip(str(tmp_path / 'missing.zip')) == (None, None, None)
+
+
+def test_extract_report_file_from_zip_extracts_one_member(tmp_path):
+    report = make_dart_xml(20)
+    path = make_dart_zip(str(tmp_path / 'r.zip'), report, rcept_no='R1', attachments=2)
+    target, ext, extract_dir = extract_report_file_from_zip(path, str(tmp_path / 'out'))
+    assert ext == '.xml' and os.listdir(extract_dir) == ['R1.xml']
+    with open(target, 'rb') as f:
+        assert f.read() == report
+
+
+# --- 인코딩 감지 ---
+
+KOREAN = '삼성전자 주요 사업 내용'
+
+
+@pytest.mark.parametrize('data, expected', [
+    (b'\xef\xbb\xbf' + KOREAN.encode('utf-8'), 'utf-8'),
+    (b'\xff\xfe' + KOREAN.encode('utf-16-le'), 'utf-16-le'),
+    ('<?xml version="1.0" encoding="EUC-KR"?><A/>'.encode('cp949'), 'cp949'),
+    ('<html><meta charset="ks_c_5601-1987"><p>가</p>'.encode('cp949'), 'cp949'),
+    (KOREAN.encode('utf-8'), 'utf-8'),
+    (KOREAN.encode('cp949'), 'cp949'),
+])
+def test_detect_encoding(data, expected):
+    assert detect_encoding(data) == expected
+
+
+def test_detect_encoding_hint_and_unknown_declaration():
+    assert detect_encoding(KOREAN.encode('cp949'), encoding_hint='euc-kr') == 'cp949'
+    # 파이썬이 모르는 선언/힌트는 무시하고 유효성 검사로 감지
+    assert detect_encoding('<?xml encoding="bogus"?>가'.encode('utf-8'), encoding_hint='nope') == 'utf-8'
+    assert detect_encoding(b'\xff\xff\xff' * 3) == 'utf-8' # 어느 쪽도 유효하지 않으면 utf-8
+
+
+@pytest.mark.parametrize('encoding, prefix', [('utf-8', b'\xef\xbb\xbf'), ('utf-16-le', b'\xff\xfe'), ('cp949', b'')])
+def test_decode_content_strips_bom(encoding, prefix):
+    assert decode_content(prefix + KOREAN.encode(encoding)) == KOREAN
+    assert decode_content(b'') == ''
+
+
+def test_dart_retry_predicates(monkeypatch):
+    pytest.importorskip('tenacity')
+    monkeypatch.setattr(dart_utils, 'RETRY_WAIT_SECONDS', 0)
+    monkeypatch.setattr(dart_utils, 'RETRY_MAX_WAIT_SECONDS', 0)
+    calls = []
+
+    def flaky(error):
+        calls.append(error)
+        if len(calls) < 3: raise error
+        return len(calls)
+
+    assert dart_retry()(flaky)(OSError("reset")) == 3 # 기본: ImportError 외 모두 재시도
+    calls.clear()
+    with pytest.raises(ImportError):
+        dart_retry()(flaky)(ImportError("no module"))
+    assert len(calls) == 1
+    calls.clear()
+    only_os_errors = dart_retry(lambda: (OSError,), reraise=True)
+    with pytest.raises(ValueError):
+        only_os_errors(flaky)(ValueError("bad key"))
+    assert len(calls) == 1
+    calls.clear()
+    assert only_os_errors(flaky)(ConnectionError("reset")) == 3
+
+
+def test_swallowed_parse_and_decode_errors_are_counted(monkeypatch):
+    prof = profiler.PipelineProfiler(enabled=True, profile_mode=None)
+    monkeypatch.setattr(profiler, 'PROFILER', prof)
+
+    def broken_blocks(*args):
+        raise ValueError("broken XML")
+        yield
+
+    monkeypatch.setattr(dart_utils, 'iter_section_blocks', broken_blocks)
+    monkeypatch.setattr(dart_utils, 'detect_encoding', lambda *args: 'no-such-codec')
+    assert extract_sections_streaming(HANDWRITTEN_REPORT, 'doc', '005930', '삼성전자') == []
+    assert decode_content(b'abc') == ''
+    summary = prof.summary()
+    assert summary['parse']['count'] == summary['parse']['errors'] == 1
+    assert summary['decode']['count'] == summary['decode']['errors'] == 1
@@ -0,0 +1,133 @@
+# tests/test_embedding_store.py
+# EmbeddingStore (스텁 임베딩 함수): 내용 중복 제거, 임베딩 캐시 재사용, 증분 인덱스/검색, IVF 학습 대기, 매니페스트 기록
+
+import hashlib
+import sqlite3
+
+import numpy as np
+import pytest
+
+pytest.importorskip('faiss')
+
+from core import embedding_store
+from core.embedding_store import EmbeddingStore
+from core.run_manifest import RunManifest
+
+DIM = 16
+
+
+class StubEmbedder:
+    """ 텍스트 해시로 만든 결정적 단위 벡터. 호출된 텍스트를 기록 """
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        vectors = np.array([np.frombuffer(hashlib.sha256(t.encode('utf-8')).digest()[:DIM], dtype=np.uint8)
+                            for t in texts], dtype=np.float32) - 127.5
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    @property
+    def embedded(self):
+        return [text for call in self.calls for text in call]
+
+
+def _sections(*contents, rcept_no='R1'):
+    return [{'content': c, 'original_section': f's{i}', 'rcept_no': rcept_no} for i, c in enumerate(contents)]
+
+
+def test_dedup_and_cache_across_runs(tmp_path):
+    embed = StubEmbedder()
+    store = EmbeddingStore(str(tmp_path / 'store'), model_name='stub', embed_fn=embed, batch_size=2)
+    stats = store.add_documents(_sections('계열회사 현황', '반도체 사업', '계열회사 현황', '  '))
+    assert (stats['chunks'], stats['unique'], stats['new_vectors'], stats['embedded']) == (3, 2, 2, 2)
+    stats = store.add_documents(_sections('계열회사 현황', '디스플레이 사업'), {'company_code': '000660'})
+    assert (stats['new_vectors'], stats['embedded']) == (1, 1)
+    assert sorted(embed.embedded) == ['계열회사 현황', '디스플레이 사업', '반도체 사업'] # 같은 내용은 한 번만
+    assert store.index.ntotal == 3
+    store.close()
+
+    # 새 저장소에서도 같은 모델의 임베딩 캐시는 재사용, 인덱스는 디스크에서 복원
+    reopened = EmbeddingStore(str(tmp_path / 'store'), model_name='stub', embed_fn=embed)
+    assert reopened.index.ntotal == 3
+    score, content, metadata = reopened.search('반도체 사업', k=1)[0]
+    assert content == '반도체 사업' and score == pytest.approx(1.0, abs=1e-5)
+    assert metadata == [{'original_section': 's1', 'rcept_no': 'R1'}]
+    shared = reopened.search('계열회사 현황', k=3)[0]
+    assert shared[1] == '계열회사 현황' and len(shared[2]) == 3 # 중복 청크 메타데이터는 모두 유지
+    assert {'company_code': '000660', 'original_section': 's0', 'rcept_no': 'R1'} in shared[2]
+    reopened.close()
+
+
+def test_embedding_cache_is_per_model(tmp_path):
+    embed = StubEmbedder()
+    store = EmbeddingStore(str(tmp_path / 'a'), model_name='stub', embed_fn=embed)
+    store.add_documents(_sections('공급망 원재료'))
+    store.close()
+    other = EmbeddingStore(str(tmp_path / 'a'), model_name='other', embed_fn=embed)
+    assert other.search('공급망 원재료', k=1)[0][1] == '공급망 원재료'
+    other.close()
+    assert EmbeddingStore(str(tmp_path / 'empty'), embed_fn=embed).search('x') == []
+    with pytest.raises(ValueError):
+        EmbeddingStore(str(tmp_path / 'bad'), embed_fn=embed, index_type='lsh')
+
+
+def test_ivf_waits_for_training_vectors(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_store, 'IVF_NLIST', 2)
+    monkeypatch.setattr(embedding_store, 'IVF_MIN_TRAIN_VECTORS', 6)
+    embed = StubEmbedder()
+    store = EmbeddingStore(str(tmp_path / 'ivf'), model_name='stub', embed_fn=embed, index_type='ivf')
+    store.add_documents(_sections(*[f'문단 {i}' for i in range(4)]))
+    assert store.index.ntotal == 0
+    store.close()
+    # 다시 열면 대기분을 캐시에서 복원하고, 학습 벡터가 모이면 인덱스에 추가
+    store = EmbeddingStore(str(tmp_path / 'ivf'), model_name='stub', embed_fn=embed, index_type='ivf')
+    store.add_documents(_sections(*[f'문단 {i}' for i in range(4, 8)]))
+    assert store.index.ntotal == 8 and len(embed.embedded) == 8
+    assert store.search('문단 5', k=1)[0][1] == '문단 5'
+    store.close()
+
+
+def test_marks_embedded_in_manifest(tmp_path):
+    manifest = RunManifest(str(tmp_path / 'manifest.sqlite'))
+    manifest.mark('C1', 'R1', 'chunked')
+    store = EmbeddingStore(str(tmp_path / 'store'), embed_fn=StubEmbedder(), manifest=manifest)
+    store.add_documents(_sections('반도체', rcept_no='R1') + _sections('미등록', rcept_no='R9'))
+    assert manifest.get('C1', 'R1')['stage'] == 'embedded'
+    assert manifest.get('C1', 'R9') is None
+    store.close()
+    manifest.close()
+
+
+def test_add_documents_twice_is_idempotent(tmp_path):
+    store = EmbeddingStore(str(tmp_path / 'store'), model_name='stub', embed_fn=StubEmbedder())
+    docs = _sections('계열회사 현황', '반도체 사업', '계열회사 현황')
+    store.add_documents(docs, {'company_code': '005930'})
+    stats = store.add_documents(docs, {'company_code': '005930'})
+    assert (stats['new_vectors'], stats['embedded']) == (0, 0)
+    assert store._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 3
+    assert store._db.execute("SELECT COUNT(*) FROM vectors").fetchone()[0] == 2
+    shared = store.search('계열회사 현황', k=1)[0]
+    assert sorted(m['original_section'] for m in shared[2]) == ['s0', 's2']
+    assert len(store.search('반도체 사업', k=1)[0][2]) == 1
+    store.close()
+
+
+def test_legacy_chunks_table_is_deduplicated(tmp_path):
+    store = EmbeddingStore(str(tmp_path / 'store'), model_name='stub', embed_fn=StubEmbedder())
+    store.add_documents(_sections('반도체 사업'))
+    store.close()
+    # UNIQUE 제약이 없던 이전 스키마 + 중복 행
+    db = sqlite3.connect(str(tmp_path / 'store' / embedding_store.DB_FILE))
+    with db:
+        rows = db.execute("SELECT vector_id, metadata FROM chunks").fetchall()
+        db.execute("DROP TABLE chunks")
+        db.execute("CREATE TABLE chunks (vector_id INTEGER NOT NULL, metadata TEXT NOT NULL)")
+        db.execute("CREATE INDEX idx_chunks_vector_id ON chunks (vector_id)")
+        db.executemany("INSERT INTO chunks VALUES (?, ?)", rows * 3)
+    db.close()
+    store = EmbeddingStore(str(tmp_path / 'store'), model_name='stub', embed_fn=StubEmbedder())
+    assert store._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0] == 1
+    store.add_documents(_sections('반도체 사업'))
+    assert store.search('반도체 사업', k=1)[0][2] == [{'original_section': 's0', 'rcept_no': 'R1'}]
+    store.close()
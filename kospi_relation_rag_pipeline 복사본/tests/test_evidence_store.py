@@ -0,0 +1,85 @@
+# tests/test_evidence_store.py
+# EvidenceStore: build_adjacency_matrix 와 같은 행렬, 간선별 근거 조회, 열 배열 뷰/메모리, save/load (별칭 포함) 왕복
+
+import numpy as np
+import pytest
+
+from core.evidence_store import EvidenceStore
+from core.matrix_builder import CompanyIndex, build_adjacency_matrix
+
+CODES = ['005930', '000660', '066570']
+NAMES = {'005930': ['삼성전자'], '000660': ['SK하이닉스'], '066570': ['LG전자']}
+RECORDS = [
+    {'company_a': '삼성전자', 'company_b': 'SK하이닉스', 'rcept_no': 'R1',
+     'relationships': [{'type': 'competition', 'strength': 'high', 'evidence': ['메모리 반도체 경쟁']},
+                       {'type': 'supply', 'strength': 'low'}]},
+    {'company_a': 'SK하이닉스', 'company_b': '삼성전자', 'rcept_no': 'R2',
+     'relationships': [{'type': '경쟁', 'strength': 'medium', 'evidence': ['HBM', 'DRAM 점유율']}]},
+    {'company_a': 'LG전자', 'company_b': '없는회사', 'relationships': [{'type': 'customer'}]},
+]
+
+
+@pytest.fixture
+def store():
+    store = EvidenceStore(CompanyIndex(CODES, NAMES))
+    store.add_relationships(RECORDS)
+    return store
+
+
+@pytest.mark.parametrize('aggregation', ['sum', 'max', 'mean', 'count'])
+def test_matrices_match_builder(store, aggregation):
+    expected = build_adjacency_matrix(RECORDS, CompanyIndex(CODES, NAMES), aggregation=aggregation)
+    actual = store.matrices(aggregation)
+    assert sorted(actual) == sorted(expected)
+    for rel_type in expected:
+        np.testing.assert_allclose(actual[rel_type].toarray(), expected[rel_type].toarray())
+
+
+def test_edge_evidence(store):
+    found = store.edge_evidence('삼성전자', 'SK하이닉스', 'competition')
+    assert [(e['source'], e['evidence']) for e in found] == [('R1', ['메모리 반도체 경쟁']), ('R2', ['HBM', 'DRAM 점유율'])]
+    assert store.edge_evidence('삼성전자', 'SK하이닉스', 'supply')[0]['evidence'] == []
+    assert store.edge_evidence('삼성전자', 'LG전자', 'competition') == []
+
+
+def test_save_load_round_trip_keeps_aliases(store, tmp_path):
+    path = str(tmp_path / 'evidence.npz')
+    store.save(path)
+    loaded = EvidenceStore.load(path)
+    assert loaded.num_edges == store.num_edges
+    assert loaded.edge_evidence('삼성전자', 'SK하이닉스', 'competition') == \
+        store.edge_evidence('삼성전자', 'SK하이닉스', 'competition')
+    # 별칭이 복원되어 기업명으로 계속 누적 가능
+    assert loaded.add_relationships({'company_a': 'LG전자', 'company_b': '삼성전자',
+                                     'relationships': [{'type': 'customer'}]}) == 1
+    with pytest.raises(ValueError):
+        EvidenceStore.load(path, CompanyIndex(list(reversed(CODES))))
+
+
+def test_columns_are_compact_views(store):
+    cols = store.columns()
+    assert store.num_edges == len(store) == 3 # 해석 못 한 기업('없는회사')의 간선은 제외
+    assert [cols[k].dtype for k in ('src', 'rel', 'strength', 'edge_evidence')] == \
+        [np.int32, np.uint8, np.float32, np.int64]
+    assert cols['src'].base is not None # array 버퍼 위 뷰 (복사 없음)
+    assert list(cols['edge_evidence']) == [0, 1, 1, 3]
+    assert store.memory_bytes() == sum(c.nbytes for c in cols.values()) + len('메모리 반도체 경쟁HBMDRAM 점유율'.encode())
+    assert store.unresolved == {'없는회사': 1}
+
+
+def test_add_edge_sources_and_symmetric_lookup():
+    store = EvidenceStore(CompanyIndex(CODES, NAMES), aggregation='max')
+    assert store.add_edge('삼성전자', '삼성전자', 'competition') is None # 자기 자신
+    assert store.add_edge('삼성전자', 'LG전자', None) is None # 유형 없음
+    store.add_relationships([{'company_a': 'LG전자', 'company_b': '삼성전자',
+                              'relationships': [{'type': 'competition', 'strength': 'high', 'evidence': '가전'}]}],
+                            source='FnGuide')
+    store.add_edge('005930', '066570', 'supply', 'low', source=None)
+    assert store.relation_types == ['competition', 'supply']
+    # 경쟁은 대칭: 어느 방향으로 조회해도 같은 간선, 공급은 방향 유지
+    assert [e['source'] for e in store.edge_evidence('삼성전자', 'LG전자', 'competition')] == ['FnGuide']
+    assert store.edge_evidence(0, 2, 'supply')[0]['source'] is None
+    assert store.edge_evidence('LG전자', '삼성전자', 'supply') == []
+    assert store.to_sparse('ownership').nnz == 0
+    with pytest.raises(ValueError):
+        EvidenceStore(CompanyIndex(CODES), aggregation='median')
@@ -0,0 +1,94 @@
+# tests/test_graph_analytics.py
+# graph_analytics: networkx 기준 구현과 같은 결과인지 (차수/도달 가능성/연결 요소), 간접 지분 급수, GCN 정규화
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from core.graph_analytics import (clusters, connected_components, degree, indirect_ownership, k_hop_reachability,
+                                  normalized_adjacency, strength)
+from fixtures import make_adjacency
+
+nx = pytest.importorskip('networkx')
+
+
+@pytest.fixture
+def adjacency():
+    matrix = make_adjacency(60, density=0.03, seed=5)
+    matrix.data[:3] = 0.0 # 명시적으로 저장된 0 은 간선이 아님
+    return matrix
+
+
+def _graph(matrix):
+    coo = sp.coo_matrix(matrix)
+    graph = nx.DiGraph()
+    graph.add_nodes_from(range(matrix.shape[0]))
+    graph.add_weighted_edges_from((int(r), int(c), float(v)) for r, c, v in zip(coo.row, coo.col, coo.data) if v)
+    return graph
+
+
+def test_degree_and_strength_match_networkx(adjacency):
+    graph = _graph(adjacency)
+    assert degree(adjacency, 'out').tolist() == [graph.out_degree(i) for i in graph]
+    assert degree(adjacency.toarray(), 'in').tolist() == [graph.in_degree(i) for i in graph]
+    assert degree(adjacency, 'both').tolist() == [graph.degree(i) for i in graph]
+    np.testing.assert_allclose(strength(adjacency, 'in'), [graph.in_degree(i, weight='weight') for i in graph])
+    with pytest.raises(ValueError):
+        degree(adjacency, 'sideways')
+
+
+@pytest.mark.parametrize('k', [1, 2, 4])
+def test_k_hop_reachability_matches_networkx(adjacency, k):
+    graph = _graph(adjacency)
+    reach = k_hop_reachability(adjacency, k)
+    for i in graph:
+        expected = set(nx.single_source_shortest_path_length(graph, i, cutoff=k)) - {i}
+        assert set(reach[i].indices) == expected
+    subset = k_hop_reachability(adjacency, k, sources=[3, 7], include_self=True)
+    assert subset.shape == (2, 60) and subset[0, 3] and subset[1, 7]
+    with pytest.raises(ValueError):
+        k_hop_reachability(adjacency, 0)
+
+
+def test_connected_components_and_clusters(adjacency):
+    graph = _graph(adjacency)
+    count, labels = connected_components(adjacency)
+    assert count == nx.number_weakly_connected_components(graph)
+    assert connected_components(adjacency, 'strong')[0] == nx.number_strongly_connected_components(graph)
+    expected = sorted((sorted(c) for c in nx.weakly_connected_components(graph) if len(c) >= 2), key=len, reverse=True)
+    assert [len(g) for g in clusters(adjacency)] == [len(g) for g in expected]
+    assert sorted(map(sorted, clusters(adjacency))) == sorted(expected)
+    codes = [f'{i:06d}' for i in range(60)]
+    assert clusters(adjacency, codes)[0] == [codes[i] for i in clusters(adjacency)[0]]
+
+
+def test_indirect_ownership_chain():
+    # A -> B 50%, B -> C 40%, C -> D 50%: A 의 C 간접 지분 20%, D 는 10%
+    direct = sp.csr_matrix(([0.5, 0.4, 0.5], ([0, 1, 2], [1, 2, 3])), shape=(4, 4))
+    total, terms, converged = indirect_ownership(direct)
+    assert converged and terms >= 3
+    np.testing.assert_allclose(total.toarray()[0], [0, 0.5, 0.2, 0.1], atol=1e-6)
+
+
+def test_indirect_ownership_cycle_matches_closed_form():
+    direct = np.array([[0, 0.3, 0.2], [0.4, 0, 0.1], [0.1, 0.2, 0]])
+    total, _terms, converged = indirect_ownership(direct, tol=1e-9)
+    expected = np.linalg.inv(np.eye(3) - direct) - np.eye(3) # W + W^2 + ... = (I - W)^-1 - I
+    assert converged
+    np.testing.assert_allclose(total.toarray(), expected, atol=1e-5)
+    # 열 합이 1을 넘으면 정규화 후 계산 (발산하지 않음)
+    total, _terms, _converged = indirect_ownership(np.array([[0, 3.0], [2.0, 0]]), max_terms=8)
+    assert total.dtype == np.float32 and np.isfinite(total.data).all() and total.data.max() <= 8
+
+
+@pytest.mark.parametrize('mode', ['sym', 'rw'])
+def test_normalized_adjacency(adjacency, mode):
+    normalized = normalized_adjacency(adjacency, mode=mode, symmetrize=True)
+    a_hat = (adjacency + adjacency.T).toarray() + np.eye(60)
+    deg = a_hat.sum(axis=1)
+    expected = a_hat / np.sqrt(np.outer(deg, deg)) if mode == 'sym' else a_hat / deg[:, None]
+    np.testing.assert_allclose(normalized.toarray(), expected, rtol=1e-5)
+    isolated = normalized_adjacency(sp.csr_matrix((3, 3)), add_self_loops=False)
+    assert isolated.nnz == 0 # 차수 0 노드는 0 으로 (inf/nan 없음)
+    with pytest.raises(ValueError):
+        normalized_adjacency(adjacency, mode='lap')
@@ -0,0 +1,63 @@
+# tests/test_matrix_builder.py
+# matrix_builder: 기업 인덱스 조회, 관계 유형/강도 정규화, 대칭 간선, 집계 방식, 기간별 행렬
+
+import numpy as np
+import pytest
+
+from core.matrix_builder import (CompanyIndex, RelationGraphBuilder, build_adjacency_matrix, build_period_matrices,
+                                 normalize_relation_type, parse_strength)
+
+CODES = ['005930', '000660', '066570']
+NAMES = {'005930': ['삼성전자', 'Samsung Electronics Co., Ltd.'], '000660': ['SK하이닉스'], '066570': ['LG전자']}
+
+
+@pytest.fixture
+def index():
+    return CompanyIndex(CODES, NAMES)
+
+
+def test_company_index_resolves_codes_and_names(index):
+    assert index.resolve('5930') == 0
+    assert index.resolve('(주)삼성전자') == 0
+    assert index.resolve('samsung electronics co ltd') == 0
+    assert index.resolve('SK 하이닉스') == 1
+    assert index.resolve('없는회사') is None
+    assert sorted(index.aliases()['005930']) == ['samsungelectronicscoltd', '삼성전자']
+    with pytest.raises(ValueError):
+        CompanyIndex(['005930', '5930'])
+
+
+def test_normalization():
+    assert normalize_relation_type('Competitor') == 'competition'
+    assert normalize_relation_type('공급') == 'supply'
+    assert normalize_relation_type('joint venture') == 'joint_venture'
+    assert parse_strength('High') == 1.0 and parse_strength('0.25') == 0.25 and parse_strength('??') == 0.5
+
+
+def test_symmetric_and_directed_edges(index):
+    builder = RelationGraphBuilder(index)
+    assert builder.add_edge('삼성전자', 'SK하이닉스', 'competition', 'high')
+    assert builder.add_edge('SK하이닉스', 'LG전자', 'supply', 'low')
+    assert not builder.add_edge('삼성전자', '없는회사', 'competition')
+    assert builder.unresolved == {'없는회사': 1}
+    competition, supply = builder.to_sparse('competition').toarray(), builder.to_sparse('supply').toarray()
+    assert competition[0, 1] == competition[1, 0] == 1.0
+    assert supply[1, 2] == pytest.approx(0.3) and supply[2, 1] == 0
+
+
+@pytest.mark.parametrize('aggregation, expected', [('sum', 1.6), ('max', 1.0), ('mean', 0.8), ('count', 2.0)])
+def test_aggregations(index, aggregation, expected):
+    records = [{'company_a': '005930', 'company_b': '000660', 'relationships': [{'type': 'supply', 'strength': s}]}
+               for s in ('high', 'medium')]
+    matrices = build_adjacency_matrix(records, index, aggregation=aggregation)
+    assert matrices['supply'][0, 1] == pytest.approx(expected)
+    assert matrices['supply'].dtype == np.float32
+
+
+def test_period_matrices(index):
+    records = [{'company_a': '005930', 'company_b': '000660', 'period': p, 'relationships': [{'type': 'competition'}]}
+               for p in ('2024Q2', '2023Q4')]
+    records.append({'company_a': '005930', 'company_b': '066570', 'relationships': [{'type': 'competition'}]})
+    series = build_period_matrices(records, index)
+    assert list(series) == ['2023Q4', '2024Q2']
+    assert series['2024Q2']['competition'][0, 1] == 0.5
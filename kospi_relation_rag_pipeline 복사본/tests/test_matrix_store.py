@@ -0,0 +1,78 @@
+# tests/test_matrix_store.py
+# MatrixStore: CSR/밀집 저장-로드, 같은 기간 재저장 교체, 교체 실패 시 이전 스냅샷 유지, 노드 순서 검사
+
+import os
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from core import matrix_store
+from core.matrix_store import MatrixStore
+
+NODES = ['005930', '000660', '035420']
+
+
+def _matrix(values):
+    return sp.csr_matrix(np.array(values, dtype=np.float32))
+
+
+def test_csr_round_trip_with_mmap(tmp_path):
+    store = MatrixStore(str(tmp_path))
+    matrix = _matrix([[0, 1, 0], [1, 0, 2], [0, 0, 0]])
+    manifest = store.save_matrix(matrix, 'competition', '2024Q4', NODES, source_rcept_nos=['R2', 'R1', 'R1'])
+    assert manifest['nnz'] == 3 and manifest['source_rcept_nos'] == ['R1', 'R2']
+    loaded = store.load_matrix('competition')
+    assert not loaded.data.flags.writeable # 읽기 전용 메모리 맵 (복사 없음)
+    assert (loaded != matrix).nnz == 0
+    assert store.load_nodes() == NODES
+    assert store.list_relations() == ['competition']
+
+
+def test_dense_round_trip(tmp_path):
+    store = MatrixStore(str(tmp_path))
+    dense = np.eye(3, dtype=np.float32)
+    store.save_matrix(dense, 'ownership', '2024Q4', NODES)
+    np.testing.assert_array_equal(store.load_matrix('ownership', mmap=False), dense)
+
+
+def test_resave_replaces_snapshot_and_leaves_no_temp_dirs(tmp_path):
+    store = MatrixStore(str(tmp_path))
+    store.save_matrix(_matrix([[0, 1, 0], [0, 0, 0], [0, 0, 0]]), 'competition', '2024Q4', NODES)
+    store.save_matrix(_matrix([[0, 0, 0], [0, 0, 5], [0, 0, 0]]), 'competition', '2024Q4', NODES)
+    assert store.load_matrix('competition')[1, 2] == 5
+    assert store.load_matrix('competition')[0, 1] == 0
+    assert sorted(os.listdir(tmp_path / '2024Q4')) == ['competition', 'nodes.json']
+
+
+def test_failed_swap_keeps_previous_snapshot(tmp_path, monkeypatch):
+    store = MatrixStore(str(tmp_path))
+    store.save_matrix(_matrix([[0, 1, 0], [0, 0, 0], [0, 0, 0]]), 'competition', '2024Q4', NODES)
+    real_replace, calls = os.replace, []
+
+    def flaky_replace(src, dst):
+        calls.append((src, dst))
+        # 호출 순서: manifest.json.tmp -> manifest.json, 기존 스냅샷 -> .old, 새 스냅샷 -> 대상 폴더
+        if len(calls) == 3: raise OSError("disk full") # 새 스냅샷을 넣는 단계에서 실패
+        return real_replace(src, dst)
+
+    monkeypatch.setattr(matrix_store.os, 'replace', flaky_replace)
+    with pytest.raises(OSError, match='disk full'):
+        store.save_matrix(_matrix([[0, 0, 0], [0, 0, 5], [0, 0, 0]]), 'competition', '2024Q4', NODES)
+    monkeypatch.undo()
+    target = str(tmp_path / '2024Q4' / 'competition')
+    assert calls[0][1].endswith(matrix_store.MANIFEST_FILE)
+    assert calls[1] == (target, calls[1][1]) and calls[1][1].endswith('.old')
+    assert calls[2][1] == target
+    assert calls[3] == (calls[1][1], target) # 롤백: .old -> 대상 폴더
+    assert store.load_matrix('competition')[0, 1] == 1
+    assert store.load_matrix('competition')[1, 2] == 0
+    assert not [name for _, dirs, _ in os.walk(tmp_path) for name in dirs if name.endswith('.old')]
+    assert sorted(os.listdir(tmp_path / '2024Q4')) == ['competition', 'nodes.json']
+
+
+def test_node_order_mismatch_is_rejected(tmp_path):
+    store = MatrixStore(str(tmp_path))
+    store.save_matrix(_matrix(np.zeros((3, 3))), 'competition', '2024Q4', NODES)
+    with pytest.raises(ValueError):
+        store.save_matrix(_matrix(np.zeros((3, 3))), 'supply', '2024Q4', list(reversed(NODES)))
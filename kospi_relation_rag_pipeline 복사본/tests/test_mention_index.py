@@ -0,0 +1,98 @@
+# tests/test_mention_index.py
+# MentionIndex: 같은 위치에서 가장 긴 별칭, 영문 단어 경계(한글은 조사 허용), 모호한 별칭 제외,
+# 후보 쌍(주체 기업/거리 필터)과 기업 쌍별 부분 문자열 검사 결과 비교
+
+import random
+
+import pytest
+
+from core.mention_index import MentionIndex, alias_variants
+
+ALIASES = {
+    '005930': ['삼성전자', 'Samsung Electronics'],
+    '207940': ['삼성바이오로직스'],
+    '005490': ['POSCO', 'POSCO홀딩스', '포스코'],
+    '035420': ['NAVER', '네이버'],
+    '000660': ['SK하이닉스', 'SK Hynix'],
+    '003550': ['LG'],
+    '051910': ['LG화학', 'LG Chem'],
+}
+
+
+@pytest.fixture
+def index():
+    return MentionIndex(ALIASES)
+
+
+def _codes(index, text):
+    return [code for code, _start, _end, _match in index.find_mentions(text)]
+
+
+def test_longest_alias_wins_at_same_position(index):
+    assert [m[3] for m in index.find_mentions("POSCO홀딩스 와 POSCO, 삼성바이오로직스와 삼성전자")] == \
+        ['POSCO홀딩스', 'POSCO', '삼성바이오로직스', '삼성전자']
+    assert _codes(index, "LG화학은 LG 계열") == ['051910', '003550']
+
+
+def test_ascii_word_boundary(index):
+    # 영문 별칭은 영문/숫자와 붙어 있으면 일치하지 않음, 한글 조사/문장부호와는 일치
+    assert _codes(index, "NAVERPAY, XNAVER, NAVER2 는 아님") == []
+    assert _codes(index, "NAVER는 (NAVER) 네이버의") == ['035420'] * 3
+    assert _codes(index, "LGD, LGE 와 LG Chem's") == ['051910'] # 'LG' 도 영문 단어 경계 적용
+    assert _codes(index, "samsung   electronics 와 sk hynix") == ['005930', '000660'] # 대소문자/공백 정규화
+
+
+def test_matches_use_original_text_and_positions(index):
+    text = "당사는 İstanbul 에서 SK Hynix 와 경쟁"
+    (code, start, end, match), = index.find_mentions(text)
+    assert code == '000660' and text[start:end] == match == 'SK Hynix'
+    assert index.mentioned_codes("") == set()
+
+
+def test_ambiguous_aliases_are_dropped(caplog):
+    index = MentionIndex({'000001': ['공동명', '회사A'], '000002': ['공동명', '회사B'], 3: ['x', '회사C']})
+    assert index.codes == ['000001', '000002', '000003'] and len(index) == 3 # '공동명' 제외, 'x' 는 너무 짧음
+    assert _codes(index, "공동명 회사B") == ['000002']
+    assert '공동명' in caplog.text
+
+
+def test_alias_variants():
+    assert alias_variants('(주)삼성전자', 'Samsung Electronics Co., Ltd.', ['삼성']) == \
+        ['삼성전자', 'Samsung Electronics Co., Ltd.', 'Samsung Electronics', '삼성']
+    assert alias_variants(None, float('nan'), ['A']) == []
+
+
+def test_candidate_pairs_subject_and_distance(index):
+    sections = [
+        {'content': "당사는 SK하이닉스, NAVER 와 협력", 'original_section': 'II', 'rcept_no': 'R1'},
+        {'content': "경쟁사 없음", 'original_section': 'III'},
+    ]
+    pairs = index.candidate_pairs(sections, {'company_code': '5930', 'period': '2024Q4'})
+    assert [(p['company_a'], p['company_b']) for p in pairs] == \
+        [('000660', '005930'), ('000660', '035420'), ('005930', '035420')]
+    assert pairs[0]['positions_b'] == [] and pairs[0]['distance'] is None # 본문에 이름 없는 주체 기업
+    assert pairs[1]['distance'] == 2 and pairs[1]['section'] == 'II' and pairs[1]['period'] == '2024Q4'
+    assert [(p['company_a'], p['company_b']) for p in index.candidate_pairs(sections, include_subject=False)] == \
+        [('000660', '035420')]
+    far = [{'content': "SK하이닉스" + " 본문" * 100 + " NAVER"}]
+    assert index.candidate_pairs(far, max_distance=50, include_subject=False) == []
+
+
+def test_candidates_match_pairwise_substring_check():
+    """ 영문 별칭이 없는 합성 기업 명단에서 후보 쌍 = 두 기업 이름이 모두 본문에 있는 쌍 (노트북의 쌍별 검사) """
+    rng = random.Random(0)
+    syllables = [chr(c) for c in range(0xAC00, 0xD7A4, 131)]
+    universe = {}
+    while len(universe) < 60:
+        name = ''.join(rng.choice(syllables) for _ in range(4))
+        if all(name not in other and other not in name for names in universe.values() for other in names):
+            universe[f'{len(universe):06d}'] = [name]
+    index = MentionIndex(universe)
+    codes = sorted(universe)
+    for _ in range(20):
+        picked = rng.sample(codes, 5)
+        text = ' 내용 '.join(universe[code][0] for code in picked)
+        expected = {(a, b) for i, a in enumerate(codes) for b in codes[i + 1:]
+                    if universe[a][0] in text and universe[b][0] in text}
+        found = {(p['company_a'], p['company_b']) for p in index.candidate_pairs([{'content': text}])}
+        assert found == expected
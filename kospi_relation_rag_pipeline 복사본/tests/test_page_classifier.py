@@ -0,0 +1,47 @@
+# tests/test_page_classifier.py
+# PageClassifier: 한 번의 스캔으로 관계 유형별 고유 지표 수, 영문 단어 경계, 겹치는 지표, 섹션 제목 판별
+
+import re
+
+import pytest
+
+from core.page_classifier import PageClassifier
+from core.pdf_processor import PAGE_INDICATOR_SETS, classify_page, count_page_indicators
+
+
+def _naive_count(text, keywords):
+    """ 지표별 개별 검색 (분류기 도입 전 방식, 영문은 단어 경계) """
+    count = 0
+    for kw in keywords:
+        pattern = re.escape(kw)
+        if re.match('[A-Za-z0-9]', kw): pattern = rf'(?<![A-Za-z0-9]){pattern}(?![A-Za-z0-9])'
+        count += bool(re.search(pattern, text, re.IGNORECASE))
+    return count
+
+
+@pytest.mark.parametrize('text', [
+    "투자의견 BUY, Margin & Growth, Price & Fundamentals",
+    "주가수익률 비교 및 수익률 비교 (겹치는 지표)",
+    "최대주주 및 주요주주 지분율 현황, Ownership",
+    "주요 고객사 매출처 Customer list, Clients, supply chain 원재료",
+    "MARGIN growth price", "",
+])
+def test_classify_matches_per_keyword_search(text):
+    counts = classify_page(text)
+    assert counts == {rel_type: _naive_count(text, kws) for rel_type, kws in PAGE_INDICATOR_SETS.items()}
+
+
+def test_ascii_word_boundary_and_korean_particles():
+    classifier = PageClassifier(keyword_sets={'competition': ['Price', 'Growth'], 'ownership': ['지분율']})
+    assert classifier.classify("Priceless growth, Pricing") == {'competition': 1, 'ownership': 0}
+    assert classifier.classify("지분율은 Price.") == {'competition': 1, 'ownership': 1} # 한글은 조사가 붙어도 일치
+    assert classifier.matches("Growth growth GROWTH")['competition'] == {'Growth'} # 중복은 한 번
+    assert count_page_indicators("Margin & Growth, Price & Fundamentals") == 4
+
+
+def test_search_prefers_earliest_then_longest():
+    classifier = PageClassifier(keyword_sets={'a': ['수익률'], 'b': ['주가수익률']}, pattern_sets={'c': [r'\d+\.\s*원재료']})
+    assert classifier.search("주가수익률 비교") == ('b', '주가수익률')
+    assert classifier.search("3. 원재료 및 생산설비") == ('c', r'\d+\.\s*원재료')
+    assert classifier.search("해당 없음") is None and classifier.search("") is None
+    assert PageClassifier().classify("anything") == {}
@@ -0,0 +1,73 @@
+# tests/test_pdf_processor.py
+# pdf_processor: 페이지 텍스트 1차 검사(Form XObject 안의 텍스트 포함), 경쟁사 페이지 선별, 프로세스 풀 처리
+
+import time
+
+import pytest
+
+from core import pdf_processor
+from core.pdf_processor import (count_pdf_pages, extract_text_from_pdf, find_competitor_pages, iter_pdf_pages,
+                                iter_process_fnguide_pdfs, process_fnguide_pdf)
+from fixtures import make_fnguide_pdf
+
+
+@pytest.mark.parametrize('form_xobject', [False, True])
+def test_iter_pdf_pages_reads_text_pages(tmp_path, form_xobject):
+    path, _ = make_fnguide_pdf(str(tmp_path / 'r.pdf'), pages=4, form_xobject=form_xobject)
+    pages = list(iter_pdf_pages(path))
+    assert [num for num, _ in pages] == [1, 2, 3, 4]
+    assert all(text and '  ' not in text for _, text in pages)
+    assert [num for num, _ in iter_pdf_pages(path, [3, 9, 1])] == [3, 1] # 범위 밖 페이지는 무시
+
+
+@pytest.mark.parametrize('text_operator', ["'", '"'])
+def test_quote_text_operators_are_detected(tmp_path, text_operator):
+    # Tj/TJ 없이 ' 또는 " 로만 텍스트를 그리는 페이지도 1차 검사를 통과해야 함
+    path, competitor_pages = make_fnguide_pdf(str(tmp_path / 'r.pdf'), pages=4, competitor_every=2,
+                                              text_operator=text_operator)
+    assert [num for num, _ in iter_pdf_pages(path)] == [1, 2, 3, 4]
+    assert [num for num, _, _ in find_competitor_pages(path)] == competitor_pages == [2, 4]
+
+
+@pytest.mark.parametrize('form_xobject', [False, True])
+def test_find_competitor_pages(tmp_path, form_xobject):
+    path, competitor_pages = make_fnguide_pdf(str(tmp_path / 'r.pdf'), pages=10, competitor_every=3,
+                                              form_xobject=form_xobject)
+    matches = find_competitor_pages(path)
+    assert [num for num, _, _ in matches] == competitor_pages == [3, 6, 9]
+    assert all(count >= 2 for _, _, count in matches)
+    assert [num for num, _, _ in find_competitor_pages(path, range(4, 8))] == [6]
+
+
+def test_process_fnguide_pdf_documents(tmp_path):
+    path, competitor_pages = make_fnguide_pdf(str(tmp_path / 'r.pdf'), pages=6, competitor_every=2)
+    docs = process_fnguide_pdf(path, '005930')
+    assert [doc.metadata['section'] for doc in docs] == [f'Competitor Metrics Page {n}' for n in competitor_pages]
+    assert all(doc.metadata['company_code'] == '005930' and doc.metadata['potential_relation_type'] == 'competition'
+               for doc in docs)
+    assert process_fnguide_pdf(str(tmp_path / 'missing.pdf'), '005930') == []
+    assert extract_text_from_pdf(str(tmp_path / 'missing.pdf')) is None
+
+
+def test_iter_process_fnguide_pdfs_splits_into_page_tasks(tmp_path):
+    path_a, pages_a = make_fnguide_pdf(str(tmp_path / 'a.pdf'), pages=10, competitor_every=4)
+    path_b, pages_b = make_fnguide_pdf(str(tmp_path / 'b.pdf'), pages=3, competitor_every=1, form_xobject=True)
+    assert count_pdf_pages(path_a) == 10
+    found, processed = {}, {}
+    for code, _path, docs, num_pages in iter_process_fnguide_pdfs(
+            [(path_a, 'A'), (path_b, 'B'), (str(tmp_path / 'missing.pdf'), 'C')], max_workers=2, pages_per_task=4):
+        found.setdefault(code, []).extend(int(doc.metadata['section'].rsplit(' ', 1)[1]) for doc in docs)
+        processed[code] = processed.get(code, 0) + num_pages
+    assert sorted(found['A']) == pages_a and sorted(found['B']) == pages_b
+    assert processed == {'A': 10, 'B': 3}
+
+
+def test_iter_process_fnguide_pdfs_early_stop(tmp_path, monkeypatch):
+    path, _ = make_fnguide_pdf(str(tmp_path / 'r.pdf'), pages=8)
+    # fork 로 시작한 워커에도 패치가 적용됨
+    monkeypatch.setattr(pdf_processor, 'iter_pdf_pages', lambda *args: time.sleep(0.5) or [])
+    results = iter_process_fnguide_pdfs([(path, 'A')], max_workers=1, pages_per_task=1)
+    start = time.perf_counter()
+    next(results)
+    results.close()
+    assert time.perf_counter() - start < 2 # 남은 7개 묶음(약 3.5s)을 기다리지 않음
@@ -0,0 +1,90 @@
+# tests/test_profiler.py
+# PipelineProfiler: 비활성 no-op, stage/timed/record 기록, 기업별 요약, JSON-lines 리포트, cProfile 요약
+
+import json
+
+import pytest
+
+from core import profiler
+from core.profiler import LATENCY_BUCKETS, PipelineProfiler
+
+
+@pytest.fixture
+def prof():
+    return PipelineProfiler(enabled=True, profile_mode=None)
+
+
+def test_disabled_stage_is_shared_noop():
+    prof = PipelineProfiler(enabled=False)
+    with prof.stage('parse', company='005930') as rec:
+        rec.add(bytes=10)
+        rec.fail()
+    prof.record('parse', 1.0)
+    assert prof.stage('a') is prof.stage('b') and prof.summary() == {}
+    assert prof.write_report('unused.jsonl') is None
+
+
+def test_stage_counters_errors_and_histogram(prof):
+    with prof.stage('download', company='005930', bytes=100) as rec:
+        rec.add(bytes=50, sections=None)
+    with pytest.raises(RuntimeError):
+        with prof.stage('download', company='000660'):
+            raise RuntimeError('boom')
+    with prof.stage('download', company='035420') as rec:
+        rec.fail() # 예외를 안에서 처리한 실패
+    prof.record('parse', 0.2, company='005930', ok=False, sections=7)
+    prof.record('parse', 100.0)
+    summary = prof.summary()
+    assert summary['download']['count'] == 3 and summary['download']['errors'] == 2
+    assert summary['download']['bytes'] == 150 and summary['download']['sections'] == 0
+    assert summary['parse']['errors'] == 1 and summary['parse']['max_s'] == 100.0
+    assert summary['parse']['histogram']['counts'][LATENCY_BUCKETS.index(0.25)] == 1
+    assert summary['parse']['histogram']['counts'][-1] == 1 # 60초 초과
+    assert set(prof.company_summary()) == {('005930', 'download'), ('000660', 'download'), ('035420', 'download'),
+                                           ('005930', 'parse')}
+
+
+def test_timed_checks_enabled_at_call_time(prof):
+    calls = []
+
+    @prof.timed('search', company_arg=0)
+    def search(corp_code, year=None):
+        calls.append(corp_code)
+        return corp_code
+
+    @prof.timed('fetch', company_arg='corp_code')
+    def fetch(corp_code=None):
+        return corp_code
+
+    prof.disable()
+    assert search('A') == 'A' and prof.summary() == {}
+    prof.enable()
+    search('B')
+    fetch('C') # 위치 인자로 전달되면 이름으로 조회하지 않음
+    fetch(corp_code='D')
+    assert calls == ['A', 'B'] and search.__name__ == 'search'
+    assert set(prof.company_summary()) == {('B', 'search'), ('D', 'fetch')}
+    assert prof.summary()['fetch']['count'] == 2
+
+
+def test_module_timed_uses_global_profiler(monkeypatch):
+    monkeypatch.setattr(profiler.PROFILER, 'enabled', False)
+    wrapped = profiler.timed('stage')(lambda x: x * 2)
+    profiler.PROFILER.reset()
+    monkeypatch.setattr(profiler.PROFILER, 'enabled', True)
+    assert wrapped(3) == 6 # 데코레이션 이후 켜도 기록됨
+    assert profiler.PROFILER.summary()['stage']['count'] == 1
+    profiler.PROFILER.reset()
+
+
+def test_write_report_with_cprofile(prof, tmp_path):
+    prof.start_profile('cprofile')
+    with prof.stage('embed', company='005930'):
+        sum(range(1000))
+    path = prof.write_report(str(tmp_path / 'logs' / 'profile.jsonl'))
+    with open(path, encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert [line['type'] for line in lines] == ['run', 'stage', 'company_stage', 'profile']
+    assert lines[0]['records'] == 1 and lines[3]['mode'] == 'cprofile' and lines[3]['top']
+    with pytest.raises(ValueError):
+        prof.start_profile('perf')
@@ -0,0 +1,145 @@
+# tests/test_relation_extractor.py
+# RelationExtractor (스텁 generate_fn): 길이 버킷 배치, 같은 실행 안 중복 제거, 결과 캐시 재사용, 출력 검증,
+# 조기 종료 시 생산자 스레드 정리, 생산자 예외 전달, 언급 색인 필터
+
+import json
+import threading
+
+import pytest
+
+from core.matrix_builder import CompanyIndex, RelationGraphBuilder
+from core.mention_index import MentionIndex
+from core.relation_extractor import RelationExtractor, parse_llm_output, validate_relations
+
+META = {'company_code': '005930', 'company_name': '삼성전자', 'rcept_no': 'R1', 'period': '2024Q4'}
+
+
+class StubModel:
+    """ 본문에 나온 상대 기업을 경쟁 관계로 답하는 스텁. 호출마다 받은 프롬프트 수를 기록 """
+    def __init__(self, output=None):
+        self.calls = []
+        self.output = output
+
+    def __call__(self, prompts):
+        self.calls.append(len(prompts))
+        if self.output is not None: return [self.output] * len(prompts)
+        outputs = []
+        for prompt in prompts:
+            body = prompt.split('본문:', 1)[1]
+            found = [name for name in ('SK하이닉스', 'LG전자') if name in body]
+            outputs.append('결과입니다:\n```json\n' + json.dumps(
+                [{'company_b': name, 'relationships': [{'type': '경쟁', 'strength': 'medium', 'evidence': body.strip()}]}
+                 for name in found], ensure_ascii=False) + '\n```')
+        return outputs
+
+    @property
+    def generated(self):
+        return sum(self.calls)
+
+
+def _sections(contents, title='IX. 계열회사 등에 관한 사항'):
+    return [{'content': content, 'original_section': title} for content in contents]
+
+
+@pytest.fixture
+def extractor_factory(tmp_path):
+    created = []
+
+    def make(generate_fn, **kwargs):
+        extractor = RelationExtractor(str(tmp_path / 'cache'), model_name='stub', generate_fn=generate_fn, **kwargs)
+        created.append(extractor)
+        return extractor
+    yield make
+    for extractor in created: extractor.close()
+
+
+def test_batches_dedups_and_caches(extractor_factory):
+    contents = ['LG전자 가전 경쟁'] * 3 + [f'SK하이닉스와 메모리 경쟁 {i}' for i in range(5)] + ['관계 없음', '  ']
+    model = StubModel()
+    extractor = extractor_factory(model, batch_size=2, bucket_tokens=10 ** 6)
+    records = list(extractor.iter_extract(_sections(contents), META))
+    assert model.generated == 7 and model.calls == [2, 2, 2, 1] # 같은 제목/본문의 LG전자 2건, 빈 섹션 제외
+    assert extractor.stats['deduplicated'] == 2 and extractor.stats['sections'] == 10
+    assert len(records) == 8 and {r['company_b'] for r in records} == {'SK하이닉스', 'LG전자'}
+    assert all(r['company_a'] == '005930' and r['rcept_no'] == 'R1' and r['period'] == '2024Q4' for r in records)
+    assert records[0]['relationships'][0] == {'type': 'competition', 'strength': 0.6,
+                                              'evidence': [records[0]['relationships'][0]['evidence'][0]]}
+
+    # 재실행: 모든 섹션이 캐시 적중, 모델 호출 없음
+    builder = RelationGraphBuilder(CompanyIndex(['005930', '000660', '066570'],
+                                                {'005930': ['삼성전자'], '000660': ['SK하이닉스'], '066570': ['LG전자']}))
+    stats = extractor.extract_into(builder, _sections(contents), META)
+    assert model.generated == 7 and stats['generated'] == 0
+    assert stats['cache_hits'] == 9 and stats['records'] == 8 and stats['edges'] == 8
+    assert builder.to_sparse('competition')[0, 1] > 0
+
+
+def test_cache_key_depends_on_model_and_subject(extractor_factory, tmp_path):
+    model = StubModel()
+    extractor_factory(model).extract_into(RelationGraphBuilder(CompanyIndex(['005930'])), _sections(['SK하이닉스 경쟁']), META)
+    other = RelationExtractor(str(tmp_path / 'cache'), model_name='other', generate_fn=model)
+    list(other.iter_extract(_sections(['SK하이닉스 경쟁']), META))
+    list(other.iter_extract(_sections(['SK하이닉스 경쟁']), dict(META, company_code='066570', company_name='LG전자')))
+    other.close()
+    assert model.generated == 3
+
+
+def test_invalid_outputs_are_not_cached(extractor_factory):
+    model = StubModel(output='관계를 찾을 수 없습니다.')
+    extractor = extractor_factory(model)
+    assert list(extractor.iter_extract(_sections(['SK하이닉스 경쟁']), META)) == []
+    assert extractor.stats['invalid_outputs'] == 1
+    list(extractor.iter_extract(_sections(['SK하이닉스 경쟁']), META))
+    assert model.generated == 2 # 다음 실행에서 다시 시도
+    with pytest.raises(ValueError):
+        list(extractor_factory(lambda prompts: []).iter_extract(_sections(['새 섹션']), META))
+
+
+def test_early_close_stops_producer(extractor_factory):
+    produced = []
+
+    def sections():
+        for i in range(10 ** 6): # 끝까지 소비하면 테스트가 끝나지 않는 크기
+            produced.append(i)
+            yield {'content': f'SK하이닉스 경쟁 {i}'}
+
+    extractor = extractor_factory(StubModel(), batch_size=1)
+    stream = extractor.iter_extract(sections(), META, queue_size=4)
+    assert next(stream)['company_b'] == 'SK하이닉스'
+    stream.close()
+    assert not [t for t in threading.enumerate() if t.name == 'relation-extractor-feed']
+    assert len(produced) < 100
+
+
+def test_producer_error_is_raised_after_pending_batches(extractor_factory):
+    def sections():
+        yield {'content': 'SK하이닉스 경쟁'}
+        raise RuntimeError('parse failed')
+
+    extractor = extractor_factory(StubModel(), batch_size=8)
+    records = []
+    with pytest.raises(RuntimeError, match='parse failed'):
+        for record in extractor.iter_extract(sections(), META): records.append(record)
+    assert len(records) == 1 # 예외 전까지 받은 섹션은 생성 후 전달
+
+
+def test_mention_index_skips_sections_without_other_companies(extractor_factory):
+    index = MentionIndex({'005930': ['삼성전자'], '000660': ['SK하이닉스']})
+    model = StubModel()
+    extractor = extractor_factory(model, mention_index=index)
+    records = list(extractor.iter_extract(_sections(['삼성전자 단독 사업', 'SK하이닉스 와 경쟁', '당사 개요']), META))
+    assert extractor.stats['no_mentions'] == 2 and model.generated == 1 and len(records) == 1
+
+
+def test_parse_and_validate_llm_output():
+    assert parse_llm_output('설명 {"relationships": [{"type": "supply"}]} 끝') == [{'type': 'supply'}]
+    assert parse_llm_output('[1, 2') is None and parse_llm_output('') is None
+    valid, rejected = validate_relations([
+        {'company_b': ' LG전자 ', 'relationships': [{'type': '공급', 'strength': 'low'}, {'type': 'friendship'}]},
+        {'company': 'NAVER', 'type': 'competition', 'strength': 2, 'evidence': '검색'},
+        {'relationships': [{'type': 'supply'}]}, 'not a dict',
+    ])
+    assert valid == [{'company_b': 'LG전자', 'relationships': [{'type': 'supply', 'strength': 0.3, 'evidence': []}]},
+                     {'company_b': 'NAVER', 'relationships': [{'type': 'competition', 'strength': 2.0,
+                                                               'evidence': ['검색']}]}]
+    assert rejected == 3
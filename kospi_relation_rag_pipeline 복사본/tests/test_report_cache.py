@@ -0,0 +1,91 @@
+# tests/test_report_cache.py
+# ReportCache: ZIP/섹션/검색 캐시 적중, 지워진 객체 파일 처리, find_latest_annual_report 검색 메모이제이션
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from core import dart_utils
+from core.report_cache import ReportCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ReportCache(str(tmp_path / 'cache'))
+    yield cache
+    cache.close()
+
+
+def _zip_file(tmp_path, name='report.zip', data=b'PK\x03\x04 fake zip'):
+    path = tmp_path / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_zip_and_sections_round_trip(cache, tmp_path):
+    cached_zip = cache.put_zip('R1', _zip_file(tmp_path))
+    assert cache.get_zip_path('R1') == cached_zip
+    sections = [{'original_section': 'II. 사업의 내용', 'content': '반도체 사업'}]
+    cache.put_sections('R1', sections)
+    assert cache.get_sections('R1') == sections
+    assert cache.get_sections('R1', extractor='other-version') is None
+    stats = cache.stats()
+    assert stats['zip_hits'] == 1 and stats['sections_hits'] == 1 and stats['sections_misses'] == 1
+
+
+def test_same_content_is_stored_once(cache, tmp_path):
+    first = cache.put_zip('R1', _zip_file(tmp_path, 'a.zip'))
+    second = cache.put_zip('R2', _zip_file(tmp_path, 'b.zip'))
+    assert first == second
+    assert cache.stats()['objects'] == 1
+
+
+def test_missing_object_file_is_a_miss(cache, tmp_path):
+    cache.put_zip('R1', _zip_file(tmp_path))
+    cache.put_sections('R1', [{'content': 'x'}])
+    sections_sha = cache._db.execute("SELECT sections_sha FROM sections").fetchone()[0]
+    os.remove(cache._object_path(sections_sha))
+    assert cache.get_sections('R1') is None
+    assert cache.stats()['sections_misses'] == 1
+
+
+def test_eviction_keeps_total_under_limit(tmp_path):
+    cache = ReportCache(str(tmp_path / 'cache'), max_bytes=30)
+    try:
+        for i in range(3):
+            cache.put_zip(f'R{i}', _zip_file(tmp_path, f'{i}.zip', data=b'PK' + bytes([i]) * 18))
+        assert cache.stats()['total_bytes'] <= 30
+        assert cache.get_zip_path('R2') is not None
+        assert cache.get_zip_path('R0') is None
+    finally:
+        cache.close()
+
+
+def test_search_ttl(tmp_path):
+    cache = ReportCache(str(tmp_path / 'cache'), search_ttl_seconds=-1)
+    try:
+        cache.put_search('00126380', 2024, ['11011'], {'rcept_no': 'R1'})
+        assert cache.get_search('00126380', 2024, ['11011']) is None
+    finally:
+        cache.close()
+
+
+def test_find_latest_annual_report_memoizes_search(cache, monkeypatch):
+    calls = []
+
+    def search(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(list=[SimpleNamespace(rcept_no='20240312000736', report_nm='사업보고서 (2023.12)',
+                                                     corp_code=kwargs['corp_code'], corp_name='삼성전자')])
+
+    fake_dart = SimpleNamespace(filings=SimpleNamespace(search=search))
+    real_require = dart_utils.require
+    monkeypatch.setattr(dart_utils, 'require', lambda name: fake_dart if name == 'dart_fss' else real_require(name))
+    first = dart_utils.find_latest_annual_report('00126380', 2023, ['11011'], cache=cache)
+    second = dart_utils.find_latest_annual_report('00126380', 2023, ['11011'], cache=cache)
+    assert len(calls) == 1
+    assert first.rcept_no == second.rcept_no == '20240312000736'
+    assert second.report_nm == '사업보고서 (2023.12)'
+    dart_utils.find_latest_annual_report('00126380', 2023, ['11011'])
+    assert len(calls) == 2 # cache 없이 호출하면 항상 검색
@@ -0,0 +1,72 @@
+# tests/test_run_manifest.py
+# RunManifest: 검색 결과 비교(diff), 단계 기록/재개, corp_code=None 기록, 실패 기록, pending/summary
+
+import pytest
+
+from core.run_manifest import FINAL_STAGE, STAGES, RunManifest, next_stage
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    manifest = RunManifest(str(tmp_path / 'manifest.sqlite'))
+    yield manifest
+    manifest.close()
+
+
+def _report(corp_code, rcept_no):
+    return {'corp_code': corp_code, 'rcept_no': rcept_no, 'stock_code': corp_code[-6:], 'corp_name': corp_code}
+
+
+def test_diff_registers_and_skips_finished(manifest):
+    todo, unchanged = manifest.diff([_report('C1', 'R1'), _report('C2', 'R2')])
+    assert [r['resume_stage'] for r in todo] == ['downloaded', 'downloaded'] and unchanged == []
+    manifest.mark('C1', 'R1', FINAL_STAGE)
+    manifest.mark('C2', 'R2', 'parsed', sections=3)
+    todo, unchanged = manifest.diff([_report('C1', 'R1'), _report('C2', 'R2'), _report('C1', 'R3')])
+    assert [r['rcept_no'] for r in unchanged] == ['R1']
+    assert [(r['rcept_no'], r['resume_stage']) for r in todo] == [('R2', 'chunked'), ('R3', 'downloaded')]
+    assert todo[0]['manifest_info'] == {'sections': 3}
+    assert manifest.latest('C1')['rcept_no'] == 'R3'
+
+
+def test_mark_never_moves_backwards_and_merges_info(manifest):
+    manifest.mark('C1', 'R1', 'embedded', chunks=10)
+    manifest.mark('C1', 'R1', 'parsed', sections=4) # 재실행된 앞 단계
+    record = manifest.get('C1', 'R1')
+    assert record['stage'] == 'embedded' and record['info'] == {'chunks': 10, 'sections': 4}
+    assert manifest.resume_stage('C1', 'R1') == 'matrix_applied'
+    assert manifest.resume_stage('C9', 'R9') == 'downloaded'
+    with pytest.raises(ValueError):
+        manifest.mark('C1', 'R1', 'bogus')
+
+
+def test_mark_without_corp_code_resolves_by_rcept_no(manifest, caplog):
+    manifest.register('C1', 'R1')
+    manifest.mark(None, 'R1', 'parsed')
+    assert manifest.get('C1', 'R1')['stage'] == 'parsed'
+    manifest.mark(None, 'UNKNOWN', 'parsed')
+    manifest.mark_failed(None, 'UNKNOWN', 'parsed', 'boom')
+    assert manifest.get(None, 'UNKNOWN') is None and manifest.failures() == []
+    assert "rcept_no=UNKNOWN" in caplog.text
+
+
+def test_failure_is_retried_from_failed_stage(manifest):
+    manifest.mark('C1', 'R1', 'downloaded', zip_path='r.zip')
+    manifest.mark_failed(None, 'R1', 'parsed', 'timeout: 120s')
+    assert manifest.failures() == [{'corp_code': 'C1', 'rcept_no': 'R1', 'stock_code': None,
+                                    'failed_stage': 'parsed', 'error': 'timeout: 120s'}]
+    assert manifest.resume_stage('C1', 'R1') == 'parsed'
+    assert [r['rcept_no'] for r in manifest.pending('parsed')] == ['R1']
+    manifest.mark('C1', 'R1', 'parsed')
+    assert manifest.failures() == [] and manifest.get('C1', 'R1')['info'] == {'zip_path': 'r.zip'}
+
+
+def test_pending_and_summary(manifest):
+    manifest.register('C1', 'R1')
+    manifest.mark('C2', 'R2', 'chunked')
+    assert manifest.pending('discovered') == []
+    assert [r['rcept_no'] for r in manifest.pending('downloaded')] == ['R1']
+    assert [r['rcept_no'] for r in manifest.pending('embedded')] == ['R2']
+    summary = manifest.summary()
+    assert summary['discovered'] == 1 and summary['chunked'] == 1 and summary['failed'] == 0
+    assert [next_stage(s) for s in STAGES] == list(STAGES[1:]) + [None]
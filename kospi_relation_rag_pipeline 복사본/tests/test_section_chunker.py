@@ -0,0 +1,54 @@
+# tests/test_section_chunker.py
+# section_chunker: 청크 토큰 상한(겹침 포함), 섹션 경계, extract_sections_streaming 과의 내용 일치
+
+import random
+
+import pytest
+
+from core.dart_utils import extract_sections_streaming
+from core.section_chunker import _split_block, approx_token_count, iter_section_chunks
+from fixtures import make_dart_xml
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_split_block_respects_max_tokens_with_overlap(seed):
+    rng = random.Random(seed)
+    text = ' '.join('가' * rng.randint(1, 30) for _ in range(200))
+    max_tokens = rng.randint(8, 40)
+    overlap = rng.randint(0, max_tokens // 2)
+    chunks = list(_split_block(text, max_tokens, overlap, approx_token_count))
+    assert chunks
+    assert all(approx_token_count(chunk) <= max_tokens for chunk in chunks)
+
+
+def test_split_block_overlaps_consecutive_windows():
+    text = ' '.join(f'w{i:02d}' for i in range(40)) # 어절당 2토큰
+    chunks = list(_split_block(text, 10, 4, approx_token_count))
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert prev.split()[-2:] == nxt.split()[:2]
+
+
+def test_chunks_cover_streaming_sections():
+    report = make_dart_xml(200, seed=1)
+    sections = extract_sections_streaming(report, 'R1', '005930', '삼성전자')
+    chunks = list(iter_section_chunks(report, '005930', 'R1', '삼성전자', max_tokens=256))
+    assert all(approx_token_count(chunk['content']) <= 256 for chunk in chunks)
+    assert [c['chunk_index'] for c in chunks] == list(range(len(chunks)))
+    groups = [] # 섹션 제목은 반복될 수 있으므로 section_chunk_index == 0 에서 새 섹션 시작
+    for chunk in chunks:
+        if chunk['section_chunk_index'] == 0: groups.append([])
+        groups[-1].append(chunk)
+    assert [g[0]['original_section'] for g in groups] == [s['original_section'] for s in sections]
+    for group, section in zip(groups, sections):
+        # 겹침 없이 블록 경계에서만 자르므로 청크를 다시 이으면 섹션 본문과 같은 단어열
+        assert ' '.join(c['content'] for c in group).split() == section['content'].split()
+
+
+def test_chunker_marks_manifest(tmp_path):
+    from core.run_manifest import RunManifest
+    manifest = RunManifest(str(tmp_path / 'manifest.sqlite3'))
+    manifest.register('00126380', 'R1', '005930')
+    chunks = list(iter_section_chunks(make_dart_xml(20), '005930', 'R1', manifest=manifest))
+    record = manifest.get('00126380', 'R1')
+    assert record['stage'] == 'chunked' and record['info']['chunks'] == len(chunks)
+    manifest.close()
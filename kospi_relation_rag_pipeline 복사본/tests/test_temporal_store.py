@@ -0,0 +1,112 @@
+# tests/test_temporal_store.py
+# TemporalMatrixStore: 모든 기간/모든 구간을 원래 행렬 그대로 복원하는지 (기준 스냅샷 주기, 노드 순서 변경,
+# 유형 추가/삭제, 같은 기간 재저장 포함), 델타 크기, 기간 검증
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+
+from core.temporal_store import TemporalMatrixStore, report_period
+from fixtures import make_adjacency
+
+CODES = [f'{i:06d}' for i in range(40)]
+
+
+def _evolve(matrix, rng, changes=15):
+    """ 간선 일부를 추가/삭제/값 변경한 새 행렬 """
+    dense = matrix.toarray()
+    for _ in range(changes):
+        r, c = rng.integers(0, dense.shape[0], 2)
+        dense[r, c] = rng.choice([0.0, 1.0, 2.0, 3.0])
+    return sp.csr_matrix(dense)
+
+
+@pytest.fixture
+def series():
+    """ [(기간, 노드 순서, {유형: 행렬})] - 9개 기간, 6번째 기간에 노드 순서 변경, 유형 추가/삭제 """
+    rng = np.random.default_rng(0)
+    competition = make_adjacency(40, density=0.05, seed=1)
+    supply = make_adjacency(40, density=0.02, seed=2)
+    snapshots, codes = [], CODES
+    for i, period in enumerate(f'{2022 + q // 4}Q{q % 4 + 1}' for q in range(9)):
+        competition = _evolve(competition, rng)
+        supply = _evolve(supply, rng, changes=3)
+        matrices = {'competition': competition}
+        if i not in (3, 4): matrices['supply'] = supply # 두 기간 동안 공급 관계 없음
+        if i >= 6: matrices['ownership'] = make_adjacency(41, density=0.03, seed=i) # 이후 기간에만 있는 유형
+        if i == 6: codes = CODES + ['999999'] # 노드 추가 -> 기준 스냅샷
+        if len(codes) == 41:
+            matrices = {t: m if m.shape == (41, 41) else sp.csr_matrix(sp.block_diag([m, sp.csr_matrix((1, 1))]))
+                        for t, m in matrices.items()}
+        snapshots.append((period, list(codes), matrices))
+    return snapshots
+
+
+def _expected(snapshots, relation_type, period):
+    for p, codes, matrices in snapshots:
+        if p == period: return matrices.get(relation_type, sp.csr_matrix((len(codes), len(codes)))).toarray()
+
+
+def test_every_period_and_window_round_trips(series, tmp_path):
+    store = TemporalMatrixStore(str(tmp_path / 'series'), checkpoint_every=3)
+    for period, codes, matrices in series:
+        store.append_snapshot(matrices, period, codes, source_rcept_nos=[f'R{period}'])
+    periods = [p for p, _c, _m in series]
+    assert store.list_periods() == periods and store.latest_period() == '2024Q1'
+    assert [store.period_info(p)['kind'] for p in periods] == ['base', 'delta', 'delta', 'base', 'delta', 'delta',
+                                                               'base', 'delta', 'delta']
+
+    reopened = TemporalMatrixStore(str(tmp_path / 'series'), checkpoint_every=3)
+    for relation_type in ('competition', 'supply', 'ownership'):
+        for period in periods:
+            np.testing.assert_array_equal(reopened.load_matrix(relation_type, period).toarray(),
+                                          _expected(series, relation_type, period))
+        for i in range(len(periods)):
+            for j in range(i, len(periods)):
+                window, matrices = reopened.load_window(relation_type, periods[i], periods[j])
+                assert window == periods[i:j + 1]
+                for period, matrix in zip(window, matrices):
+                    np.testing.assert_array_equal(matrix.toarray(), _expected(series, relation_type, period))
+    assert reopened.load_nodes('2023Q2') == CODES and reopened.load_nodes() == CODES + ['999999']
+    assert reopened.period_info('2022Q2')['source_rcept_nos'] == ['R2022Q2']
+
+
+def test_delta_stores_only_changed_edges(tmp_path):
+    store = TemporalMatrixStore(str(tmp_path / 'series'))
+    base = make_adjacency(40, density=0.05, seed=1)
+    store.append_snapshot({'competition': base}, '2023Q4', CODES)
+    changed = base.tolil()
+    changed[0, 1], changed[2, 3] = 3.0, 0.0
+    changed = changed.tocsr()
+    info = store.append_snapshot({'competition': changed}, '2024Q1', CODES)
+    keys, values = store.load_delta('competition', '2024Q1')
+    expected = (sp.csr_matrix(changed) != sp.csr_matrix(base)).nnz
+    assert info['kind'] == 'delta' and info['relations']['competition']['delta_nnz'] == keys.size == expected
+    assert store.load_delta('competition', '2023Q4')[0].size == 0
+
+
+def test_resave_latest_and_reject_earlier(tmp_path):
+    store = TemporalMatrixStore(str(tmp_path / 'series'))
+    first, second = make_adjacency(40, seed=1), make_adjacency(40, seed=2)
+    store.append_snapshot({'competition': first}, '2024Q1', CODES)
+    store.append_snapshot({'competition': first}, '2024Q2', CODES)
+    store.append_snapshot({'competition': second}, '2024Q2', CODES) # 마지막 기간 재저장
+    assert store.list_periods() == ['2024Q1', '2024Q2']
+    np.testing.assert_array_equal(store.load_matrix('competition').toarray(), second.toarray())
+    with pytest.raises(ValueError):
+        store.append_snapshot({'competition': first}, '2023Q4', CODES)
+    with pytest.raises(ValueError):
+        store.append_snapshot({'competition': make_adjacency(10)}, '2024Q3', CODES)
+    with pytest.raises(KeyError):
+        store.load_matrix('competition', '2020Q1')
+    with pytest.raises(ValueError):
+        list(store.iter_window('competition', '2024Q2', '2024Q1'))
+    with pytest.raises(FileNotFoundError):
+        TemporalMatrixStore(str(tmp_path / 'empty')).load_matrix('competition')
+
+
+def test_report_period():
+    assert [report_period(2024, code) for code in ('11013', '11012', '11014', '11011')] == \
+        ['2024Q1', '2024Q2', '2024Q3', '2024Q4']
+    with pytest.raises(ValueError):
+        report_period(2024, '99999')